@@ -27,7 +27,7 @@ class FolderOrganizerApp(App):
         self.config = Config()
         
         try:
-            self.organizer = FolderOrganizer(str(self.folder_path))
+            self.organizer = FolderOrganizer.from_config(str(self.folder_path), self.config)
         except ValueError as e:
             self.exit(message=f"Error: {e}")
             raise
@@ -0,0 +1,156 @@
+"""Build artifact directories: find them, measure them, prune them."""
+
+import os
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from folder_organizer.deleter import ProgressFn, TreeDeleter
+from folder_organizer.scanner import ExcludeFn
+from folder_organizer.usage import tree_size
+
+
+@dataclass(frozen=True)
+class ArtifactRule:
+    """
+    How to recognize one kind of generated directory.
+
+    A directory named ``name`` is an artifact if its parent contains one of
+    ``markers`` (e.g. ``target`` next to ``Cargo.toml``) and it contains one
+    of ``contains`` (e.g. ``pyvenv.cfg`` inside a virtualenv). An empty tuple
+    skips that check.
+    """
+    name: str
+    kind: str
+    markers: Tuple[str, ...] = ()
+    contains: Tuple[str, ...] = ()
+
+    def matches(self, parent: str, path: str) -> bool:
+        """Check the marker files of a directory already known to have the right name."""
+        if self.markers and not any(
+            os.path.lexists(os.path.join(parent, marker)) for marker in self.markers
+        ):
+            return False
+        if self.contains and not any(
+            os.path.lexists(os.path.join(path, inner)) for inner in self.contains
+        ):
+            return False
+        return True
+
+
+DEFAULT_RULES: Tuple[ArtifactRule, ...] = (
+    ArtifactRule("node_modules", "node", markers=("package.json",)),
+    ArtifactRule(".next", "node", markers=("package.json",)),
+    ArtifactRule("__pycache__", "python"),
+    ArtifactRule(".pytest_cache", "python"),
+    ArtifactRule(".mypy_cache", "python"),
+    ArtifactRule(".ruff_cache", "python"),
+    ArtifactRule(".tox", "python", markers=("tox.ini", "setup.cfg", "pyproject.toml")),
+    ArtifactRule(".venv", "venv", contains=("pyvenv.cfg",)),
+    ArtifactRule("venv", "venv", contains=("pyvenv.cfg",)),
+    ArtifactRule("target", "rust", markers=("Cargo.toml",)),
+    ArtifactRule("target", "maven", markers=("pom.xml",)),
+    ArtifactRule(
+        ".gradle", "gradle", markers=("build.gradle", "build.gradle.kts", "settings.gradle")
+    ),
+)
+
+
+@dataclass
+class Artifact:
+    """A generated directory that can be deleted to reclaim space."""
+    path: str
+    kind: str
+    apparent: int = 0
+    allocated: int = 0
+    files: int = 0
+
+
+class ArtifactMatcher:
+    """
+    Walk-time predicate (see ParallelWalker) that records artifact directories.
+
+    A matching directory is recorded and reported as excluded, so the walk
+    never descends into it: nested node_modules inside a node_modules are
+    neither listed nor reported twice. Other entries are passed on to the
+    wrapped exclude predicate.
+    """
+
+    def __init__(self, rules: Sequence[ArtifactRule], exclude: Optional[ExcludeFn] = None):
+        """
+        Initialize the matcher.
+
+        Args:
+            rules: Artifact kinds to look for
+            exclude: Predicate for entries that are not artifacts
+        """
+        self.rules: Dict[str, List[ArtifactRule]] = {}
+        for rule in rules:
+            self.rules.setdefault(rule.name, []).append(rule)
+        self.exclude = exclude
+        self.found: List[Artifact] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, entry: os.DirEntry, is_dir: bool) -> bool:
+        rules = self.rules.get(entry.name) if is_dir else None
+        if rules:
+            try:
+                if entry.is_symlink():
+                    return True
+            except OSError:
+                return True
+            parent = os.path.dirname(entry.path)
+            for rule in rules:
+                if rule.matches(parent, entry.path):
+                    with self._lock:
+                        self.found.append(Artifact(entry.path, rule.kind))
+                    return True
+        return self.exclude is not None and self.exclude(entry, is_dir)
+
+
+def measure(artifacts: Iterable[Artifact], workers: int = 8) -> List[Artifact]:
+    """
+    Fill in the sizes of artifacts, measuring them in parallel.
+
+    Returns:
+        The artifacts, largest on disk first
+    """
+    artifacts = list(artifacts)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        sizes = list(pool.map(tree_size, (artifact.path for artifact in artifacts)))
+    for artifact, size in zip(artifacts, sizes):
+        artifact.apparent, artifact.allocated, artifact.files = (
+            size.apparent, size.allocated, size.files
+        )
+    artifacts.sort(key=lambda artifact: (-artifact.allocated, artifact.path))
+    return artifacts
+
+
+def delete_artifacts(
+    artifacts: Sequence[Artifact], workers: int = 8, progress: Optional[ProgressFn] = None
+) -> Tuple[List[Artifact], List[str]]:
+    """
+    Delete artifact directories with a TreeDeleter.
+
+    Args:
+        artifacts: Artifacts to delete
+        workers: Threads deleting subtrees
+        progress: Called from the deleting threads after each directory is
+            emptied, with its path and the number of files removed
+
+    Returns:
+        Tuple of (artifacts deleted, error messages)
+    """
+    errors: List[str] = []
+    pending: List[Artifact] = []
+    for artifact in artifacts:
+        if os.path.islink(artifact.path) or not os.path.isdir(artifact.path):
+            errors.append(f"{artifact.path}: no longer a directory")
+        else:
+            pending.append(artifact)
+
+    report = TreeDeleter(workers, progress).delete(artifact.path for artifact in pending)
+    errors.extend(report.errors)
+    done = [artifact for artifact in pending if not os.path.lexists(artifact.path)]
+    return done, errors
@@ -0,0 +1,222 @@
+"""Compiled file name to category classification."""
+
+import re
+import json
+import fnmatch
+import hashlib
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Default priorities: custom categories win over the built-in ones
+BUILTIN_PRIORITY = 0
+CUSTOM_PRIORITY = 10
+
+# Rule kinds, in increasing order of precedence at equal priority
+SUFFIX = 0
+GLOB = 1
+REGEX = 2
+
+_BACKREF = re.compile(r"\\\d|\(\?P=")
+
+
+class Rule(NamedTuple):
+    """A single classification rule."""
+    category: str
+    kind: int
+    pattern: str
+    priority: int = BUILTIN_PRIORITY
+
+
+def parse_rule(spec: str, category: str, priority: int) -> Rule:
+    """
+    Parse one entry of a category list into a Rule.
+
+    Entries starting with ``re:`` are regular expressions searched in the file
+    name, entries starting with ``glob:`` or containing ``*``, ``?`` or ``[``
+    are shell patterns matched against the whole name, and everything else is
+    a suffix such as ``.pdf`` or ``.tar.gz``. All rules are case-insensitive.
+
+    Args:
+        spec: Rule text from filetypes.json or the config
+        category: Category the rule maps to
+        priority: Precedence of the rule
+
+    Returns:
+        The parsed Rule
+    """
+    if spec.startswith("re:"):
+        return Rule(category, REGEX, spec[3:], priority)
+    if spec.startswith("glob:"):
+        return Rule(category, GLOB, spec[5:].lower(), priority)
+    if any(ch in spec for ch in "*?["):
+        return Rule(category, GLOB, spec.lower(), priority)
+    suffix = spec.lower()
+    if not suffix.startswith("."):
+        suffix = "." + suffix
+    return Rule(category, SUFFIX, suffix, priority)
+
+
+class Classifier:
+    """
+    Maps file names to categories with precompiled lookups.
+
+    Suffix rules are folded into a single dict keyed by lower-cased suffix, so
+    a name is classified with one dict hit per candidate suffix (just one when
+    no multi-part suffix like ``.tar.gz`` is configured). Glob and regex rules
+    are combined into one alternation and evaluated with a single regex call,
+    and only when one of them could outrank the suffix match.
+
+    When several rules match, the one with the highest priority wins. Ties go
+    to regex over glob over suffix rules, then to the longer suffix, then to
+    the rule defined first.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        """
+        Compile a list of rules.
+
+        Args:
+            rules: Rules in definition order
+        """
+        self.rules: List[Rule] = list(rules)
+        self._suffixes: Dict[str, Tuple[Tuple[int, ...], str]] = {}
+        self._max_parts = 1
+        patterns: List[Tuple[Tuple[int, ...], Rule]] = []
+
+        count = len(self.rules)
+        for order, rule in enumerate(self.rules):
+            if rule.kind == SUFFIX:
+                parts = rule.pattern.count(".")
+                rank = (rule.priority, SUFFIX, parts, count - order)
+                self._max_parts = max(self._max_parts, parts)
+                current = self._suffixes.get(rule.pattern)
+                if current is None or rank > current[0]:
+                    self._suffixes[rule.pattern] = (rank, rule.category)
+            else:
+                patterns.append(((rule.priority, rule.kind, 0, count - order), rule))
+
+        # Try patterns in precedence order so the first branch that matches wins
+        patterns.sort(key=lambda item: item[0], reverse=True)
+        self._pattern_ranks = [rank for rank, _ in patterns]
+        self._pattern_categories = [rule.category for _, rule in patterns]
+        self._best_pattern_rank = self._pattern_ranks[0] if patterns else None
+        self._combined: Optional["re.Pattern[str]"] = None
+        self._compiled: List[Callable[[str], Optional["re.Match[str]"]]] = []
+        if patterns:
+            sources = [self._pattern_source(rule) for _, rule in patterns]
+            try:
+                if any(_BACKREF.search(src) for src in sources):
+                    raise re.error("backreferences cannot be combined")
+                self._combined = re.compile(
+                    "|".join(f"(?P<r{i}>{src})" for i, src in enumerate(sources)),
+                    re.IGNORECASE | re.DOTALL,
+                )
+            except re.error:
+                # Rules with inline flags or backreferences cannot be embedded
+                # in one alternation; match them one by one instead
+                self._compiled = [self._matcher(rule) for _, rule in patterns]
+
+        self.key = hashlib.sha1(
+            json.dumps([list(rule) for rule in self.rules]).encode()
+        ).hexdigest()
+
+    @classmethod
+    def from_mappings(
+        cls,
+        builtin: Dict[str, List[str]],
+        custom: Optional[Dict[str, Any]] = None,
+    ) -> "Classifier":
+        """
+        Build a classifier from filetypes.json and custom_categories.
+
+        Custom categories map a name either to a list of rules or to a dict
+        ``{"patterns": [...], "priority": N}``.
+
+        Args:
+            builtin: Category to rule list mapping from filetypes.json
+            custom: Category mapping from Config.custom_categories
+
+        Returns:
+            The compiled Classifier
+        """
+        rules = []
+        for category, specs in (custom or {}).items():
+            priority = CUSTOM_PRIORITY
+            if isinstance(specs, dict):
+                priority = int(specs.get("priority", CUSTOM_PRIORITY))
+                specs = specs.get("patterns", [])
+            rules.extend(parse_rule(spec, category, priority) for spec in specs)
+        for category, specs in builtin.items():
+            rules.extend(parse_rule(spec, category, BUILTIN_PRIORITY) for spec in specs)
+        return cls(rules)
+
+    def classify(self, name: str) -> Optional[str]:
+        """
+        Return the category for a file name.
+
+        Args:
+            name: File name (not a path)
+
+        Returns:
+            Category name, or None if no rule matches
+        """
+        lname = name.lower()
+        best_rank = None
+        best = None
+        for suffix in self._candidate_suffixes(lname):
+            hit = self._suffixes.get(suffix)
+            if hit is not None and (best_rank is None or hit[0] > best_rank):
+                best_rank, best = hit
+
+        if self._best_pattern_rank is None:
+            return best
+        if best_rank is not None and best_rank > self._best_pattern_rank:
+            return best
+
+        if self._combined is not None:
+            match = self._combined.match(lname)
+            index = int(match.lastgroup[1:]) if match else None
+        else:
+            index = next(
+                (i for i, match in enumerate(self._compiled) if match(lname)), None
+            )
+        if index is not None and (best_rank is None or self._pattern_ranks[index] > best_rank):
+            return self._pattern_categories[index]
+        return best
+
+    def categories(self) -> List[str]:
+        """Return all category names in definition order."""
+        return list(dict.fromkeys(rule.category for rule in self.rules))
+
+    def _candidate_suffixes(self, lname: str) -> List[str]:
+        """Return up to max_parts trailing suffixes of a name, shortest first."""
+        if lname.endswith("."):
+            return []
+        # Leading dots belong to the stem, like pathlib (".bashrc" has no suffix)
+        stem_start = len(lname) - len(lname.lstrip("."))
+        suffixes = []
+        pos = len(lname)
+        for _ in range(self._max_parts):
+            pos = lname.rfind(".", stem_start + 1, pos)
+            if pos == -1:
+                break
+            suffixes.append(lname[pos:])
+        return suffixes
+
+    @staticmethod
+    def _pattern_source(rule: Rule) -> str:
+        """Return regex source for a glob or regex rule, anchored for re.match."""
+        if rule.kind == GLOB:
+            return fnmatch.translate(rule.pattern)
+        return f".*?(?:{rule.pattern})"
+
+    @staticmethod
+    def _matcher(rule: Rule) -> Callable[[str], Optional["re.Match[str]"]]:
+        """
+        Compile a glob or regex rule on its own.
+
+        Regex rules are compiled unwrapped and searched, so global inline
+        flags like ``(?i)`` stay at the start of the expression.
+        """
+        if rule.kind == GLOB:
+            return re.compile(fnmatch.translate(rule.pattern), re.IGNORECASE | re.DOTALL).match
+        return re.compile(rule.pattern, re.IGNORECASE | re.DOTALL).search
@@ -1,15 +1,26 @@
 """Command-line interface for folder organizer."""
 
+import os
 import sys
 import click
+import threading
 from pathlib import Path
+from typing import List, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from rich.progress import BarColumn, Progress as ProgressDisplay, SpinnerColumn, TextColumn
 from rich import print as rprint
 
-from folder_organizer.organizer import FolderOrganizer
+from folder_organizer.artifacts import DEFAULT_RULES
+from folder_organizer.organizer import FolderOrganizer, OperationResult
 from folder_organizer.config import Config
+from folder_organizer.fuzzy import highlight
+from folder_organizer.plan import OperationPlan
+from folder_organizer.progress import CancelToken, Progress
+from folder_organizer.scanner import stat_entry
+from folder_organizer.search import SORT_KEYS
+from folder_organizer.transfer import FSYNC_POLICIES, TransferReport
 
 
 console = Console()
@@ -22,8 +33,13 @@ console = Console()
 @click.option('--count', type=str, help='Count files by extension or search term')
 @click.option('--yes', '-y', is_flag=True, help='Auto-confirm actions')
 @click.option('--dry-run', is_flag=True, help='Preview changes without executing')
+@click.option('--workers', type=int, help='Threads used for recursive scans')
+@click.option('--index/--no-index', default=None, help='Answer queries from the metadata index')
+@click.option('--sort', type=click.Choice(sorted(SORT_KEYS)), help='Order --count results')
+@click.option('--recursive', '-r', is_flag=True,
+              help='Include subfolders in --count and --organize')
 @click.pass_context
-def cli(ctx, path, info, organize, count, yes, dry_run):
+def cli(ctx, path, info, organize, count, yes, dry_run, workers, index, sort, recursive):
     """
     🗂️  Folder Organizer - Beautiful terminal-based folder management
     
@@ -38,11 +54,16 @@ def cli(ctx, path, info, organize, count, yes, dry_run):
         app.run()
         return
 
+    # Subcommands create their own organizer with the group's options
+    ctx.obj = {'workers': workers, 'use_index': index}
+    if ctx.invoked_subcommand is not None:
+        return
+
     # CLI mode
     target_path = Path(path or '.').resolve()
     
     try:
-        organizer = FolderOrganizer(str(target_path))
+        organizer = make_organizer(str(target_path))
     except ValueError as e:
         console.print(f"[red]Error:[/red] {e}")
         sys.exit(1)
@@ -54,18 +75,32 @@ def cli(ctx, path, info, organize, count, yes, dry_run):
 
     # Handle --count flag
     if count:
-        show_count(organizer, count)
+        show_count(organizer, count, sort, recursive)
         return
 
     # Handle --organize flag
     if organize:
-        organize_files(organizer, yes, dry_run)
+        organize_files(organizer, yes, dry_run, recursive)
         return
 
 
+def make_organizer(path: str, **overrides) -> FolderOrganizer:
+    """
+    Create an organizer from the config and the options given to the command group.
+    
+    Args:
+        path: Folder to organize
+        **overrides: Settings of the current command, taking precedence
+    """
+    ctx = click.get_current_context()
+    options = dict(ctx.find_root().obj or {})
+    options.update({k: v for k, v in overrides.items() if v is not None})
+    return FolderOrganizer.from_config(path, Config(), **options)
+
+
 def show_info(organizer: FolderOrganizer):
     """Display folder information."""
-    meta = organizer.get_meta()
+    meta = organizer.get_meta(streaming=True)
     
     table = Table(title=f"📊 Folder Information", show_header=False, box=None)
     table.add_column("Property", style="cyan")
@@ -74,16 +109,26 @@ def show_info(organizer: FolderOrganizer):
     table.add_row("📁 Path", meta['path'])
     table.add_row("💾 Size", meta['size'])
     table.add_row("📄 Files", str(meta['file_count']))
-    table.add_row("📂 Subfolders", str(meta['folder_count']))
+    approx = "" if meta['folder_count_exact'] else "~"
+    table.add_row("📂 Subfolders", f"{approx}{meta['folder_count']:,} distinct names")
+    table.add_row("🗃️  Total folders", f"{meta['total_folders']:,}")
     table.add_row("🕐 Created", meta['creation_time'])
     
     console.print(table)
 
 
-def show_count(organizer: FolderOrganizer, term: str):
+def show_count(
+    organizer: FolderOrganizer,
+    term: str,
+    sort_by: Optional[str] = None,
+    recursive: bool = False,
+):
     """Show file count for a search term."""
-    count = organizer.get_filecount(term)
-    files = organizer.search_files(term)
+    # Largest/newest first when sorting by size or date
+    result = organizer.search(
+        term, limit=20, sort_by=sort_by, reverse=sort_by != 'name', recursive=recursive
+    )
+    count = result.count
     
     if count == 0:
         console.print(f"[yellow]No files found matching '[bold]{term}[/bold]'[/yellow]")
@@ -91,13 +136,17 @@ def show_count(organizer: FolderOrganizer, term: str):
     
     console.print(f"\n[green]Found {count} file(s) matching '[bold]{term}[/bold]'[/green]\n")
     
-    if files:
+    if result.hits:
         table = Table(show_header=True, header_style="bold cyan")
         table.add_column("File Name", style="white")
         table.add_column("Size", justify="right", style="yellow")
         table.add_column("Modified", style="dim")
         
-        for file in files[:20]:  # Show first 20
+        for hit in result.hits:  # Only the first 20 are kept
+            file = organizer.describe(hit)
+            if recursive:
+                # Show where in the tree each match lives
+                file['name'] = os.path.relpath(file['path'], organizer.path)
             table.add_row(
                 file['name'],
                 file['size_formatted'],
@@ -106,14 +155,17 @@ def show_count(organizer: FolderOrganizer, term: str):
         
         console.print(table)
         
-        if len(files) > 20:
-            console.print(f"\n[dim]... and {len(files) - 20} more files[/dim]")
+        if result.truncated:
+            console.print(f"\n[dim]... and {count - len(result.hits)} more files[/dim]")
 
 
-def organize_files(organizer: FolderOrganizer, auto_confirm: bool, dry_run: bool):
+def organize_files(
+    organizer: FolderOrganizer, auto_confirm: bool, dry_run: bool, recursive: bool = False
+):
     """Organize files into category folders."""
-    # Preview organization
-    preview = organizer.preview_organization()
+    # Plan organization from a single scan
+    plan = organizer.plan_organize(recursive)
+    preview = plan.by_target_dir()
     
     if not preview:
         console.print("[yellow]No files to organize (all files are already categorized or unknown types)[/yellow]")
@@ -139,6 +191,14 @@ def organize_files(organizer: FolderOrganizer, auto_confirm: bool, dry_run: bool
     console.print(table)
     console.print(f"\n[bold]Total: {total_files} files across {len(preview)} categories[/bold]\n")
     
+    if plan.errors:
+        console.print(f"[yellow]⚠️  {len(plan.errors)} file(s) will be skipped:[/yellow]")
+        for error in plan.errors[:5]:
+            console.print(f"[yellow]  • {error}[/yellow]")
+        if len(plan.errors) > 5:
+            console.print(f"  [dim]... and {len(plan.errors) - 5} more[/dim]")
+        console.print()
+    
     # Confirm
     if dry_run:
         console.print("[yellow]🔍 Dry run mode - no files will be moved[/yellow]")
@@ -150,15 +210,85 @@ def organize_files(organizer: FolderOrganizer, auto_confirm: bool, dry_run: bool
             return
     
     # Execute organization
-    with console.status("[bold green]Organizing files...", spinner="dots"):
-        result = organizer.organize_files(dry_run=False)
-    
-    if result.success:
-        console.print(f"\n[bold green]✅ {result.message}[/bold green]")
+    result = execute_with_progress(organizer, plan, "[bold green]Organizing files...")
+    show_result(result, "Organization completed with errors")
+
+
+def execute_with_progress(
+    organizer: FolderOrganizer, plan: OperationPlan, description: str
+) -> OperationResult:
+    """
+    Execute a plan with a live progress bar showing throughput and ETA.
+
+    The plan runs in a background thread so Ctrl+C can cancel it cleanly:
+    the file being processed is finished and the rest are left alone.
+    """
+    fmt = FolderOrganizer._format_size
+    by_bytes = plan.total_bytes > 0
+    cancel = CancelToken()
+    outcome = {}
+
+    columns = (
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        TextColumn("{task.fields[files]}"),
+        TextColumn("[green]{task.fields[rate]}"),
+        TextColumn("[cyan]{task.fields[eta]}"),
+    )
+    with ProgressDisplay(*columns, console=console, transient=True) as display:
+        task = display.add_task(
+            description,
+            total=plan.total_bytes if by_bytes else len(plan.entries),
+            files=f"0/{len(plan.entries):,} files", rate="", eta="",
+        )
+
+        def update(progress: Progress) -> None:
+            eta = progress.eta
+            display.update(
+                task,
+                completed=progress.bytes_done if by_bytes else progress.files_done,
+                files=f"{progress.files_done:,}/{progress.files_total:,} files",
+                rate=(
+                    f"{progress.files_per_second:,.0f} files/s, "
+                    f"{fmt(progress.bytes_per_second)}/s"
+                ),
+                eta="" if eta is None else f"ETA {int(eta) // 60}:{int(eta) % 60:02d}",
+            )
+
+        finished = threading.Event()
+
+        def run() -> None:
+            try:
+                outcome['result'] = organizer.execute_plan(plan, update, cancel)
+            except BaseException as e:
+                outcome['error'] = e
+            finally:
+                finished.set()
+
+        threading.Thread(target=run, daemon=True).start()
+        while not finished.is_set():
+            try:
+                finished.wait(0.1)
+            except KeyboardInterrupt:
+                cancel.cancel()
+                display.update(task, description="[yellow]Cancelling...")
+
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
+def show_result(result: OperationResult, failure: str):
+    """Print the outcome of an executed plan."""
+    if result.cancelled:
+        console.print(f"\n[yellow]⏹️  {result.message}[/yellow]")
+    elif result.success:
+        console.print(f"\n[green]✅ {result.message}[/green]")
     else:
-        console.print(f"\n[bold red]❌ Organization completed with errors[/bold red]")
-        for error in result.errors:
-            console.print(f"[red]  • {error}[/red]")
+        console.print(f"\n[red]❌ {failure}[/red]")
+    for error in result.errors:
+        console.print(f"[red]  • {error}[/red]")
 
 
 @cli.command()
@@ -171,6 +301,244 @@ def tui(path):
     app.run()
 
 
+@cli.command()
+@click.argument('query', type=str)
+@click.argument('path', type=click.Path(exists=True), required=False, default='.')
+@click.option('--recursive', '-r', is_flag=True, help='Include files in subfolders')
+@click.option('--limit', '-n', type=int, default=20, show_default=True, help='Number of results')
+def find(query, path, recursive, limit):
+    """Fuzzy-find files matching QUERY, best matches first."""
+    organizer = make_organizer(path)
+    
+    finder = organizer.fuzzy_finder(recursive=recursive)
+    count, matches = finder.match(query, limit)
+    
+    if count == 0:
+        console.print(f"[yellow]No files found matching '[bold]{query}[/bold]'[/yellow]")
+        return
+    
+    console.print(f"\n[green]Found {count} file(s) matching '[bold]{query}[/bold]'[/green]\n")
+    
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("File", style="white")
+    table.add_column("Size", justify="right", style="yellow")
+    table.add_column("Modified", style="dim")
+    table.add_column("Score", justify="right", style="dim")
+    
+    for match in matches:
+        file = organizer.describe(stat_entry(finder.entries[match.index]))
+        table.add_row(
+            highlight(match.text, match.positions),
+            file['size_formatted'],
+            file['modified'][4:16],
+            str(match.score)
+        )
+    
+    console.print(table)
+    
+    if count > len(matches):
+        console.print(f"\n[dim]... and {count - len(matches)} more files[/dim]")
+
+
+@cli.command()
+@click.argument('path', type=click.Path(exists=True), required=False, default='.')
+@click.option('--recursive', '-r', is_flag=True, help='Include files in subfolders')
+@click.option('--min-size', type=int, default=1, show_default=True,
+              help='Ignore smaller files (bytes)')
+@click.option('--limit', '-n', type=int, default=20, show_default=True,
+              help='Number of groups shown')
+def duplicates(path, recursive, min_size, limit):
+    """Find files with identical content."""
+    organizer = make_organizer(path)
+    fmt = FolderOrganizer._format_size
+    
+    with console.status("[cyan]Looking for duplicates...[/cyan]"):
+        report = organizer.find_duplicates(recursive=recursive, min_size=min_size)
+    
+    for error in report.errors:
+        console.print(f"[red]  • {error}[/red]")
+    
+    if not report.groups:
+        console.print(f"[green]No duplicates among {report.files_scanned} file(s)[/green]")
+        return
+    
+    for group in report.groups[:limit]:
+        console.print(
+            f"\n[cyan]{len(group.paths)} copies of {fmt(group.size)}[/cyan] "
+            f"[dim]({fmt(group.reclaimable)} reclaimable)[/dim]"
+        )
+        for file in group.paths:
+            console.print(f"  • {os.path.relpath(file, organizer.path)}")
+    if len(report.groups) > limit:
+        console.print(f"\n[dim]... and {len(report.groups) - limit} more groups[/dim]")
+    
+    console.print(
+        f"\n[green]{report.duplicate_files} duplicate file(s) in {len(report.groups)} "
+        f"group(s), {fmt(report.reclaimable)} reclaimable[/green]"
+    )
+    console.print(
+        f"[dim]Scanned {report.files_scanned} file(s), read {fmt(report.bytes_read)} "
+        f"({report.cache_hits} hash(es) cached) in {report.seconds:.1f}s[/dim]"
+    )
+
+
+@cli.command()
+@click.argument('path', type=click.Path(exists=True), required=False, default='.')
+@click.option('--limit', '-n', type=int, default=10, show_default=True,
+              help='Number of entries shown')
+@click.option('--apparent', is_flag=True, help='Rank by apparent size instead of disk usage')
+@click.option('--all', 'include_excluded', is_flag=True, help='Include excluded paths')
+def usage(path, limit, apparent, include_excluded):
+    """Show where the space goes: largest folders and files."""
+    organizer = make_organizer(path)
+    fmt = FolderOrganizer._format_size
+    
+    with console.status("[cyan]Measuring disk usage...[/cyan]"):
+        report = organizer.disk_usage(limit, apparent, include_excluded)
+    
+    def rel(file):
+        return os.path.relpath(file, organizer.path)
+    
+    for title, entries in (
+        ("Subfolders", report.children[:limit]),
+        ("Largest folders", report.top_dirs),
+        ("Largest files", report.top_files),
+    ):
+        if not entries:
+            continue
+        table = Table(title=title, show_header=True, header_style="bold cyan", title_justify="left")
+        table.add_column("Path", style="white")
+        table.add_column("On disk", justify="right", style="yellow")
+        table.add_column("Apparent", justify="right", style="dim")
+        table.add_column("Files", justify="right", style="dim")
+        for entry in entries:
+            table.add_row(
+                rel(entry.path), fmt(entry.allocated), fmt(entry.apparent), str(entry.files)
+            )
+        console.print(table)
+    
+    console.print(
+        f"\n[green]{fmt(report.allocated)} on disk, {fmt(report.apparent)} apparent, "
+        f"{report.files} file(s) in {report.dirs} folder(s)[/green]"
+    )
+    if report.hardlinks:
+        console.print(f"[dim]{report.hardlinks} extra hard link(s) counted once[/dim]")
+    if report.errors:
+        console.print(f"[yellow]{len(report.errors)} folder(s) could not be read[/yellow]")
+    console.print(f"[dim]Scanned in {report.seconds:.1f}s[/dim]")
+
+
+def parse_rows(spec: str, count: int) -> List[int]:
+    """
+    Parse a row selection such as "1,3-5" into 0-based indexes.
+
+    Raises:
+        click.BadParameter: If the selection is malformed or out of range
+    """
+    rows = set()
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        try:
+            start, end = int(first), int(last or first)
+        except ValueError:
+            raise click.BadParameter(f"not a row number or range: {part}", param_hint='--select')
+        if not 1 <= start <= end <= count:
+            raise click.BadParameter(f"rows go from 1 to {count}: {part}", param_hint='--select')
+        rows.update(range(start - 1, end))
+    if not rows:
+        raise click.BadParameter("no rows selected", param_hint='--select')
+    return sorted(rows)
+
+
+@cli.command()
+@click.argument('path', type=click.Path(exists=True), required=False, default='.')
+@click.option('--kind', '-k', 'kinds', multiple=True,
+              type=click.Choice(sorted({rule.kind for rule in DEFAULT_RULES})),
+              help='Only these artifact kinds (repeatable)')
+@click.option('--min-size', type=int, default=0,
+              help='Only folders taking at least this many bytes on disk')
+@click.option('--select', '-s', 'select', help='Listed rows to delete, e.g. "1,3-5" (default: all)')
+@click.option('--yes', '-y', is_flag=True, help='Auto-confirm action')
+@click.option('--dry-run', is_flag=True, help='Only list what would be deleted')
+@click.option('--limit', '-n', type=int, default=20, show_default=True,
+              help='Number of largest folders listed; only listed folders are deleted (0 for all)')
+def prune(path, kinds, min_size, select, yes, dry_run, limit):
+    """Delete build artifacts (node_modules, __pycache__, target, .venv...)."""
+    organizer = make_organizer(path)
+    fmt = FolderOrganizer._format_size
+    
+    with console.status("[cyan]Looking for build artifacts...[/cyan]"):
+        artifacts = organizer.find_artifacts(kinds)
+    artifacts = [artifact for artifact in artifacts if artifact.allocated >= min_size]
+    
+    if not artifacts:
+        console.print("[green]No build artifacts found[/green]")
+        return
+    
+    # Only what is listed can be deleted, so nothing is deleted unseen
+    listed = artifacts[:limit] if limit > 0 else artifacts
+    rows = parse_rows(select, len(listed)) if select else range(len(listed))
+    chosen = [listed[row] for row in rows]
+    
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("#", justify="right", style="dim")
+    table.add_column("Folder", style="white")
+    table.add_column("Kind", style="magenta")
+    table.add_column("On disk", justify="right", style="yellow")
+    table.add_column("Files", justify="right", style="dim")
+    selected = set(rows)
+    for row, artifact in enumerate(listed):
+        table.add_row(
+            str(row + 1),
+            os.path.relpath(artifact.path, organizer.path),
+            artifact.kind,
+            fmt(artifact.allocated),
+            str(artifact.files),
+            style=None if row in selected else "dim strike"
+        )
+    console.print(table)
+    if len(artifacts) > len(listed):
+        hidden = artifacts[len(listed):]
+        console.print(
+            f"[dim]... and {len(hidden)} smaller folder(s) "
+            f"({fmt(sum(artifact.allocated for artifact in hidden))}) not listed "
+            f"and not deleted; use --limit 0 to include them[/dim]"
+        )
+    
+    total = sum(artifact.allocated for artifact in chosen)
+    console.print(f"\n[cyan]{len(chosen)} folder(s) selected, {fmt(total)} reclaimable[/cyan]")
+    
+    if dry_run:
+        console.print("\n[yellow]🔍 Dry run mode - nothing will be deleted[/yellow]")
+        return
+    
+    if not yes:
+        if not click.confirm(f"\nDelete the {len(chosen)} selected folder(s)?", default=False):
+            console.print("[yellow]Operation cancelled[/yellow]")
+            return
+    
+    columns = (
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed:,.0f}/{task.total:,.0f} files"),
+    )
+    with ProgressDisplay(*columns, console=console, transient=True) as display:
+        task = display.add_task("Deleting...", total=sum(artifact.files for artifact in chosen))
+        result = organizer.prune_artifacts(
+            chosen, progress=lambda _, files: display.advance(task, files)
+        )
+    
+    if result.success:
+        console.print(f"\n[green]✅ {result.message}[/green]")
+    else:
+        console.print("\n[red]❌ Prune completed with errors[/red]")
+        for error in result.errors:
+            console.print(f"[red]  • {error}[/red]")
+
+
 @cli.command()
 def config():
     """Open configuration editor."""
@@ -196,21 +564,38 @@ def config():
 @click.argument('destination', type=click.Path(exists=True))
 @click.option('--yes', '-y', is_flag=True, help='Auto-confirm action')
 @click.option('--dry-run', is_flag=True, help='Preview without moving')
-def move(path, extension, destination, yes, dry_run):
+@click.option('--save-plan', type=click.Path(dir_okay=False),
+              help='Save the plan to run later with apply')
+@click.option('--copy-workers', type=int, help='Concurrent copies when moving to another disk')
+@click.option('--fsync', type=click.Choice(FSYNC_POLICIES), help='When copies are flushed to disk')
+@click.option('--report', is_flag=True, help='Show per-file transfer speeds')
+@click.option('--recursive', '-r', is_flag=True, help='Include subfolders, keeping their structure')
+def move(path, extension, destination, yes, dry_run, save_plan, copy_workers, fsync, report,
+         recursive):
     """Move files with EXTENSION to DESTINATION."""
-    organizer = FolderOrganizer(path)
+    organizer = make_organizer(path, transfer_workers=copy_workers, fsync_policy=fsync)
     
-    result = organizer.move_files(extension, destination, dry_run=True)
+    try:
+        plan = organizer.plan_move(extension, destination, recursive)
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
     
-    if result.files_affected == 0:
+    if not plan.entries:
         console.print(f"[yellow]No files found with extension '{extension}'[/yellow]")
         return
     
-    console.print(f"\n[cyan]Found {result.files_affected} file(s) to move:[/cyan]")
-    for file in result.files_list[:10]:
+    files = plan.relative_paths
+    console.print(f"\n[cyan]Found {len(files)} file(s) to move:[/cyan]")
+    for file in files[:10]:
         console.print(f"  • {file}")
-    if len(result.files_list) > 10:
-        console.print(f"  [dim]... and {len(result.files_list) - 10} more[/dim]")
+    if len(files) > 10:
+        console.print(f"  [dim]... and {len(files) - 10} more[/dim]")
+    
+    if save_plan:
+        plan.save(save_plan)
+        console.print(f"\n[green]💾 Plan saved to {save_plan}[/green]")
+        return
     
     if dry_run:
         console.print(f"\n[yellow]🔍 Dry run mode - no files will be moved[/yellow]")
@@ -221,14 +606,31 @@ def move(path, extension, destination, yes, dry_run):
             console.print("[yellow]Operation cancelled[/yellow]")
             return
     
-    result = organizer.move_files(extension, destination, dry_run=False)
+    result = execute_with_progress(organizer, plan, "[cyan]Moving files...")
     
-    if result.success:
-        console.print(f"\n[green]✅ {result.message}[/green]")
-    else:
-        console.print(f"\n[red]❌ Move completed with errors[/red]")
-        for error in result.errors:
-            console.print(f"[red]  • {error}[/red]")
+    if result.transfer is not None:
+        show_transfer(result.transfer, per_file=report)
+    
+    show_result(result, "Move completed with errors")
+
+
+def show_transfer(report: TransferReport, per_file: bool = False):
+    """Show throughput of a cross-device move."""
+    fmt = FolderOrganizer._format_size
+    if per_file:
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("File", style="white")
+        table.add_column("Size", justify="right", style="yellow")
+        table.add_column("Speed", justify="right", style="green")
+        for item in report.files:
+            speed = "[red]failed[/red]" if item.error else f"{fmt(item.rate)}/s"
+            table.add_row(Path(item.source).name, fmt(item.bytes), speed)
+        console.print(table)
+    
+    console.print(
+        f"\n[cyan]📦 Copied {fmt(report.bytes)} in {report.seconds:.1f}s "
+        f"({fmt(report.rate)}/s)[/cyan]"
+    )
 
 
 @cli.command()
@@ -236,21 +638,30 @@ def move(path, extension, destination, yes, dry_run):
 @click.argument('extension', type=str)
 @click.option('--yes', '-y', is_flag=True, help='Auto-confirm action')
 @click.option('--dry-run', is_flag=True, help='Preview without deleting')
-def delete(path, extension, yes, dry_run):
+@click.option('--save-plan', type=click.Path(dir_okay=False),
+              help='Save the plan to run later with apply')
+@click.option('--recursive', '-r', is_flag=True, help='Include subfolders')
+def delete(path, extension, yes, dry_run, save_plan, recursive):
     """Delete files with EXTENSION (DANGEROUS!)."""
-    organizer = FolderOrganizer(path)
+    organizer = make_organizer(path)
     
-    result = organizer.delete_files(extension, dry_run=True)
+    plan = organizer.plan_delete(extension, recursive)
     
-    if result.files_affected == 0:
+    if not plan.entries:
         console.print(f"[yellow]No files found with extension '{extension}'[/yellow]")
         return
     
-    console.print(f"\n[red]⚠️  WARNING: This will permanently delete {result.files_affected} file(s)![/red]\n")
-    for file in result.files_list[:10]:
+    files = plan.relative_paths
+    console.print(f"\n[red]⚠️  WARNING: This will permanently delete {len(files)} file(s)![/red]\n")
+    for file in files[:10]:
         console.print(f"  • {file}")
-    if len(result.files_list) > 10:
-        console.print(f"  [dim]... and {len(result.files_list) - 10} more[/dim]")
+    if len(files) > 10:
+        console.print(f"  [dim]... and {len(files) - 10} more[/dim]")
+    
+    if save_plan:
+        plan.save(save_plan)
+        console.print(f"\n[green]💾 Plan saved to {save_plan}[/green]")
+        return
     
     if dry_run:
         console.print(f"\n[yellow]🔍 Dry run mode - no files will be deleted[/yellow]")
@@ -261,14 +672,39 @@ def delete(path, extension, yes, dry_run):
             console.print("[yellow]Operation cancelled[/yellow]")
             return
     
-    result = organizer.delete_files(extension, dry_run=False)
+    result = execute_with_progress(organizer, plan, "[red]Deleting files...")
+    show_result(result, "Delete completed with errors")
+
+
+@cli.command()
+@click.argument('plan_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--yes', '-y', is_flag=True, help='Auto-confirm action')
+def apply(plan_file, yes):
+    """Execute a plan saved with --save-plan."""
+    try:
+        plan = OperationPlan.load(plan_file)
+        organizer = make_organizer(plan.root)
+    except (ValueError, KeyError, TypeError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+    
+    target = f" to {plan.destination}" if plan.destination else ""
+    console.print(
+        f"\n[cyan]Plan:[/cyan] {plan.action} {len(plan.entries)} file(s) "
+        f"in {plan.root}{target}"
+    )
+    for file in plan.relative_paths[:10]:
+        console.print(f"  • {file}")
+    if len(plan.entries) > 10:
+        console.print(f"  [dim]... and {len(plan.entries) - 10} more[/dim]")
     
-    if result.success:
-        console.print(f"\n[green]✅ {result.message}[/green]")
-    else:
-        console.print(f"\n[red]❌ Delete completed with errors[/red]")
-        for error in result.errors:
-            console.print(f"[red]  • {error}[/red]")
+    if not yes:
+        if not click.confirm(f"\nExecute this plan?", default=False):
+            console.print("[yellow]Operation cancelled[/yellow]")
+            return
+    
+    result = execute_with_progress(organizer, plan, f"[cyan]Running {plan.action} plan...")
+    show_result(result, "Plan completed with errors")
 
 
 def main():
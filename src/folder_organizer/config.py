@@ -1,9 +1,19 @@
 """Configuration management for folder organizer."""
 
+import os
 import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from folder_organizer.ignore import IgnoreRules
+
+
+def cache_dir() -> Path:
+    """Return the per-user cache directory (~/.cache/folder-organizer by default)."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "folder-organizer"
+
 
 class Config:
     """Manages user configuration."""
@@ -17,6 +27,13 @@ class Config:
         "remember_last_folder": True,
         "enable_undo": True,
         "max_undo_history": 10,
+        "scan_workers": 0,
+        "use_index": False,
+        "index_max_age": 300,
+        "transfer_workers": 4,
+        "fsync_policy": "file",
+        "use_gitignore": True,
+        "hash_cache_entries": 1000000,
     }
 
     def __init__(self, config_path: Optional[str] = None):
@@ -34,6 +51,7 @@ class Config:
             self.config_path = Path(config_path)
 
         self.config = self._load_config()
+        self._ignore_rules: Optional[IgnoreRules] = None
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default."""
@@ -50,8 +68,9 @@ class Config:
                 return self.DEFAULT_CONFIG.copy()
         else:
             # Create default config file
+            self.config = self.DEFAULT_CONFIG.copy()
             self.save()
-            return self.DEFAULT_CONFIG.copy()
+            return self.config
 
     def save(self) -> None:
         """Save configuration to file."""
@@ -78,23 +97,40 @@ class Config:
         """Get list of patterns to exclude from operations."""
         return self.config.get("exclude_patterns", [])
 
+    @property
+    def use_gitignore(self) -> bool:
+        """Whether .gitignore files found while walking are honored."""
+        return bool(self.config.get("use_gitignore", True))
+
+    @property
+    def scan_workers(self) -> Optional[int]:
+        """Get the number of walker threads (None means pick automatically)."""
+        return self.config.get("scan_workers") or None
+
     @property
     def custom_categories(self) -> Dict[str, List[str]]:
         """Get custom file type categories."""
         return self.config.get("custom_categories", {})
 
-    def should_exclude(self, path: Path) -> bool:
+    def should_exclude(self, path: Path, is_dir: Optional[bool] = None) -> bool:
         """
         Check if a path should be excluded based on exclude patterns.
+
+        Patterns follow .gitignore syntax: ``venv`` excludes a file or folder
+        named exactly venv at any depth, ``/build`` only at the top level,
+        ``logs/`` only directories and ``!keep.log`` re-includes a path. A
+        path is also excluded when one of its parent folders is.
         
         Args:
-            path: Path to check
+            path: Path to check, relative to the folder being organized
+            is_dir: Whether the path is a directory (checked on disk if omitted)
             
         Returns:
             True if path should be excluded
         """
-        name = path.name
-        for pattern in self.exclude_patterns:
-            if pattern in name:
-                return True
-        return False
+        patterns = self.exclude_patterns
+        if self._ignore_rules is None or self._ignore_rules.patterns != patterns:
+            self._ignore_rules = IgnoreRules(patterns)
+        if is_dir is None:
+            is_dir = path.is_dir()
+        return self._ignore_rules.ignores(path.as_posix(), is_dir)
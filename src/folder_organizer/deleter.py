@@ -0,0 +1,374 @@
+"""Parallel directory tree deletion relative to open directory descriptors."""
+
+import os
+import stat
+import time
+import errno
+import shutil
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Set
+
+from folder_organizer.scanner import default_workers
+
+# unlinkat/rmdirat and scandir on a descriptor are available
+DIR_FD_DELETE = (
+    hasattr(os, "O_DIRECTORY")
+    and os.open in os.supports_dir_fd
+    and os.unlink in os.supports_dir_fd
+    and os.rmdir in os.supports_dir_fd
+    and os.scandir in os.supports_fd
+)
+
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0) \
+    | getattr(os, "O_CLOEXEC", 0)
+
+# Times a directory is emptied again when rmdir finds it was not empty
+# (some filesystems skip entries removed while they are being listed)
+_RETRIES = 2
+
+# Directory descriptors held before those no longer needed for opening
+# subdirectories are closed (and reopened through ".." to remove children)
+_MAX_OPEN = 64
+
+# Called from worker threads after each directory is emptied, with its path
+# and the number of files removed from it
+ProgressFn = Callable[[str, int], None]
+
+
+@dataclass
+class DeleteReport:
+    """What a TreeDeleter run removed."""
+    files: int = 0
+    dirs: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Entries removed per second."""
+        return (self.files + self.dirs) / self.seconds if self.seconds > 0 else 0.0
+
+
+class _Dir:
+    """
+    A directory being deleted; removed once it and every subtree below it are done.
+
+    ``pending`` counts the directory itself until it is listed plus each
+    subdirectory not removed yet, ``unopened`` the subdirectories not opened
+    yet, and ``busy`` the removals of children using ``fd`` right now.
+    """
+
+    __slots__ = ("name", "parent", "inode", "fd", "pending", "unopened", "busy", "attempts")
+
+    def __init__(self, name: str, parent: Optional["_Dir"] = None, inode: int = 0):
+        self.name = name
+        self.parent = parent
+        self.inode = inode
+        self.fd: Optional[int] = None
+        self.pending = 1
+        self.unopened = 0
+        self.busy = 0
+        self.attempts = 0
+
+    @property
+    def path(self) -> str:
+        """Full path, for messages only; it may be too long to resolve."""
+        names = []
+        node: Optional[_Dir] = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return os.path.join(*reversed(names))
+
+
+class TreeDeleter:
+    """
+    Deletes directory trees with one open() per directory.
+
+    Every directory is opened relative to its parent's descriptor and its
+    entries are removed with unlink/rmdir relative to its own while scandir
+    streams them, so no path is ever resolved from the root and trees deeper
+    than PATH_MAX are removed too. A subdirectory is handed to an idle worker
+    when there is one and kept on the worker's own stack (depth-first)
+    otherwise, which spreads independent subtrees over the pool without
+    queueing every directory. A directory is removed as soon as it and every
+    subtree below it are done.
+
+    A descriptor stays open while its directory still has subdirectories to
+    open. Past _MAX_OPEN descriptors, those only kept for removing children
+    are closed and reopened later through ".." of a child, so a long chain
+    of directories holds a bounded number of them.
+
+    Symlinks are removed, never followed: directories are opened with
+    O_NOFOLLOW and must still be the inode the listing of their parent saw.
+    Where the platform lacks descriptor-relative calls, trees are removed
+    with shutil.rmtree.
+    """
+
+    def __init__(self, workers: Optional[int] = None, progress: Optional[ProgressFn] = None):
+        """
+        Initialize the deleter.
+
+        Args:
+            workers: Threads deleting subtrees (auto by default)
+            progress: Called after each directory is emptied
+        """
+        self.workers = max(1, workers or default_workers())
+        self.progress = progress
+        self._cond = threading.Condition()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._queued = 0
+        self._running = 0
+        self._held: Set[_Dir] = set()
+        self._report = DeleteReport()
+
+    def delete(self, paths: Iterable[str]) -> DeleteReport:
+        """
+        Delete files and directory trees.
+
+        Args:
+            paths: Files or directories to remove
+
+        Returns:
+            DeleteReport with the number of entries removed and any errors
+        """
+        start = time.perf_counter()
+        self._report = report = DeleteReport()
+        roots = []
+        for path in paths:
+            try:
+                st = os.lstat(path)
+            except OSError as e:
+                report.errors.append(f"{path}: {e.strerror or e}")
+                continue
+            if not stat.S_ISDIR(st.st_mode):
+                try:
+                    os.unlink(path)
+                    report.files += 1
+                except OSError as e:
+                    report.errors.append(f"{path}: {e.strerror or e}")
+                continue
+            roots.append(_Dir(path, inode=st.st_ino))
+
+        if not DIR_FD_DELETE:
+            for root in roots:
+                try:
+                    shutil.rmtree(
+                        root.path,
+                        onerror=lambda _, p, exc: report.errors.append(f"{p}: {exc[1]}"),
+                    )
+                except Exception as e:
+                    report.errors.append(f"{root.path}: {e}")
+            report.seconds = time.perf_counter() - start
+            return report
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                self._pool = pool
+                for root in roots:
+                    self._submit(root)
+                with self._cond:
+                    while self._running:
+                        self._cond.wait()
+        finally:
+            self._pool = None
+            # Only left over when a worker failed unexpectedly
+            for node in list(self._held):
+                self._close(node)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _submit(self, node: _Dir) -> None:
+        with self._cond:
+            self._queued += 1
+            self._running += 1
+        self._pool.submit(self._task, node)
+
+    def _task(self, node: _Dir) -> None:
+        with self._cond:
+            self._queued -= 1
+        try:
+            self._empty(node)
+        except Exception as e:
+            # The future is never looked at, so report it here; the
+            # directories above whatever failed are left in place
+            with self._lock:
+                self._report.errors.append(f"{node.path}: {e!r}")
+        finally:
+            with self._cond:
+                self._running -= 1
+                if not self._running:
+                    self._cond.notify_all()
+
+    def _idle(self) -> bool:
+        """Whether a handed-off directory would be picked up right away."""
+        return self._queued == 0 and self._running < self.workers
+
+    def _error(self, path: str, error: OSError) -> None:
+        with self._lock:
+            self._report.errors.append(f"{path}: {error.strerror or error}")
+
+    def _empty(self, node: _Dir) -> None:
+        """Delete a directory and the subdirectories not handed off, depth-first."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not self._open(node):
+                continue
+            subdirs = self._list(node)
+            for child in subdirs:
+                if self._idle():
+                    self._submit(child)
+                else:
+                    stack.append(child)
+            retry = self._release(node)
+            if retry is not None:
+                stack.append(retry)
+
+    def _open(self, node: _Dir) -> bool:
+        """Open a directory relative to its parent; False if it is given up."""
+        if node.fd is not None:
+            return True  # Emptied again after a failed rmdir
+        parent = node.parent
+        try:
+            if parent is None:
+                fd = os.open(node.name, _OPEN_FLAGS)
+            else:
+                fd = os.open(node.name, _OPEN_FLAGS, dir_fd=parent.fd)
+        except OSError as e:
+            self._opened(parent)
+            self._error(node.path, e)
+            self._abandon(parent)
+            return False
+        if node.inode and os.fstat(fd).st_ino != node.inode:
+            # Replaced since its parent was listed; leave it alone
+            os.close(fd)
+            self._opened(parent)
+            self._error(node.path, OSError(errno.ESTALE, "changed while being deleted"))
+            self._abandon(parent)
+            return False
+        with self._lock:
+            node.fd = fd
+            self._held.add(node)
+        self._opened(parent)
+        return True
+
+    def _opened(self, parent: Optional[_Dir]) -> None:
+        """Count a child of parent as opened; close parent's descriptor if it can go."""
+        if parent is None:
+            return
+        with self._lock:
+            parent.unopened -= 1
+            if parent.unopened or parent.busy or len(self._held) <= _MAX_OPEN:
+                return
+            if parent.fd is not None:
+                os.close(parent.fd)
+                parent.fd = None
+                self._held.discard(parent)
+
+    def _list(self, node: _Dir) -> List[_Dir]:
+        """Remove the files inside an open directory and return its subdirectories."""
+        files = 0
+        subdirs: List[_Dir] = []
+        with os.scandir(node.fd) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    subdirs.append(_Dir(entry.name, node, entry.inode()))
+                    continue
+                try:
+                    os.unlink(entry.name, dir_fd=node.fd)
+                    files += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self._error(os.path.join(node.path, entry.name), e)
+
+        with self._lock:
+            node.pending += len(subdirs)
+            node.unopened += len(subdirs)
+            self._report.files += files
+        if self.progress is not None:
+            self.progress(node.path, files)
+        return subdirs
+
+    def _release(self, node: Optional[_Dir]) -> Optional[_Dir]:
+        """
+        Mark a directory done; remove it and any ancestors that were waiting on it.
+
+        Returns:
+            A directory rmdir found not empty, to be emptied again, or None
+        """
+        while node is not None:
+            with self._lock:
+                node.pending -= 1
+                if node.pending:
+                    return None
+            parent = node.parent
+            try:
+                if parent is None:
+                    os.rmdir(node.name)
+                else:
+                    parent_fd = self._hold(parent, node)
+                    try:
+                        os.rmdir(node.name, dir_fd=parent_fd)
+                    finally:
+                        with self._lock:
+                            parent.busy -= 1
+                with self._lock:
+                    self._report.dirs += 1
+            except OSError as e:
+                if e.errno in (errno.ENOTEMPTY, errno.EEXIST) and node.attempts < _RETRIES:
+                    # Entries were missed while listing; empty it again
+                    node.attempts += 1
+                    node.pending = 1
+                    return node
+                self._close(node)
+                self._error(node.path, e)
+                self._abandon(parent)
+                return None
+            self._close(node)
+            node = parent
+        return None
+
+    def _hold(self, parent: _Dir, child: _Dir) -> int:
+        """
+        Return parent's descriptor for removing child, reopening it if it was closed.
+
+        Raises:
+            OSError: If the parent cannot be reopened or is not the same directory
+        """
+        with self._lock:
+            if parent.fd is None:
+                fd = os.open("..", _OPEN_FLAGS, dir_fd=child.fd)
+                if parent.inode and os.fstat(fd).st_ino != parent.inode:
+                    os.close(fd)
+                    raise OSError(errno.ESTALE, "parent changed while being deleted")
+                parent.fd = fd
+                self._held.add(parent)
+            parent.busy += 1
+            return parent.fd
+
+    def _close(self, node: _Dir) -> None:
+        with self._lock:
+            if node.fd is not None:
+                os.close(node.fd)
+                node.fd = None
+                self._held.discard(node)
+
+    def _abandon(self, node: Optional[_Dir]) -> None:
+        """A child could not be removed, so its ancestors cannot be either."""
+        while node is not None:
+            with self._lock:
+                node.pending -= 1
+                if node.pending:
+                    return
+            self._close(node)
+            self._error(node.path, OSError(errno.ENOTEMPTY, os.strerror(errno.ENOTEMPTY)))
+            node = node.parent
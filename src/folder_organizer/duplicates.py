@@ -0,0 +1,229 @@
+"""Duplicate file detection: size, then partial hash, then full hash."""
+
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from folder_organizer.hashcache import HashCache
+from folder_organizer.scanner import FileEntry, default_workers
+
+# Bytes hashed from each end of a file in the partial pass
+PARTIAL_BYTES = 64 * 1024
+
+# Bytes read per readinto() call in the full pass
+BLOCK_SIZE = 1024 * 1024
+
+# Files up to this size are read whole by the partial pass, which makes its
+# digest a full-content digest
+_SMALL_FILE = 2 * PARTIAL_BYTES
+
+
+@dataclass
+class DuplicateGroup:
+    """Files with identical content."""
+    size: int
+    paths: List[str] = field(default_factory=list)
+
+    @property
+    def reclaimable(self) -> int:
+        """Bytes freed by keeping only one copy."""
+        return self.size * (len(self.paths) - 1)
+
+
+@dataclass
+class DuplicateReport:
+    """Duplicate groups found in a set of files, plus what it took to find them."""
+    groups: List[DuplicateGroup] = field(default_factory=list)
+    files_scanned: int = 0
+    bytes_read: int = 0
+    cache_hits: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def reclaimable(self) -> int:
+        """Bytes freed by keeping one copy of every group."""
+        return sum(group.reclaimable for group in self.groups)
+
+    @property
+    def duplicate_files(self) -> int:
+        """Number of files that are extra copies."""
+        return sum(len(group.paths) - 1 for group in self.groups)
+
+
+class _Buffers(threading.local):
+    """Read buffers owned by one hashing thread, reused for every file."""
+
+    def __init__(self):
+        self.block = bytearray(BLOCK_SIZE)
+        self.view = memoryview(self.block)
+
+
+def _read_full(f, view: memoryview) -> int:
+    """Fill view from f, stopping early only at end of file."""
+    filled = 0
+    while filled < len(view):
+        n = f.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+class DuplicateFinder:
+    """
+    Finds files with identical content, reading as little as possible.
+
+    Files are grouped by size first; a file with a unique size cannot have a
+    duplicate and is never opened. Hard links to the same inode count as one
+    file. Files sharing a size get a partial hash of their first and last
+    PARTIAL_BYTES, and only those whose partial hash also collides are read
+    in full. Files of at most twice PARTIAL_BYTES are read whole by the
+    partial pass. Hashing runs on a thread pool, each thread reading into
+    its own reusable buffer with readinto(). With a HashCache, digests of
+    files unchanged since an earlier run are reused without reading them.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        min_size: int = 1,
+        cache: Optional[HashCache] = None,
+    ):
+        """
+        Initialize the finder.
+
+        Args:
+            workers: Hashing threads (auto by default)
+            min_size: Smallest file size considered, in bytes; empty files
+                are skipped by default
+            cache: Digest cache consulted before and updated after hashing
+        """
+        self.workers = workers or default_workers()
+        self.min_size = max(0, min_size)
+        self.cache = cache
+        self._buffers = _Buffers()
+
+    def find(self, entries: Iterable[FileEntry]) -> DuplicateReport:
+        """
+        Group files by content.
+
+        Args:
+            entries: Files with size, inode and device filled in
+
+        Returns:
+            DuplicateReport with groups ordered by reclaimable bytes
+        """
+        start = time.perf_counter()
+        report = DuplicateReport()
+
+        by_size: Dict[int, Dict[Hashable, FileEntry]] = {}
+        for entry in entries:
+            report.files_scanned += 1
+            if entry.size < self.min_size:
+                continue
+            key = (entry.dev, entry.inode) if entry.inode else entry.path
+            by_size.setdefault(entry.size, {}).setdefault(key, entry)
+        candidates = [list(files.values()) for files in by_size.values() if len(files) > 1]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            groups = self._split(candidates, pool, report, full=False)
+            final = [group for group in groups if group[0].size <= _SMALL_FILE]
+            large = [group for group in groups if group[0].size > _SMALL_FILE]
+            final.extend(self._split(large, pool, report, full=True))
+
+        report.groups = [
+            DuplicateGroup(group[0].size, sorted(entry.path for entry in group))
+            for group in final
+        ]
+        report.groups.sort(key=lambda group: (-group.reclaimable, group.paths[0]))
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _split(
+        self,
+        groups: List[List[FileEntry]],
+        pool: ThreadPoolExecutor,
+        report: DuplicateReport,
+        full: bool,
+    ) -> List[List[FileEntry]]:
+        """Hash every file of every group and regroup them by digest."""
+        entries = [entry for group in groups for entry in group]
+        digest: Callable[[FileEntry], bytes] = self.full_hash if full else self.partial_hash
+        kind = "full" if full else "partial"
+
+        def task(entry: FileEntry) -> Tuple[Optional[bytes], Optional[str]]:
+            try:
+                return digest(entry), None
+            except OSError as e:
+                return None, f"{entry.path}: {e.strerror or e}"
+
+        split: Dict[Tuple[int, bytes], List[FileEntry]] = {}
+        cached: List[Optional[bytes]] = [None] * len(entries)
+        if self.cache is not None:
+            cached = self.cache.get_many(entries, kind)
+        for entry, value in zip(entries, cached):
+            if value is not None:
+                report.cache_hits += 1
+                split.setdefault((entry.size, value), []).append(entry)
+
+        misses = [entry for entry, value in zip(entries, cached) if value is None]
+        hashed = []
+        for entry, (value, error) in zip(misses, pool.map(task, misses)):
+            if error is not None:
+                report.errors.append(error)
+                continue
+            report.bytes_read += entry.size if full else min(entry.size, _SMALL_FILE)
+            hashed.append((entry, value))
+            split.setdefault((entry.size, value), []).append(entry)
+        if self.cache is not None and hashed:
+            self.cache.put_many(hashed, kind)
+        return [group for group in split.values() if len(group) > 1]
+
+    def partial_hash(self, entry: FileEntry) -> bytes:
+        """
+        Hash the first and last PARTIAL_BYTES of a file (all of a small file).
+
+        Raises:
+            OSError: If the file cannot be read or its size changed
+        """
+        view = self._buffers.view
+        hasher = hashlib.blake2b(digest_size=20)
+        with open(entry.path, "rb", buffering=0) as f:
+            if entry.size <= _SMALL_FILE:
+                n = _read_full(f, view[:entry.size + 1])
+                if n != entry.size:
+                    raise OSError(f"size changed from {entry.size} to {n} bytes")
+                hasher.update(view[:n])
+                return hasher.digest()
+            head = _read_full(f, view[:PARTIAL_BYTES])
+            f.seek(entry.size - PARTIAL_BYTES)
+            tail = _read_full(f, view[PARTIAL_BYTES:2 * PARTIAL_BYTES])
+            if head + tail != _SMALL_FILE:
+                raise OSError("file was truncated")
+            hasher.update(view[:_SMALL_FILE])
+        return hasher.digest()
+
+    def full_hash(self, entry: FileEntry) -> bytes:
+        """
+        Hash a whole file.
+
+        Raises:
+            OSError: If the file cannot be read or its size changed
+        """
+        view = self._buffers.view
+        hasher = hashlib.blake2b(digest_size=20)
+        total = 0
+        with open(entry.path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(view)
+                if not n:
+                    break
+                hasher.update(view[:n])
+                total += n
+        if total != entry.size:
+            raise OSError(f"size changed from {entry.size} to {total} bytes")
+        return hasher.digest()
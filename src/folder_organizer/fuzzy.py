@@ -0,0 +1,327 @@
+"""Fuzzy, ranked file name matching."""
+
+import os
+import re
+import heapq
+import threading
+from collections import Counter
+from functools import lru_cache
+from itertools import chain, compress, islice
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from rich.text import Text
+
+from folder_organizer.scanner import FileEntry
+
+# Scoring constants, modelled on fzf
+SCORE_MATCH = 16
+PENALTY_GAP_START = -3
+PENALTY_GAP_EXTENSION = -1
+BONUS_BOUNDARY = 8
+BONUS_PATH_BOUNDARY = 9
+BONUS_CAMEL = 7
+BONUS_CONSECUTIVE = 4
+BONUS_EXTENSION = 24
+FIRST_CHAR_MULTIPLIER = 2
+
+_WORD_SEPARATORS = frozenset(" _-.")
+_PATH_SEPARATORS = frozenset("/\\")
+
+
+class FuzzyMatch(NamedTuple):
+    """A candidate that matched a fuzzy query."""
+    score: int
+    index: int
+    text: str
+    positions: Tuple[int, ...]
+
+
+def _char_bonus(text: str, pos: int) -> int:
+    """Bonus for a query character matched at text[pos]."""
+    if pos == 0:
+        return BONUS_BOUNDARY
+    prev = text[pos - 1]
+    if prev in _PATH_SEPARATORS:
+        return BONUS_PATH_BOUNDARY
+    if prev in _WORD_SEPARATORS:
+        return BONUS_BOUNDARY
+    char = text[pos]
+    if char.isupper() and prev.islower() or char.isdigit() and not prev.isdigit():
+        return BONUS_CAMEL
+    return 0
+
+
+def score(text: str, positions: Sequence[int], query: str) -> int:
+    """
+    Score a match of query against text at the given positions.
+
+    Every matched character is worth SCORE_MATCH plus a bonus when it starts
+    a word (after a separator, at a camelCase hump or a digit run) or extends
+    a run of consecutive matches; the first character's bonus counts double.
+    Gaps between matched characters are penalized. A query ending in the
+    text's extension (".pdf" in "report.pdf") earns BONUS_EXTENSION.
+
+    Args:
+        text: Candidate in its original case
+        positions: Index in text of each query character
+        query: Lower-cased query
+
+    Returns:
+        The score; higher is better
+    """
+    total = 0
+    prev = -1
+    for n, pos in enumerate(positions):
+        bonus = _char_bonus(text, pos)
+        if n == 0:
+            bonus *= FIRST_CHAR_MULTIPLIER
+        elif pos == prev + 1:
+            bonus = max(bonus, BONUS_CONSECUTIVE)
+        else:
+            total += PENALTY_GAP_START + PENALTY_GAP_EXTENSION * (pos - prev - 2)
+        total += SCORE_MATCH + bonus
+        prev = pos
+
+    dot = query.rfind(".")
+    if dot != -1:
+        suffix = query[dot:]
+        base_start = max(text.rfind("/"), text.rfind("\\")) + 1
+        if text.rfind(".") > base_start and text.lower().endswith(suffix):
+            total += BONUS_EXTENSION
+    return total
+
+
+def highlight(text: str, positions: Sequence[int], style: str = "bold cyan") -> Text:
+    """Return text as a Rich Text with the matched characters styled."""
+    styled = Text(text)
+    for pos in positions:
+        styled.stylize(style, pos, pos + 1)
+    return styled
+
+
+# Records are "<lower-cased text>\x01<index>" joined by NUL. File names cannot
+# contain NUL; the rare name containing \x01 has it masked in the record.
+_SEP = "\x00"
+_TAG = "\x01"
+
+# Suggested shortlist for FuzzyFinder's approximate mode: beyond this many
+# matches only the ones with the tightest match spans are scored
+SHORTLIST_SIZE = 4096
+
+# Matches scored between two checks of the cancelled callback
+_CANCEL_CHECK_EVERY = 4096
+
+
+@lru_cache(maxsize=64)
+def _subsequence_patterns(query: str) -> Tuple["re.Pattern[str]", "re.Pattern[str]"]:
+    """
+    Regexes finding query as a subsequence within one record.
+
+    Each gap only excludes the next query character, so a match is found
+    without backtracking, and the patterns start with a literal for a fast
+    scan. The first captures the record index of every match, the second
+    the matched span. Each has a single group, so findall() returns plain
+    strings instead of tuples the garbage collector would have to track.
+    """
+    parts = [re.escape(query[0])]
+    for char in query[1:]:
+        char = re.escape(char)
+        parts.append(f"[^\\x00\\x01{char}]*{char}")
+    core = "".join(parts)
+    return (
+        re.compile(core + "[^\\x00\\x01]*\\x01(\\d+)"),
+        re.compile("(" + core + ")[^\\x00\\x01]*\\x01\\d+"),
+    )
+
+
+def _positions(lower: str, query: str) -> Optional[Tuple[int, ...]]:
+    """
+    Return where each query character matches, preferring a tight window.
+
+    The leftmost match fixes where the last character lands; scanning back
+    from there picks the latest occurrence of each earlier character, which
+    shrinks the window the way fzf does.
+    """
+    pos = -1
+    for char in query:
+        pos = lower.find(char, pos + 1)
+        if pos == -1:
+            return None
+    positions = [pos]
+    for char in reversed(query[:-1]):
+        pos = lower.rfind(char, 0, pos)
+        positions.append(pos)
+    positions.reverse()
+    return tuple(positions)
+
+
+def _is_subsequence(needle: str, haystack: str) -> bool:
+    it = iter(haystack)
+    return all(char in it for char in needle)
+
+
+def _original_positions(text: str, positions: Sequence[int]) -> Tuple[int, ...]:
+    """
+    Map positions in text.lower() back to text.
+
+    Only needed when lower-casing changed the length, e.g. "İ" becomes two
+    characters; several lower-cased characters can map to the same original.
+    """
+    owner = [i for i, char in enumerate(text) for _ in char.lower()]
+    return tuple(sorted({owner[pos] for pos in positions}))
+
+
+class FuzzyFinder:
+    """
+    fzf-style subsequence matcher over a fixed set of candidates.
+
+    Candidates are lower-cased once and joined into a single string, so the
+    subsequence test for all of them is one regex scan in C that returns the
+    matching indices and match spans without a per-candidate Python loop.
+    Every match is then scored and ranked through a bounded heap, so the
+    best ``limit`` matches are exact. When a query extends the previous one
+    (every character of the old query appears, in order, in the new one),
+    only the previous matches are scanned.
+
+    Scoring is the costly part for short queries over huge candidate sets.
+    With ``shortlist`` set, a query with more matches than that has its span
+    lengths (a cheap proxy for the gap penalty) bucketed in C and only the
+    tightest matches scored. That is approximate: the extension and word
+    boundary bonuses are not known before scoring, so the best match can be
+    left out.
+
+    Searches are serialized, so a finder can be shared by worker threads.
+    """
+
+    def __init__(self, texts: Sequence[str], shortlist: Optional[int] = None):
+        """
+        Prepare candidates for matching.
+
+        Args:
+            texts: Candidate strings, e.g. file names or relative paths
+            shortlist: Most matches scored per query (approximate ranking),
+                e.g. SHORTLIST_SIZE; None scores every match
+        """
+        self.texts = list(texts)
+        self.shortlist = shortlist
+        self._lower = [text.lower() for text in self.texts]
+        self._records = [
+            f"{lower.replace(_TAG, '?')}{_TAG}{index}" for index, lower in enumerate(self._lower)
+        ]
+        self._lock = threading.Lock()
+        self._blob: Optional[str] = None
+        self._query: Optional[str] = None
+        self._matched: List[int] = []
+        self._matched_records: Optional[str] = None
+
+    def match(
+        self,
+        query: str,
+        limit: Optional[int] = 50,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Tuple[int, List[FuzzyMatch]]:
+        """
+        Rank the candidates against a query.
+
+        Args:
+            query: Characters to find, in order, case-insensitively
+            limit: Number of best matches to return (None returns all)
+            cancelled: Checked between phases and while scoring; once it
+                returns True the search stops and the partial result is not
+                reused
+
+        Returns:
+            Tuple of (number of matching candidates, best matches by
+            descending score, ties going to shorter then earlier candidates)
+        """
+        query = "".join(char for char in query.lower() if char not in (_SEP, _TAG))
+        with self._lock:
+            if not query:
+                count = len(self.texts)
+                shown = range(count if limit is None else min(limit, count))
+                return count, [FuzzyMatch(0, i, self.texts[i], ()) for i in shown]
+
+            if self._query is not None and _is_subsequence(self._query, query):
+                blob = self._matched_blob()
+            else:
+                if self._blob is None:
+                    self._blob = _SEP.join(self._records)
+                blob = self._blob
+
+            find_ids, find_spans = _subsequence_patterns(query)
+            matched = list(map(int, find_ids.findall(blob)))
+            if cancelled is not None and cancelled():
+                self._query = None
+                return len(matched), []
+            self._query = query
+            self._matched = matched
+            self._matched_records = None
+
+            candidates: Iterable[int] = matched
+            size = self.shortlist
+            if size is not None and len(matched) > size and limit is not None:
+                lengths = list(map(len, find_spans.findall(self._matched_blob())))
+                histogram = Counter(lengths)
+                tighter = 0
+                for widest in sorted(histogram):
+                    if tighter + histogram[widest] >= size:
+                        break
+                    tighter += histogram[widest]
+                # Everything tighter than the widest admitted span, then as
+                # many of the widest as still fit
+                candidates = chain(
+                    compress(matched, map(widest.__gt__, lengths)),
+                    islice(compress(matched, map(widest.__eq__, lengths)), size - tighter),
+                )
+
+        texts, lower = self.texts, self._lower
+        heap: List[Tuple[int, int, int, Tuple[int, ...]]] = []
+        for n, index in enumerate(candidates):
+            if cancelled is not None and n % _CANCEL_CHECK_EVERY == 0 and cancelled():
+                return len(matched), []
+            positions = _positions(lower[index], query)
+            if positions is None:
+                continue
+            text = texts[index]
+            if len(text) != len(lower[index]):
+                # Lower-casing changed the length; score on the lower-cased text
+                text = lower[index]
+            item = (score(text, positions, query), -len(text), -index, positions)
+            if limit is None or len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        ranked = sorted(heap, reverse=True)
+        matches = []
+        for value, _, neg_index, positions in ranked:
+            text = texts[-neg_index]
+            if len(text) != len(lower[-neg_index]):
+                positions = _original_positions(text, positions)
+            matches.append(FuzzyMatch(value, -neg_index, text, positions))
+        return len(matched), matches
+
+    def _matched_blob(self) -> str:
+        """Records of the previous query's matches, joined on first use."""
+        if self._matched_records is None:
+            self._matched_records = _SEP.join(map(self._records.__getitem__, self._matched))
+        return self._matched_records
+
+
+class FileFinder(FuzzyFinder):
+    """FuzzyFinder over scanned files, matching their paths relative to a root."""
+
+    def __init__(
+        self, entries: Sequence[FileEntry], root: str, shortlist: Optional[int] = None
+    ):
+        """
+        Prepare files for matching.
+
+        Args:
+            entries: Files to match
+            root: Folder the entries were found in
+            shortlist: See FuzzyFinder; None ranks exactly
+        """
+        self.entries = list(entries)
+        prefix = len(os.path.join(root, ""))
+        super().__init__([entry.path[prefix:] for entry in self.entries], shortlist)
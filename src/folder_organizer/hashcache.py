@@ -0,0 +1,198 @@
+"""Persistent cache of file content hashes."""
+
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from folder_organizer.config import cache_dir
+from folder_organizer.scanner import FileEntry
+
+SCHEMA_VERSION = 1
+
+# Changing how digests are computed must change this, so old digests are dropped
+HASH_ALGORITHM = "blake2b-160/partial-64KiB"
+
+HASH_KINDS = ("partial", "full")
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# Granularity of the last-used stamp; hits within the same period are not
+# written back, so a warm cache is read without turning every lookup into a write
+_USE_PERIOD = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial BLOB,
+    full BLOB,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (dev, ino)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS hashes_used ON hashes(used);
+"""
+
+
+def hash_cache_path() -> Path:
+    """Return the database file of the user's hash cache."""
+    return cache_dir() / "hashes.sqlite3"
+
+
+class HashCache:
+    """
+    Content digests of files, remembered across runs.
+
+    Digests are stored per inode together with the size and mtime the file
+    had when it was hashed, and a lookup only hits when both still match,
+    so a file that changed is hashed again. One row holds both the partial
+    and the full digest of a file; rows are a few dozen bytes. Every row
+    carries a coarse last-used stamp, and once the cache holds more than
+    ``max_entries`` rows the least recently used ones are evicted.
+
+    Lookups and stores are serialized, so a cache can be shared by threads.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Open (or create) the cache.
+
+        Args:
+            db_path: Database location (defaults to the user cache directory)
+            max_entries: Number of files remembered before evicting
+        """
+        self.db_path = Path(db_path) if db_path else hash_cache_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, max_entries)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        stored = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if (stored.get("schema"), stored.get("algorithm")) != (str(SCHEMA_VERSION), HASH_ALGORITHM):
+            with self._conn:
+                self._conn.execute("DELETE FROM hashes")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [("schema", str(SCHEMA_VERSION)), ("algorithm", HASH_ALGORITHM)],
+                )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM hashes").fetchone()[0]
+
+    @staticmethod
+    def _column(kind: str) -> str:
+        if kind not in HASH_KINDS:
+            raise ValueError(f"Unknown hash kind: {kind}")
+        return kind
+
+    def get_many(self, entries: Sequence[FileEntry], kind: str) -> List[Optional[bytes]]:
+        """
+        Look up the digests of files.
+
+        Args:
+            entries: Files with size, mtime, inode and device filled in
+            kind: One of HASH_KINDS
+
+        Returns:
+            The cached digest of each entry, or None where the file is not
+            cached, changed since it was hashed or has no inode
+
+        Raises:
+            ValueError: If kind is unknown
+        """
+        column = self._column(kind)
+        now = int(time.time()) // _USE_PERIOD
+        query = f"SELECT size, mtime_ns, {column}, used FROM hashes WHERE dev = ? AND ino = ?"
+        digests: List[Optional[bytes]] = []
+        touched = []
+        with self._lock, self._conn:
+            for entry in entries:
+                row = None
+                if entry.inode:
+                    row = self._conn.execute(query, (entry.dev, entry.inode)).fetchone()
+                if (
+                    row is None or row[0] != entry.size
+                    or row[1] != entry.mtime_ns or row[2] is None
+                ):
+                    digests.append(None)
+                    continue
+                digests.append(bytes(row[2]))
+                if row[3] < now:
+                    touched.append((now, entry.dev, entry.inode))
+            if touched:
+                self._conn.executemany(
+                    "UPDATE hashes SET used = ? WHERE dev = ? AND ino = ?", touched
+                )
+        return digests
+
+    def put_many(self, items: Iterable[Tuple[FileEntry, bytes]], kind: str) -> None:
+        """
+        Remember the digests of files, evicting old entries beyond the cap.
+
+        Storing a digest for a file whose size or mtime changed drops the
+        other digest kept for it.
+
+        Args:
+            items: (file, digest) pairs; files without an inode are skipped
+            kind: One of HASH_KINDS
+
+        Raises:
+            ValueError: If kind is unknown
+        """
+        column = self._column(kind)
+        other = "full" if column == "partial" else "partial"
+        now = int(time.time()) // _USE_PERIOD
+        rows = [
+            (entry.dev, entry.inode, entry.size, entry.mtime_ns, digest, now)
+            for entry, digest in items
+            if entry.inode
+        ]
+        if not rows:
+            return
+        same = "size = excluded.size AND mtime_ns = excluded.mtime_ns"
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO hashes (dev, ino, size, mtime_ns, {column}, used) "
+                f"VALUES (?, ?, ?, ?, ?, ?) "
+                f"ON CONFLICT (dev, ino) DO UPDATE SET "
+                f"{other} = CASE WHEN {same} THEN {other} END, "
+                f"{column} = excluded.{column}, size = excluded.size, "
+                f"mtime_ns = excluded.mtime_ns, used = excluded.used",
+                rows,
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently used rows beyond max_entries (lock held)."""
+        excess = self._conn.execute("SELECT count(*) FROM hashes").fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return
+        # Evict a tenth more than needed so the next stores do not evict again
+        excess += self.max_entries // 10
+        self._conn.execute(
+            "DELETE FROM hashes WHERE (dev, ino) IN "
+            "(SELECT dev, ino FROM hashes ORDER BY used LIMIT ?)",
+            (excess,),
+        )
+
+    def clear(self) -> None:
+        """Forget every digest."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM hashes")
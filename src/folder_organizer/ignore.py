@@ -0,0 +1,292 @@
+"""Exclude rules with .gitignore semantics."""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+GITIGNORE = ".gitignore"
+
+# Directories whose rules each walker thread keeps at hand
+_CACHE_SIZE = 256
+
+
+def _translate_glob(part: str) -> str:
+    """Translate one path segment of a gitignore pattern to regex source."""
+    out = []
+    i, n = 0, len(part)
+    while i < n:
+        char = part[i]
+        i += 1
+        if char == "\\" and i < n:
+            out.append(re.escape(part[i]))
+            i += 1
+        elif char == "*":
+            while i < n and part[i] == "*":
+                i += 1
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = i
+            if end < n and part[end] in "!^":
+                end += 1
+            if end < n and part[end] == "]":
+                end += 1
+            end = part.find("]", end)
+            if end == -1:
+                out.append("\\[")
+                continue
+            body = part[i:end]
+            i = end + 1
+            negate = body[:1] in ("!", "^")
+            if negate:
+                body = body[1:]
+            body = body.replace("\\", "\\\\")
+            out.append(f"[{'^/' if negate else ''}{body}]")
+        else:
+            out.append(re.escape(char))
+    return "".join(out)
+
+
+def translate(pattern: str) -> Optional[Tuple[str, bool, bool]]:
+    """
+    Translate one gitignore line into regex source.
+
+    The regex must match a whole path relative to the directory the rule
+    belongs to, using ``/`` as separator.
+
+    Args:
+        pattern: A line from a .gitignore file or exclude_patterns
+
+    Returns:
+        Tuple of (regex source, negated, directory only), or None for blank
+        lines and comments
+    """
+    # Trailing spaces are ignored unless escaped
+    line = pattern.rstrip("\n")
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash anywhere but at the end anchors the pattern to its directory
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    parts = line.split("/")
+    source = [] if anchored or parts[0] == "**" else ["(?:[^/]*/)*"]
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if part == "**":
+            source.append(".*" if last else "(?:[^/]*/)*")
+        else:
+            source.append(_translate_glob(part) + ("" if last else "/"))
+    return "".join(source), negated, dir_only
+
+
+class IgnoreRules:
+    """
+    An ordered list of gitignore patterns compiled into one regex.
+
+    Rules are combined into a single alternation in reverse order, so one
+    ``fullmatch`` call finds the last rule matching a path, which is the one
+    gitignore says wins. Directory-only rules (``build/``) are left out of
+    the regex used for files.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Compile patterns.
+
+        Args:
+            patterns: gitignore lines, in file order
+        """
+        self.patterns = list(patterns)
+        rules = [rule for rule in map(translate, self.patterns) if rule is not None]
+        rules.reverse()
+        self._negated = [negated for _, negated, _ in rules]
+        self._dirs = self._combine(rules, dirs=True)
+        self._files = self._combine(rules, dirs=False)
+
+    @staticmethod
+    def _combine(rules: List[Tuple[str, bool, bool]], dirs: bool) -> Optional["re.Pattern[str]"]:
+        branches = [
+            f"(?P<r{i}>{source})"
+            for i, (source, _, dir_only) in enumerate(rules)
+            if dirs or not dir_only
+        ]
+        return re.compile("|".join(branches), re.DOTALL) if branches else None
+
+    @classmethod
+    def from_file(cls, path: str) -> Optional["IgnoreRules"]:
+        """
+        Read a .gitignore file.
+
+        Returns:
+            The compiled rules, or None if the file is missing, unreadable
+            or has no rules
+        """
+        try:
+            with open(path, encoding="utf-8", errors="surrogateescape") as f:
+                rules = cls(f.read().splitlines())
+        except OSError:
+            return None
+        return rules if rules._dirs is not None else None
+
+    def __bool__(self) -> bool:
+        return self._dirs is not None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Look up the rule deciding a path.
+
+        Args:
+            rel_path: Path relative to the rules' directory, ``/``-separated
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the path is ignored, False if a negated rule re-includes
+            it, None if no rule matches
+        """
+        regex = self._dirs if is_dir else self._files
+        if regex is None:
+            return None
+        m = regex.fullmatch(rel_path)
+        if m is None:
+            return None
+        return not self._negated[int(m.lastgroup[1:])]
+
+    def ignores(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Check a relative path, including whether one of its parents is ignored.
+
+        Args:
+            rel_path: Path relative to the rules' directory, ``/``-separated
+            is_dir: Whether the path itself is a directory
+
+        Returns:
+            True if the path or any parent directory is ignored
+        """
+        parts = [part for part in rel_path.split("/") if part]
+        for depth in range(1, len(parts) + 1):
+            last = depth == len(parts)
+            if self.match("/".join(parts[:depth]), is_dir or not last):
+                return True
+        return False
+
+
+class _Level:
+    """Rules that apply inside one directory, chained to the enclosing ones."""
+
+    __slots__ = ("prefix", "rules", "parent")
+
+    def __init__(self, base: str, rules: IgnoreRules, parent: Optional["_Level"]):
+        self.prefix = os.path.join(base, "")
+        self.rules = rules
+        self.parent = parent
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        level: Optional[_Level] = self
+        while level is not None:
+            rel = path[len(level.prefix):]
+            if os.sep != "/":
+                rel = rel.replace(os.sep, "/")
+            decision = level.rules.match(rel, is_dir)
+            if decision is not None:
+                return decision
+            level = level.parent
+        return False
+
+
+class Excluder:
+    """
+    Walk-time exclude predicate (see ParallelWalker) with gitignore semantics.
+
+    The configured patterns apply relative to the root. Each .gitignore found
+    in a walked directory adds rules relative to that directory which take
+    precedence over those of its parents, like git does. Checking an entry
+    costs one regex call per level that has rules, usually just one.
+
+    Only directories whose .gitignore has rules are remembered for the whole
+    walk; every other directory inherits its parent's rules. Each walker
+    thread keeps the rules of the last _CACHE_SIZE directories it looked at,
+    which covers the directory being listed and its ancestors, so memory
+    stays flat however many directories the tree has.
+    """
+
+    def __init__(self, root: str, rules: Optional[IgnoreRules] = None, gitignore: bool = True):
+        """
+        Initialize the predicate.
+
+        Args:
+            root: Directory the walk starts at
+            rules: Patterns relative to the root (e.g. exclude_patterns)
+            gitignore: Whether to honor .gitignore files found during the walk
+        """
+        self.root = os.fspath(root)
+        self.gitignore = gitignore
+        self._root_level = _Level(self.root, rules, None) if rules else None
+        self._lock = threading.Lock()
+        self._with_rules: Dict[str, _Level] = {}
+        self._local = threading.local()
+
+    def __call__(self, entry: os.DirEntry, is_dir: bool) -> bool:
+        level = self._level(os.path.dirname(entry.path))
+        return level is not None and level.ignored(entry.path, is_dir)
+
+    def _level(self, directory: str) -> Optional[_Level]:
+        """Return the rules applying to entries of a directory."""
+        cache = getattr(self._local, "cache", None)
+        if cache is None:
+            cache = self._local.cache = OrderedDict()
+        if directory in cache:
+            cache.move_to_end(directory)
+            return cache[directory]
+
+        # Resolve the directories not cached yet, outermost first
+        missing = []
+        path = directory
+        while True:
+            if path in cache:
+                level = cache[path]
+                break
+            missing.append(path)
+            if path == self.root or len(path) <= len(self.root):
+                level = self._root_level
+                break
+            path = os.path.dirname(path)
+        for path in reversed(missing):
+            level = self._own_level(path, level)
+            cache[path] = level
+            if len(cache) > _CACHE_SIZE:
+                cache.popitem(last=False)
+        return level
+
+    def _own_level(self, directory: str, parent: Optional[_Level]) -> Optional[_Level]:
+        """Chain a directory's .gitignore rules, if it has any, to its parent's."""
+        if not self.gitignore:
+            return parent
+        with self._lock:
+            level = self._with_rules.get(directory)
+        if level is not None:
+            return level
+        rules = IgnoreRules.from_file(os.path.join(directory, GITIGNORE))
+        if rules is None:
+            return parent
+        with self._lock:
+            return self._with_rules.setdefault(directory, _Level(directory, rules, parent))
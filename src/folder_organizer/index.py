@@ -0,0 +1,441 @@
+"""Persistent SQLite metadata index for a folder tree."""
+
+import os
+import json
+import stat
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from folder_organizer.config import cache_dir
+from folder_organizer.ignore import GITIGNORE
+from folder_organizer.scanner import ExcludeFn
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent INTEGER,
+    name TEXT NOT NULL,
+    mtime_ns INTEGER,
+    is_link INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    dir INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    category TEXT,
+    is_link INTEGER NOT NULL,
+    is_file INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+"""
+
+# Rows produced for one listed directory: (name, size, mtime_ns, inode, is_link, is_file)
+_FileRow = Tuple[str, Optional[int], Optional[int], Optional[int], int, int]
+
+
+def index_path_for(root: Path) -> Path:
+    """Return the database file used to index a root folder."""
+    digest = hashlib.sha1(str(root).encode("utf-8", "surrogateescape")).hexdigest()
+    return cache_dir() / "index" / f"{digest}.sqlite3"
+
+
+class MetadataIndex:
+    """
+    On-disk index of every entry below a root folder.
+
+    The index stores one row per directory (with the mtime it had when it was
+    last listed) and one row per non-directory entry (size, mtime, inode and
+    category). A refresh stats every known directory but only re-lists the
+    ones whose mtime changed, which is what the filesystem bumps whenever an
+    entry is created, removed or renamed inside it. Files rewritten in place
+    do not touch the directory mtime, so their stored size and mtime can lag
+    behind: callers stat the rows they return, or ask refresh() to re-stat
+    everything. Only .gitignore files are always re-stat'ed; when one
+    changes, everything below its directory is re-listed, since which
+    entries are excluded may have changed.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        categorize: Callable[[str], Optional[str]],
+        rules_key: str = "",
+        db_path: Optional[Path] = None,
+        exclude: Optional[ExcludeFn] = None,
+    ):
+        """
+        Open (or create) the index for a root folder.
+
+        Args:
+            root: Folder being indexed
+            categorize: Maps a file name to its category (or None)
+            rules_key: Fingerprint of the category and exclude rules; the
+                index is rebuilt when it changes
+            db_path: Database location (defaults to the user cache directory)
+            exclude: Entries to leave out of the index, see ParallelWalker
+        """
+        self.root = Path(root)
+        self.categorize = categorize
+        self.exclude = exclude
+        self.db_path = Path(db_path) if db_path else index_path_for(self.root)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        stored = (self._get_meta("schema"), self._get_meta("root"), self._get_meta("rules"))
+        if stored != (str(SCHEMA_VERSION), str(self.root), rules_key):
+            self._reset(rules_key)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Freshness and refresh
+    # ------------------------------------------------------------------
+
+    @property
+    def version(self) -> str:
+        """Token that changes whenever the indexed entries change."""
+        return self._get_meta("version") or ""
+
+    @property
+    def refreshed_at(self) -> Optional[float]:
+        """Unix time of the last completed refresh, or None if never built."""
+        value = self._get_meta("refreshed_at")
+        return float(value) if value else None
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Return True if the last refresh happened less than max_age seconds ago."""
+        refreshed_at = self.refreshed_at
+        return refreshed_at is not None and time.time() - refreshed_at <= max_age
+
+    def ensure_fresh(self, max_age: float) -> bool:
+        """
+        Refresh the index if it is older than max_age.
+
+        Returns:
+            True if anything in the index changed
+        """
+        if self.is_fresh(max_age):
+            return False
+        return self.refresh()
+
+    def refresh(self, restat: bool = False) -> bool:
+        """
+        Bring the index up to date with the filesystem.
+
+        Every indexed directory is stat'ed once; only directories that are new
+        or whose mtime changed are listed again.
+
+        Args:
+            restat: Also stat the files of unchanged directories, to catch
+                contents rewritten in place (costs about as much as a walk)
+
+        Returns:
+            True if anything in the index changed
+        """
+        with self._lock, self._conn:
+            root_id = self._root_id()
+            changed = False
+            stack = [(root_id, str(self.root))]
+            while stack:
+                dir_id, path = stack.pop()
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    if dir_id != root_id:
+                        self._drop_subtree(path)
+                        changed = True
+                    continue
+
+                row = self._conn.execute(
+                    "SELECT mtime_ns FROM dirs WHERE id = ?", (dir_id,)
+                ).fetchone()
+                gitignore = self._gitignore_row(dir_id)
+                relisted = row[0] != mtime_ns
+                if relisted:
+                    self._relist(dir_id, path, mtime_ns)
+                    changed = True
+                elif self._restat(dir_id, path, None if restat else GITIGNORE):
+                    changed = True
+                if self._gitignore_row(dir_id) != gitignore:
+                    # Exclusions may have changed here and anywhere below
+                    if not relisted:
+                        self._relist(dir_id, path, mtime_ns)
+                    self._invalidate_below(path)
+                    changed = True
+
+                stack.extend(self._conn.execute(
+                    "SELECT id, path FROM dirs WHERE parent = ? AND is_link = 0", (dir_id,)
+                ))
+
+            if changed or self.refreshed_at is None:
+                self._store_summary()
+            self._set_meta("refreshed_at", repr(time.time()))
+        return changed
+
+    def _relist(self, dir_id: int, path: str, mtime_ns: int) -> None:
+        """Replace the stored children of one directory with a fresh listing."""
+        files: List[_FileRow] = []
+        subdirs: Dict[str, int] = {}
+        exclude = self.exclude
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if exclude is not None and exclude(entry, is_dir):
+                        continue
+                    if is_dir:
+                        try:
+                            subdirs[entry.name] = int(entry.is_symlink())
+                        except OSError:
+                            subdirs[entry.name] = 1
+                    else:
+                        files.append(self._file_row(entry))
+        except OSError:
+            # Unreadable directory: index it as empty, like os.walk would
+            files, subdirs = [], {}
+
+        conn = self._conn
+        conn.execute("DELETE FROM files WHERE dir = ?", (dir_id,))
+        conn.executemany(
+            "INSERT INTO files (dir, name, size, mtime_ns, inode, category, is_link, is_file) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (dir_id, name, size, mtime, inode,
+                 self.categorize(name) if is_file else None, is_link, is_file)
+                for name, size, mtime, inode, is_link, is_file in files
+            ),
+        )
+
+        existing = dict(conn.execute(
+            "SELECT name, is_link FROM dirs WHERE parent = ?", (dir_id,)
+        ))
+        for name, is_link in existing.items():
+            if subdirs.get(name) != is_link:
+                self._drop_subtree(os.path.join(path, name))
+        conn.executemany(
+            "INSERT INTO dirs (path, parent, name, mtime_ns, is_link) VALUES (?, ?, ?, NULL, ?)",
+            (
+                (os.path.join(path, name), dir_id, name, is_link)
+                for name, is_link in subdirs.items()
+                if existing.get(name) != is_link
+            ),
+        )
+        conn.execute("UPDATE dirs SET mtime_ns = ? WHERE id = ?", (mtime_ns, dir_id))
+
+    def _restat(self, dir_id: int, path: str, only: Optional[str] = None) -> bool:
+        """
+        Stat the indexed files of an unchanged directory and update stale rows.
+
+        Args:
+            only: Only stat the file with this name, e.g. GITIGNORE
+
+        Returns:
+            True if any row changed
+        """
+        query = "SELECT id, name, size, mtime_ns, inode, is_file FROM files WHERE dir = ?"
+        if only is None:
+            rows = self._conn.execute(query, (dir_id,)).fetchall()
+        else:
+            rows = self._conn.execute(query + " AND name = ?", (dir_id, only)).fetchall()
+        if not rows:
+            return False
+        fd = None
+        if len(rows) > 1 and os.stat in os.supports_dir_fd and hasattr(os, "O_DIRECTORY"):
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                return False
+        updates = []
+        try:
+            for file_id, name, size, mtime_ns, inode, is_file in rows:
+                try:
+                    # Followed like DirEntry.stat() in _file_row
+                    if fd is None:
+                        st = os.stat(os.path.join(path, name))
+                    else:
+                        st = os.stat(name, dir_fd=fd)
+                    is_reg = int(stat.S_ISREG(st.st_mode))
+                    current = (st.st_size, st.st_mtime_ns, st.st_ino, is_reg)
+                except OSError:
+                    current = (None, None, None, 0)
+                if current != (size, mtime_ns, inode, is_file):
+                    category = self.categorize(name) if current[3] else None
+                    updates.append((*current, category, file_id))
+        finally:
+            if fd is not None:
+                os.close(fd)
+        self._conn.executemany(
+            "UPDATE files SET size = ?, mtime_ns = ?, inode = ?, is_file = ?, category = ? "
+            "WHERE id = ?",
+            updates,
+        )
+        return bool(updates)
+
+    def _gitignore_row(self, dir_id: int) -> Optional[Tuple[Any, ...]]:
+        """Return the stored stat of a directory's .gitignore, if it has one."""
+        return self._conn.execute(
+            "SELECT size, mtime_ns, inode FROM files WHERE dir = ? AND name = ?",
+            (dir_id, GITIGNORE),
+        ).fetchone()
+
+    def _invalidate_below(self, path: str) -> None:
+        """Have every directory below path re-listed when the refresh reaches it."""
+        prefix = path + os.sep
+        prefix_end = path + chr(ord(os.sep) + 1)
+        self._conn.execute(
+            "UPDATE dirs SET mtime_ns = NULL WHERE path >= ? AND path < ?",
+            (prefix, prefix_end),
+        )
+
+    @staticmethod
+    def _file_row(entry: os.DirEntry) -> _FileRow:
+        """Build the stored row for a non-directory entry."""
+        try:
+            is_link = entry.is_symlink()
+        except OSError:
+            is_link = False
+        try:
+            # Symlinks are followed so that links to files can still be searched
+            st = entry.stat()
+            is_file = entry.is_file()
+        except OSError:
+            if not is_link:
+                return entry.name, None, None, None, 0, 0
+            return entry.name, None, None, None, 1, 0
+        return entry.name, st.st_size, st.st_mtime_ns, st.st_ino, int(is_link), int(is_file)
+
+    def _drop_subtree(self, path: str) -> None:
+        """Remove a directory and everything indexed below it."""
+        prefix = path + os.sep
+        # Every path starting with prefix sorts in [prefix, prefix_end)
+        prefix_end = path + chr(ord(os.sep) + 1)
+        where = "path = ? OR (path >= ? AND path < ?)"
+        params = (path, prefix, prefix_end)
+        self._conn.execute(
+            f"DELETE FROM files WHERE dir IN (SELECT id FROM dirs WHERE {where})", params
+        )
+        self._conn.execute(f"DELETE FROM dirs WHERE {where}", params)
+
+    def _root_id(self) -> int:
+        row = self._conn.execute(
+            "SELECT id FROM dirs WHERE parent IS NULL AND path = ?", (str(self.root),)
+        ).fetchone()
+        if row:
+            return row[0]
+        cur = self._conn.execute(
+            "INSERT INTO dirs (path, parent, name, mtime_ns, is_link) VALUES (?, NULL, ?, NULL, 0)",
+            (str(self.root), self.root.name),
+        )
+        return cur.lastrowid
+
+    def _store_summary(self) -> None:
+        """Precompute the aggregates served by summary() and bump the version."""
+        root_id = self._root_id()
+        file_count, total_size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files WHERE is_link = 0"
+        ).fetchone()
+        folder_count, total_folders = self._conn.execute(
+            "SELECT COUNT(DISTINCT name), COUNT(*) FROM dirs WHERE id != ?", (root_id,)
+        ).fetchone()
+        self._set_meta("summary", json.dumps({
+            "file_count": file_count,
+            "total_size": total_size,
+            "folder_count": folder_count,
+            "total_folders": total_folders,
+        }))
+        self._set_meta("version", str(time.time_ns()))
+
+    def _reset(self, rules_key: str) -> None:
+        """Drop all indexed rows, e.g. after the root or category rules changed."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM dirs")
+            self._conn.execute("DELETE FROM meta")
+            self._set_meta("schema", str(SCHEMA_VERSION))
+            self._set_meta("root", str(self.root))
+            self._set_meta("rules", rules_key)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the tree-wide counters used by get_meta.
+
+        Returns:
+            Dictionary with file_count, total_size, folder_count and total_folders
+        """
+        value = self._get_meta("summary")
+        if value is None:
+            with self._lock, self._conn:
+                self._store_summary()
+            value = self._get_meta("summary")
+        return json.loads(value)
+
+    def top_level_files(self) -> Iterator[Tuple[str, int, int, int, Optional[str]]]:
+        """
+        Yield the regular files directly inside the root folder.
+
+        Yields:
+            (name, size, mtime_ns, inode, category) tuples
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, size, mtime_ns, inode, category FROM files "
+                "WHERE dir = (SELECT id FROM dirs WHERE parent IS NULL) AND is_file = 1 "
+                "ORDER BY id"
+            ).fetchall()
+        return iter(rows)
+
+    def all_files(self) -> Iterator[Tuple[str, str, Optional[int], Optional[int], Optional[int]]]:
+        """
+        Yield every regular file in the tree.
+
+        Yields:
+            (directory path, name, size, mtime_ns, inode) tuples
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dirs.path, files.name, files.size, files.mtime_ns, files.inode "
+                "FROM files JOIN dirs ON dirs.id = files.dir "
+                "WHERE files.is_file = 1 ORDER BY files.dir, files.id"
+            ).fetchall()
+        return iter(rows)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
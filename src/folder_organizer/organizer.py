@@ -3,11 +3,37 @@
 import os
 import time
 import json
-import shutil
+import hashlib
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any, Union
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Union
+)
 from dataclasses import dataclass
 
+from folder_organizer.artifacts import (
+    DEFAULT_RULES, Artifact, ArtifactMatcher, delete_artifacts, measure
+)
+from folder_organizer.classifier import Classifier
+from folder_organizer.duplicates import DuplicateFinder, DuplicateReport
+from folder_organizer.fuzzy import FileFinder
+from folder_organizer.hashcache import DEFAULT_MAX_ENTRIES, HashCache
+from folder_organizer.ignore import GITIGNORE, Excluder, IgnoreRules
+from folder_organizer.index import MetadataIndex
+from folder_organizer.plan import OperationPlan, PlanEntry, detect_same_device, run_plan
+from folder_organizer.progress import CancelToken, PolledCancel, ProgressFn, ProgressTracker
+from folder_organizer.scanner import (
+    ExcludeFn, FileEntry, ParallelWalker, WalkVisitor, scan_files, stat_entry
+)
+from folder_organizer.search import SearchResult, SearchSession, collect
+from folder_organizer.stats import DistinctCounter
+from folder_organizer.trigram import TrigramIndex
+from folder_organizer.transfer import TransferEngine, TransferReport
+from folder_organizer.usage import DiskUsage, UsageReport, UsageTree
+
+# Distinct folder names tracked exactly per walker thread in streaming mode
+STREAMING_EXACT_LIMIT = 65536
+
 
 @dataclass
 class OperationResult:
@@ -17,20 +43,125 @@ class OperationResult:
     files_list: List[str]
     errors: List[str]
     message: str
+    transfer: Optional[TransferReport] = None
+    cancelled: bool = False
+
+
+class _MetaVisitor(WalkVisitor):
+    """Collects the get_meta counters for one walker thread."""
+
+    def __init__(self, exact_limit: Optional[int] = None):
+        self.folder_names = DistinctCounter(exact_limit)
+        self.folder_total = 0
+        self.file_count = 0
+        self.total_size = 0
+
+    def on_dir(self, entry: os.DirEntry) -> None:
+        self.folder_names.add(entry.name)
+        self.folder_total += 1
+
+    def on_file(self, entry: os.DirEntry) -> None:
+        # Skip if it is symbolic link
+        if entry.is_symlink():
+            return
+        self.file_count += 1
+        try:
+            self.total_size += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            # Skip files we can't access
+            pass
+
+    def merge(self, other: "_MetaVisitor") -> None:
+        self.folder_names.merge(other.folder_names)
+        self.folder_total += other.folder_total
+        self.file_count += other.file_count
+        self.total_size += other.total_size
+
+
+class _CollectVisitor(WalkVisitor):
+    """Collects the files whose name satisfies a predicate."""
+
+    def __init__(self, match: Callable[[str], bool], with_stat: bool):
+        self.match = match
+        self.with_stat = with_stat
+        self.hits: List[FileEntry] = []
+
+    def on_file(self, entry: os.DirEntry) -> None:
+        if not self.match(entry.name):
+            return
+        try:
+            if not entry.is_file():
+                return
+            if not self.with_stat:
+                self.hits.append(FileEntry(entry.name, entry.path))
+                return
+            st = entry.stat()
+        except OSError:
+            return
+        self.hits.append(FileEntry(
+            entry.name, entry.path, st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev
+        ))
+
+    def merge(self, other: "_CollectVisitor") -> None:
+        self.hits.extend(other.hits)
+
+
+def _pruning(exclude: Optional[ExcludeFn], paths: FrozenSet[str]) -> ExcludeFn:
+    """Extend an exclude predicate to also skip the directories at the given paths."""
+    def excluded(entry: os.DirEntry, is_dir: bool) -> bool:
+        if is_dir and entry.path in paths:
+            return True
+        return exclude is not None and exclude(entry, is_dir)
+    return excluded
 
 
 class FolderOrganizer:
     """Handles all folder organization operations."""
 
-    def __init__(self, path: str, filetypes_path: Optional[str] = None):
+    def __init__(
+        self,
+        path: str,
+        filetypes_path: Optional[str] = None,
+        workers: Optional[int] = None,
+        use_index: bool = False,
+        index_max_age: float = 300,
+        custom_categories: Optional[Dict[str, Any]] = None,
+        transfer_workers: int = 4,
+        fsync_policy: str = "file",
+        exclude_patterns: Optional[List[str]] = None,
+        use_gitignore: bool = True,
+        hash_cache_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
         """
         Initialize the folder organizer.
         
         Args:
             path: Path to the folder to organize
             filetypes_path: Path to filetypes.json (optional)
+            workers: Threads used for recursive walks (optional, auto by default)
+            use_index: Answer read-only queries from the on-disk metadata index
+            index_max_age: Seconds an index refresh stays valid before re-checking
+            custom_categories: Extra category rules taking precedence over filetypes.json
+            transfer_workers: Concurrent copies when moving to another filesystem
+            fsync_policy: When copies are fsync'ed ("none", "file" or "end")
+            exclude_patterns: .gitignore-style patterns for paths skipped
+                by every scan (and not descended into by recursive walks)
+            use_gitignore: Also honor .gitignore files found while walking
+            hash_cache_entries: Files whose content hashes are remembered
+                across runs (0 disables the hash cache)
         """
         self.path = Path(path).resolve()
+        self.workers = workers or None
+        self.use_index = use_index
+        self.index_max_age = index_max_age
+        self._index: Optional[MetadataIndex] = None
+        self._trigrams: Optional[TrigramIndex] = None
+        self.transfer = TransferEngine(transfer_workers, fsync_policy)
+        self.exclude_patterns = list(exclude_patterns or [])
+        self.use_gitignore = use_gitignore
+        self._ignore_rules = IgnoreRules(self.exclude_patterns)
+        self.hash_cache_entries = hash_cache_entries
+        self._hash_cache: Optional[HashCache] = None
         
         if not self.path.exists():
             raise ValueError(f"Path does not exist: {path}")
@@ -45,33 +176,164 @@ class FolderOrganizer:
         
         with open(filetypes_path) as f:
             self.filetypes = json.load(f)
+        
+        self.classifier = Classifier.from_mappings(self.filetypes, custom_categories)
+        self._rules_key = hashlib.sha1(
+            json.dumps(
+                [self.classifier.key, self.exclude_patterns, self._gitignore_text()]
+            ).encode()
+        ).hexdigest()
+
+    @classmethod
+    def from_config(cls, path: str, config, **overrides) -> "FolderOrganizer":
+        """
+        Create an organizer using the settings from a Config.
+        
+        Args:
+            path: Path to the folder to organize
+            config: Config instance to read settings from
+            **overrides: Keyword arguments taking precedence over the config
+            
+        Returns:
+            A configured FolderOrganizer
+        """
+        kwargs = {
+            'workers': config.scan_workers,
+            'use_index': bool(config.get('use_index')),
+            'index_max_age': config.get('index_max_age', 300),
+            'custom_categories': config.custom_categories,
+            'transfer_workers': config.get('transfer_workers', 4),
+            'fsync_policy': config.get('fsync_policy', 'file'),
+            'exclude_patterns': config.exclude_patterns,
+            'use_gitignore': config.use_gitignore,
+            'hash_cache_entries': config.get('hash_cache_entries', DEFAULT_MAX_ENTRIES),
+        }
+        kwargs.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(path, **kwargs)
+
+    def _gitignore_text(self) -> Optional[str]:
+        """Return the root .gitignore honored by walks, or None if not used."""
+        if not self.use_gitignore:
+            return None
+        try:
+            return (self.path / GITIGNORE).read_text(errors="surrogateescape")
+        except OSError:
+            return ""
+
+    def _fresh_index(self) -> Optional[MetadataIndex]:
+        """Return the metadata index, refreshed if stale, or None if disabled."""
+        if not self.use_index:
+            return None
+        if self._index is None:
+            self._index = MetadataIndex(self.path, self.classifier.classify, self._rules_key)
+        # A new excluder per refresh, so edited .gitignore files are read again
+        self._index.exclude = self._exclude()
+        self._index.ensure_fresh(self.index_max_age)
+        return self._index
+
+    def _exclude(self) -> Optional[ExcludeFn]:
+        """Return the walk-time exclude predicate, or None if nothing is excluded."""
+        if not self._ignore_rules and not self.use_gitignore:
+            return None
+        return Excluder(str(self.path), self._ignore_rules, self.use_gitignore)
+
+    def _scan_top(
+        self, with_stat: bool = False, cancel: Optional[threading.Event] = None
+    ) -> Iterator[FileEntry]:
+        """List the files directly inside the folder, honoring the exclude patterns."""
+        return scan_files(self.path, with_stat, cancel, self._exclude())
 
-    def get_meta(self) -> Dict[str, Any]:
+    def _walker(self, prune: Iterable[str] = ()) -> ParallelWalker:
+        """
+        Return a walker honoring the exclude patterns.
+        
+        Args:
+            prune: Extra directory paths to skip, e.g. a destination inside the folder
+        """
+        exclude = self._exclude()
+        if prune:
+            exclude = _pruning(exclude, frozenset(prune))
+        return ParallelWalker(self.workers, exclude)
+
+    def _collect_tree(
+        self,
+        match: Callable[[str], bool],
+        with_stat: bool = True,
+        prune: Iterable[str] = (),
+        cancel: Optional[threading.Event] = None,
+    ) -> List[FileEntry]:
+        """Return the files anywhere below the folder whose name matches, sorted by path."""
+        visitor = self._walker(prune).walk(
+            self.path, lambda: _CollectVisitor(match, with_stat), cancel
+        )
+        return sorted(visitor.hits, key=lambda entry: entry.path)
+
+    def _trigram_index(self) -> Optional[TrigramIndex]:
+        """Return the trigram index matching the metadata index, or None if disabled."""
+        index = self._fresh_index()
+        if index is None:
+            return None
+        version = index.version
+        if self._trigrams is None or self._trigrams.version != version:
+            path = index.db_path.with_suffix('.trigrams')
+            trigrams = TrigramIndex.load(path)
+            if trigrams is None or trigrams.version != version:
+                trigrams = TrigramIndex.build(index.all_files(), version)
+                try:
+                    trigrams.save(path)
+                except OSError:
+                    # Still usable for this session
+                    pass
+            self._trigrams = trigrams
+        return self._trigrams
+
+    def get_meta(
+        self,
+        streaming: bool = False,
+        progress: Optional[Callable[[Dict[str, int]], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
         """
         Get metadata about the folder.
         
+        Args:
+            streaming: If True, keep memory flat on huge trees by estimating
+                the distinct folder name count once it gets large
+            progress: Called from a walker thread a few times per second with
+                the running 'file_count', 'size_bytes' and 'total_folders'
+            cancel: Event that stops the walk once set; the counts returned
+                are then partial
+        
         Returns:
             Dictionary containing folder metadata
         """
-        folder_list = []
-        filecount = 0
-        total_size = self.path.stat().st_size
-
-        for dirpath, dirnames, filenames in os.walk(self.path):
-            for dirname in dirnames:
-                if dirname not in folder_list:
-                    folder_list.append(dirname)
-            
-            for filename in filenames:
-                fp = Path(dirpath) / filename
-                # Skip if it is symbolic link
-                if not fp.is_symlink():
-                    try:
-                        filecount += 1
-                        total_size += fp.stat().st_size
-                    except (OSError, PermissionError):
-                        # Skip files we can't access
-                        pass
+        index = self._fresh_index()
+        if index is not None:
+            summary = index.summary()
+            file_count = summary['file_count']
+            total_size = summary['total_size']
+            folder_count = summary['folder_count']
+            folder_count_exact = True
+            total_folders = summary['total_folders']
+        else:
+            exact_limit = STREAMING_EXACT_LIMIT if streaming else None
+            report = None
+            if progress is not None:
+                def report(visitors: Sequence[_MetaVisitor]) -> None:
+                    progress({
+                        'file_count': sum(v.file_count for v in visitors),
+                        'size_bytes': sum(v.total_size for v in visitors),
+                        'total_folders': sum(v.folder_total for v in visitors),
+                    })
+            stats = self._walker().walk(
+                self.path, lambda: _MetaVisitor(exact_limit), cancel, report
+            )
+            file_count = stats.file_count
+            total_size = stats.total_size
+            folder_count = len(stats.folder_names)
+            folder_count_exact = stats.folder_names.exact
+            total_folders = stats.folder_total
+        total_size += self.path.stat().st_size
 
         # Format size
         size_mb = total_size / (1024 * 1024)
@@ -89,63 +351,434 @@ class FolderOrganizer:
         return {
             'size': size_str,
             'size_bytes': total_size,
-            'folder_count': len(folder_list),
-            'file_count': filecount,
+            'folder_count': folder_count,
+            'folder_count_exact': folder_count_exact,
+            'total_folders': total_folders,
+            'file_count': file_count,
             'creation_time': creation_time_formatted,
             'path': str(self.path)
         }
 
-    def get_filecount(self, term: str) -> int:
+    def get_filecount(self, term: str, recursive: bool = False) -> int:
         """
         Count files matching a search term.
         
         Args:
             term: Search term (substring or extension)
+            recursive: Also count matches in subfolders
             
         Returns:
             Number of matching files
         """
-        filecount = 0
+        return sum(1 for _ in self.iter_search(term, with_stat=False, recursive=recursive))
+
+    def iter_search(
+        self,
+        term: str,
+        with_stat: bool = True,
+        recursive: bool = False,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[FileEntry]:
+        """
+        Stream files whose name contains a term, as they are found.
+        
+        Recursive searches are answered from the trigram index when the
+        metadata index is enabled, and by a parallel walk otherwise.
+        
+        Args:
+            term: Search term (substring or extension, case-insensitive)
+            with_stat: Whether the entries need size and mtime filled in
+            recursive: Also search subfolders
+            cancelled: Checked for every scanned entry; the scan stops once
+                it returns True
+            
+        Yields:
+            FileEntry records for matching files
+        """
+        term = term.lower()
+        cancel = PolledCancel(cancelled) if cancelled is not None else None
+        if recursive:
+            yield from self._search_tree(term, with_stat, cancel)
+            return
+
+        index = self._fresh_index()
+        if index is not None:
+            # The index does not track files rewritten in place, so the
+            # stat fields of what is returned are read fresh
+            for name, _, _, _, _ in index.top_level_files():
+                if cancel is not None and cancel.is_set():
+                    return
+                if term in name.lower():
+                    entry = FileEntry(name, str(self.path / name))
+                    yield stat_entry(entry) if with_stat else entry
+            return
+
         try:
-            for item in self.path.iterdir():
-                if item.is_file() and term.lower() in item.name.lower():
-                    filecount += 1
+            for entry in self._scan_top(with_stat, cancel):
+                if term in entry.name.lower():
+                    yield entry
         except PermissionError:
             pass
+
+    def _search_tree(
+        self, term: str, with_stat: bool, cancel: Optional[threading.Event] = None
+    ) -> Iterator[FileEntry]:
+        """Yield matching files anywhere below the folder."""
+        trigrams = self._trigram_index()
+        if trigrams is not None:
+            for entry in trigrams.search(term):
+                if cancel is not None and cancel.is_set():
+                    return
+                entry = FileEntry(entry.name, entry.path)
+                yield stat_entry(entry) if with_stat else entry
+            return
+        yield from self._collect_tree(
+            lambda name: term in name.lower(), with_stat, cancel=cancel
+        )
+
+    def search(
+        self,
+        term: str,
+        limit: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        reverse: bool = False,
+        cancelled: Optional[Callable[[], bool]] = None,
+        recursive: bool = False,
+    ) -> SearchResult:
+        """
+        Search for files and keep only the hits that will be shown.
         
-        return filecount
+        The directory is scanned once; the exact match count is returned
+        alongside at most ``limit`` hits (the top ones when sorting). Unless
+        the results are sorted by size or date, only the kept hits are
+        stat'ed.
+        
+        Args:
+            term: Search term (substring or extension)
+            limit: Maximum number of hits to keep (None keeps all)
+            sort_by: "name", "size", "mtime" or None for scan order
+            reverse: Sort descending
+            cancelled: Checked for every scanned entry; the scan stops early
+                (with a partial result) once it returns True
+            recursive: Also search subfolders
+            
+        Returns:
+            SearchResult with the exact count and the kept hits
+        """
+        needs_stat = sort_by in ('size', 'mtime')
+        matches = self.iter_search(term, needs_stat, recursive, cancelled)
+        result = collect(matches, term, limit, sort_by, reverse)
+        if not needs_stat:
+            result.hits = [stat_entry(hit) for hit in result.hits]
+        return result
 
-    def search_files(self, term: str) -> List[Dict[str, Any]]:
+    def search_session(self, max_age: float = 30.0) -> SearchSession:
+        """
+        Create a search-as-you-type session for this folder.
+        
+        Args:
+            max_age: Seconds after which cached candidates are rescanned
+            
+        Returns:
+            SearchSession that refines results in memory as a query grows
+        """
+        return SearchSession(
+            lambda term, cancelled: self.iter_search(term, False, cancelled=cancelled),
+            self.path,
+            max_age,
+        )
+
+    def fuzzy_finder(
+        self,
+        recursive: bool = False,
+        cancelled: Optional[Callable[[], bool]] = None,
+        shortlist: Optional[int] = None,
+    ) -> FileFinder:
+        """
+        Create a fuzzy finder over the files in this folder.
+        
+        The finder is a snapshot: files added or removed later are not seen
+        until a new finder is created.
+        
+        Args:
+            recursive: Include files in subfolders (matched by relative path)
+            cancelled: Checked for every scanned entry; a cancelled scan
+                stops early and the finder only holds the files seen so far
+            shortlist: Most matches scored per query, trading exact ranking
+                for speed on large folders (see FuzzyFinder); None is exact
+            
+        Returns:
+            FileFinder ranking the files against fuzzy queries
+        """
+        entries = list(self.iter_search('', False, recursive, cancelled))
+        return FileFinder(entries, str(self.path), shortlist)
+
+    def search_files(self, term: str, recursive: bool = False) -> List[Dict[str, Any]]:
         """
         Search for files matching a term and return detailed info.
         
         Args:
             term: Search term (substring or extension)
+            recursive: Also search subfolders
             
         Returns:
             List of file information dictionaries
         """
-        files = []
-        try:
-            for item in self.path.iterdir():
-                if item.is_file() and term.lower() in item.name.lower():
-                    try:
-                        size = item.stat().st_size
-                        files.append({
-                            'name': item.name,
-                            'size': size,
-                            'size_formatted': self._format_size(size),
-                            'modified': time.ctime(item.stat().st_mtime),
-                            'path': str(item)
-                        })
-                    except (OSError, PermissionError):
-                        pass
-        except PermissionError:
-            pass
+        return [self.describe(entry) for entry in self.iter_search(term, recursive=recursive)]
+
+    def find_duplicates(self, recursive: bool = False, min_size: int = 1) -> DuplicateReport:
+        """
+        Find files with identical content.
+        
+        Args:
+            recursive: Also look in subfolders
+            min_size: Smallest file size considered, in bytes
+            
+        Returns:
+            DuplicateReport with the duplicate groups and reclaimable bytes
+        """
+        if recursive:
+            entries: Iterable[FileEntry] = self._collect_tree(lambda name: True)
+        else:
+            entries = self._scan_top(with_stat=True)
+        return DuplicateFinder(self.workers, min_size, self.hash_cache()).find(entries)
+
+    def disk_usage(
+        self, top: int = 20, apparent: bool = False, include_excluded: bool = False
+    ) -> UsageReport:
+        """
+        Measure where the space below the folder goes.
+        
+        Args:
+            top: Number of largest files and folders to report
+            apparent: Rank by apparent size instead of space allocated on disk
+            include_excluded: Also count paths matching the exclude patterns
+            
+        Returns:
+            UsageReport with recursive totals and the largest entries
+        """
+        exclude = None if include_excluded else self._exclude()
+        return DiskUsage(self.workers, top, apparent, exclude).analyze(self.path)
+
+    def find_artifacts(self, kinds: Optional[Iterable[str]] = None) -> List[Artifact]:
+        """
+        Find build artifact directories (node_modules, __pycache__, target, ...).
+        
+        The walk stops at each artifact instead of descending into it, and
+        the artifacts are then measured in parallel. Artifact rules take
+        precedence over the exclude patterns.
+        
+        Args:
+            kinds: Artifact kinds to look for (e.g. "node", "python"); all by default
+            
+        Returns:
+            The artifacts with their sizes, largest first
+        """
+        wanted = set(kinds) if kinds else None
+        rules = [rule for rule in DEFAULT_RULES if wanted is None or rule.kind in wanted]
+        matcher = ArtifactMatcher(rules, self._exclude())
+        ParallelWalker(self.workers, matcher).walk(self.path, WalkVisitor)
+        return measure(matcher.found, self.workers or 8)
+
+    def prune_artifacts(
+        self,
+        artifacts: List[Artifact],
+        dry_run: bool = False,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> OperationResult:
+        """
+        Delete artifact directories found by find_artifacts.
+        
+        Args:
+            artifacts: Artifacts to delete; each must be inside the folder
+            dry_run: If True, only report what would be deleted
+            progress: Called from the deleting threads after each directory
+                is emptied, with its path and the number of files removed
+            
+        Returns:
+            OperationResult listing the deleted directories
+        """
+        root = str(self.path)
+        inside, errors = [], []
+        for artifact in artifacts:
+            path = os.path.abspath(artifact.path)
+            if path != root and os.path.commonpath([root, path]) == root:
+                inside.append(artifact)
+            else:
+                errors.append(f"{artifact.path}: not inside {root}")
+        if dry_run:
+            done = inside
+        else:
+            done, failed = delete_artifacts(inside, self.workers or 8, progress)
+            errors.extend(failed)
+        freed = self._format_size(sum(a.allocated for a in done))
+        verb = "Would delete" if dry_run else "Deleted"
+        return OperationResult(
+            success=not errors,
+            files_affected=len(done),
+            files_list=[os.path.relpath(a.path, self.path) for a in done],
+            errors=errors,
+            message=f"{verb} {len(done)} folder(s), {freed} reclaimed"
+        )
+
+    def usage_tree(self, include_excluded: bool = False) -> UsageTree:
+        """
+        Create a browsable size tree of the folder; call scan() on it to fill it in.
+        
+        Args:
+            include_excluded: Also count paths matching the exclude patterns
+        """
+        exclude = None if include_excluded else self._exclude()
+        return UsageTree(self.path, self.workers, exclude)
+
+    def hash_cache(self) -> Optional[HashCache]:
+        """Return the persistent content hash cache, or None if it is disabled."""
+        if self.hash_cache_entries <= 0:
+            return None
+        if self._hash_cache is None:
+            self._hash_cache = HashCache(max_entries=self.hash_cache_entries)
+        return self._hash_cache
+
+    def plan_move(
+        self, extension: str, destination: str, recursive: bool = False
+    ) -> OperationPlan:
+        """
+        Plan moving files with a specific extension to a destination.
+        
+        Args:
+            extension: File extension (with or without dot)
+            destination: Destination directory path
+            recursive: Also move matching files from subfolders, recreating
+                their relative folders under the destination
+            
+        Returns:
+            OperationPlan listing the files to move
+            
+        Raises:
+            ValueError: If the destination is missing or is the source folder
+        """
+        dest_path = Path(destination).resolve()
+        if not dest_path.exists():
+            raise ValueError(f"Destination does not exist: {destination}")
+        if dest_path == self.path:
+            raise ValueError("Cannot move files to the same folder")
+
+        plan = OperationPlan(action="move", root=str(self.path), destination=str(dest_path))
+        # Never descend into the destination when it lives inside the folder
+        for entry in self._scan_extension(extension, plan, recursive, prune=[str(dest_path)]):
+            target = dest_path / os.path.relpath(entry.path, self.path)
+            plan.entries.append(self._plan_entry(entry, str(target)))
+        plan.same_device = detect_same_device(plan.root, [plan.destination])
+        return plan
+
+    def plan_delete(self, extension: str, recursive: bool = False) -> OperationPlan:
+        """
+        Plan deleting files with a specific extension.
+        
+        Args:
+            extension: File extension (with or without dot)
+            recursive: Also delete matching files in subfolders
+            
+        Returns:
+            OperationPlan listing the files to delete
+        """
+        plan = OperationPlan(action="delete", root=str(self.path))
+        for entry in self._scan_extension(extension, plan, recursive):
+            plan.entries.append(self._plan_entry(entry, None))
+        return plan
+
+    def plan_organize(self, recursive: bool = False) -> OperationPlan:
+        """
+        Plan organizing files into category folders based on file types.
         
-        return files
+        Args:
+            recursive: Also gather files from subfolders, flattening them into
+                the top-level category folders (the category folders
+                themselves are left alone)
+        
+        Returns:
+            OperationPlan listing each file and its category folder
+        """
+        plan = OperationPlan(action="organize", root=str(self.path))
+        if recursive:
+            self._plan_organize_tree(plan)
+        else:
+            try:
+                for entry in self._scan_top(with_stat=True):
+                    category = self.classifier.classify(entry.name)
+                    if category is None:
+                        continue  # Skip unknown file types
+                    target = str(self.path / category / entry.name)
+                    plan.entries.append(self._plan_entry(entry, target))
+            except PermissionError as e:
+                plan.errors.append(f"Permission denied: {str(e)}")
+        plan.same_device = detect_same_device(
+            plan.root, {os.path.dirname(entry.target) for entry in plan.entries}
+        )
+        return plan
 
-    def move_files(self, extension: str, destination: str, dry_run: bool = False) -> OperationResult:
+    def _plan_organize_tree(self, plan: OperationPlan) -> None:
+        """Fill an organize plan with files from the whole tree."""
+        classify = self.classifier.classify
+        categories = [str(self.path / category) for category in self.classifier.categories()]
+        targets: Set[str] = set()
+        entries = self._collect_tree(lambda name: classify(name) is not None, prune=categories)
+        # Shallower files claim a name first when flattening creates clashes
+        entries.sort(key=lambda entry: entry.path.count(os.sep))
+        for entry in entries:
+            target = str(self.path / classify(entry.name) / entry.name)
+            # Flattening can map several files onto one name; never overwrite
+            if target in targets or os.path.lexists(target):
+                rel = os.path.relpath(entry.path, self.path)
+                plan.errors.append(f"{rel}: {os.path.relpath(target, self.path)} already exists")
+                continue
+            targets.add(target)
+            plan.entries.append(self._plan_entry(entry, target))
+
+    def execute_plan(
+        self,
+        plan: OperationPlan,
+        progress: Optional[ProgressFn] = None,
+        cancel: Optional[CancelToken] = None,
+    ) -> OperationResult:
+        """
+        Execute a previously built plan without rescanning the folder.
+        
+        Each file is stat'ed once to make sure it has not changed since the
+        plan was made; changed or missing files are reported as errors.
+        
+        Args:
+            plan: Plan from plan_move, plan_delete or plan_organize
+            progress: Called a few times per second, from the thread doing
+                the work, with files and bytes done out of the plan's total
+            cancel: Token checked between files; once cancelled, the files
+                not reached yet are left alone and the result is marked
+                cancelled
+            
+        Returns:
+            OperationResult with operation details
+        """
+        tracker = ProgressTracker(len(plan.entries), plan.total_bytes, progress)
+        done, errors, report = run_plan(plan, self.transfer, tracker, cancel)
+        tracker.finish()
+        cancelled = tracker.files_done < tracker.files_total
+        result = self._plan_result(plan, done, errors, dry_run=False, cancelled=cancelled)
+        result.transfer = report
+        return result
+
+    def preview_plan(self, plan: OperationPlan) -> OperationResult:
+        """Describe a plan as a dry-run OperationResult."""
+        return self._plan_result(plan, plan.entries, plan.errors, dry_run=True)
+
+    def move_files(
+        self,
+        extension: str,
+        destination: str,
+        dry_run: bool = False,
+        recursive: bool = False,
+        progress: Optional[ProgressFn] = None,
+        cancel: Optional[CancelToken] = None,
+    ) -> OperationResult:
         """
         Move files with a specific extension to a destination.
         
@@ -153,14 +786,13 @@ class FolderOrganizer:
             extension: File extension (with or without dot)
             destination: Destination directory path
             dry_run: If True, only preview without actually moving
+            recursive: Also move matching files from subfolders
+            progress: Progress callback (see execute_plan)
+            cancel: Token that stops the move between files
             
         Returns:
             OperationResult with operation details
         """
-        # Normalize extension
-        if not extension.startswith('.'):
-            extension = '.' + extension
-        
         dest_path = Path(destination).resolve()
         if not dest_path.exists():
             return OperationResult(
@@ -180,147 +812,54 @@ class FolderOrganizer:
                 message="Source and destination are the same"
             )
 
-        moved_files = []
-        errors = []
-        
-        try:
-            for item in self.path.iterdir():
-                if item.is_file() and item.suffix.lower() == extension.lower():
-                    if not dry_run:
-                        try:
-                            dest_file = dest_path / item.name
-                            shutil.move(str(item), str(dest_file))
-                            moved_files.append(item.name)
-                        except Exception as e:
-                            errors.append(f"{item.name}: {str(e)}")
-                    else:
-                        moved_files.append(item.name)
-        except PermissionError as e:
-            errors.append(f"Permission denied: {str(e)}")
-
-        count = len(moved_files)
-        message = f"{count} file{'s' if count != 1 else ''} {'would be' if dry_run else ''} moved"
-        
-        return OperationResult(
-            success=len(errors) == 0,
-            files_affected=count,
-            files_list=moved_files,
-            errors=errors,
-            message=message
-        )
+        plan = self.plan_move(extension, destination, recursive)
+        return self.preview_plan(plan) if dry_run else self.execute_plan(plan, progress, cancel)
 
-    def delete_files(self, extension: str, dry_run: bool = False) -> OperationResult:
+    def delete_files(
+        self,
+        extension: str,
+        dry_run: bool = False,
+        recursive: bool = False,
+        progress: Optional[ProgressFn] = None,
+        cancel: Optional[CancelToken] = None,
+    ) -> OperationResult:
         """
         Delete files with a specific extension.
         
         Args:
             extension: File extension (with or without dot)
             dry_run: If True, only preview without actually deleting
+            recursive: Also delete matching files in subfolders
+            progress: Progress callback (see execute_plan)
+            cancel: Token that stops the deletion between files
             
         Returns:
             OperationResult with operation details
         """
-        # Normalize extension
-        if not extension.startswith('.'):
-            extension = '.' + extension
+        plan = self.plan_delete(extension, recursive)
+        return self.preview_plan(plan) if dry_run else self.execute_plan(plan, progress, cancel)
 
-        deleted_files = []
-        errors = []
-        
-        try:
-            for item in self.path.iterdir():
-                if item.is_file() and item.suffix.lower() == extension.lower():
-                    if not dry_run:
-                        try:
-                            item.unlink()
-                            deleted_files.append(item.name)
-                        except Exception as e:
-                            errors.append(f"{item.name}: {str(e)}")
-                    else:
-                        deleted_files.append(item.name)
-        except PermissionError as e:
-            errors.append(f"Permission denied: {str(e)}")
-
-        count = len(deleted_files)
-        message = (
-            f"{count} file{'s' if count != 1 else ''} "
-            f"{'would be' if dry_run else ''} deleted permanently"
-        )
-        
-        return OperationResult(
-            success=len(errors) == 0,
-            files_affected=count,
-            files_list=deleted_files,
-            errors=errors,
-            message=message
-        )
-
-    def organize_files(self, dry_run: bool = False) -> OperationResult:
+    def organize_files(
+        self,
+        dry_run: bool = False,
+        recursive: bool = False,
+        progress: Optional[ProgressFn] = None,
+        cancel: Optional[CancelToken] = None,
+    ) -> OperationResult:
         """
         Organize files into category folders based on file types.
         
         Args:
             dry_run: If True, only preview without actually organizing
+            recursive: Also gather files from subfolders
+            progress: Progress callback (see execute_plan)
+            cancel: Token that stops organizing between files
             
         Returns:
             OperationResult with operation details
         """
-        organized_files = []
-        errors = []
-        categories_used = set()
-
-        try:
-            for item in self.path.iterdir():
-                if not item.is_file():
-                    continue
-                
-                extension = item.suffix.lower()
-                category = None
-                
-                # Find matching category
-                for cat, extensions in self.filetypes.items():
-                    if extension in extensions:
-                        category = cat
-                        break
-                
-                if category is None:
-                    continue  # Skip unknown file types
-                
-                categories_used.add(category)
-                category_folder = self.path / category
-                
-                if not dry_run:
-                    try:
-                        # Create category folder if it doesn't exist
-                        category_folder.mkdir(exist_ok=True)
-                        
-                        # Move file
-                        dest_file = category_folder / item.name
-                        shutil.move(str(item), str(dest_file))
-                        organized_files.append(item.name)
-                    except Exception as e:
-                        errors.append(f"{item.name}: {str(e)}")
-                else:
-                    organized_files.append(item.name)
-                    
-        except PermissionError as e:
-            errors.append(f"Permission denied: {str(e)}")
-
-        count = len(organized_files)
-        cat_count = len(categories_used)
-        message = (
-            f"{count} file{'s' if count != 1 else ''} "
-            f"{'would be' if dry_run else ''} organized into {cat_count} "
-            f"categor{'ies' if cat_count != 1 else 'y'}"
-        )
-        
-        return OperationResult(
-            success=len(errors) == 0,
-            files_affected=count,
-            files_list=organized_files,
-            errors=errors,
-            message=message
-        )
+        plan = self.plan_organize(recursive)
+        return self.preview_plan(plan) if dry_run else self.execute_plan(plan, progress, cancel)
 
     def preview_organization(self) -> Dict[str, List[str]]:
         """
@@ -331,25 +870,114 @@ class FolderOrganizer:
         """
         preview = {}
         
+        index = self._fresh_index()
+        if index is not None:
+            for name, _, _, _, category in index.top_level_files():
+                if category is not None:
+                    preview.setdefault(category, []).append(name)
+            return preview
+        
         try:
-            for item in self.path.iterdir():
-                if not item.is_file():
-                    continue
-                
-                extension = item.suffix.lower()
-                
-                # Find matching category
-                for category, extensions in self.filetypes.items():
-                    if extension in extensions:
-                        if category not in preview:
-                            preview[category] = []
-                        preview[category].append(item.name)
-                        break
+            for entry in self._scan_top():
+                category = self.classifier.classify(entry.name)
+                if category is not None:
+                    if category not in preview:
+                        preview[category] = []
+                    preview[category].append(entry.name)
         except PermissionError:
             pass
         
         return preview
 
+    def _scan_extension(
+        self,
+        extension: str,
+        plan: OperationPlan,
+        recursive: bool = False,
+        prune: Iterable[str] = (),
+    ) -> Iterator[FileEntry]:
+        """Yield stat'ed files with an extension, logging scan errors on the plan."""
+        # Normalize extension
+        if not extension.startswith('.'):
+            extension = '.' + extension
+        extension = extension.lower()
+        
+        if recursive:
+            yield from self._collect_tree(lambda name: self._suffix(name) == extension, prune=prune)
+            return
+        
+        try:
+            for entry in self._scan_top(with_stat=True):
+                if self._suffix(entry.name) == extension:
+                    yield entry
+        except PermissionError as e:
+            plan.errors.append(f"Permission denied: {str(e)}")
+
+    @staticmethod
+    def _plan_entry(entry: FileEntry, target: Optional[str]) -> PlanEntry:
+        """Build a plan entry from a scanned file."""
+        return PlanEntry(entry.path, target, entry.size, entry.mtime_ns, entry.inode)
+
+    @staticmethod
+    def _plan_result(
+        plan: OperationPlan,
+        entries: List[PlanEntry],
+        errors: List[str],
+        dry_run: bool,
+        cancelled: bool = False,
+    ) -> OperationResult:
+        """Summarize processed plan entries as an OperationResult."""
+        count = len(entries)
+        files = f"{count} file{'s' if count != 1 else ''} {'would be' if dry_run else ''}"
+        if plan.action == "move":
+            message = f"{files} moved"
+        elif plan.action == "delete":
+            message = f"{files} deleted permanently"
+        else:
+            cat_count = len({os.path.dirname(entry.target) for entry in entries})
+            message = (
+                f"{files} organized into {cat_count} "
+                f"categor{'ies' if cat_count != 1 else 'y'}"
+            )
+        if cancelled:
+            message = f"Cancelled: {message} (of {len(plan.entries)} planned)"
+        
+        return OperationResult(
+            success=len(errors) == 0 and not cancelled,
+            files_affected=count,
+            files_list=[entry.name for entry in entries],
+            errors=list(errors),
+            message=message,
+            cancelled=cancelled
+        )
+
+    @staticmethod
+    def _suffix(name: str) -> str:
+        """Return the lower-cased final suffix of a file name, like Path.suffix."""
+        i = name.rfind('.')
+        if 0 < i < len(name) - 1:
+            return name[i:].lower()
+        return ''
+
+    @classmethod
+    def describe(cls, entry: FileEntry) -> Dict[str, Any]:
+        """
+        Format a scanned file for display.
+        
+        Args:
+            entry: File to describe
+            
+        Returns:
+            File information dictionary (name, size, size_formatted, modified, path)
+        """
+        return {
+            'name': entry.name,
+            'size': entry.size,
+            'size_formatted': cls._format_size(entry.size),
+            'modified': time.ctime(entry.mtime_ns / 1e9),
+            'path': entry.path
+        }
+
     @staticmethod
     def _format_size(size_bytes: Union[int, float]) -> str:
         """Format size in bytes to human-readable string."""
@@ -0,0 +1,393 @@
+"""Operation plans: scan once, confirm, then execute."""
+
+import os
+import json
+import errno
+import time
+import shutil
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from folder_organizer.deleter import DIR_FD_DELETE
+from folder_organizer.progress import ProgressTracker
+from folder_organizer.transfer import CANCELLED, FileTransfer, TransferEngine, TransferReport
+
+PLAN_FORMAT_VERSION = 1
+
+ACTIONS = ("move", "delete", "organize")
+
+
+@dataclass
+class PlanEntry:
+    """One file an operation plan will act on, with the stat it had when planned."""
+    source: str
+    target: Optional[str]
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @property
+    def name(self) -> str:
+        """File name of the source."""
+        return os.path.basename(self.source)
+
+
+@dataclass
+class OperationPlan:
+    """
+    A destructive operation computed from a single directory scan.
+
+    The plan records each affected file together with the inode and mtime it
+    had at planning time. Executing the plan only stats each source to make
+    sure it is still the same file; the directory is never listed again.
+    Plans can be saved to JSON and executed later.
+    """
+    action: str
+    root: str
+    entries: List[PlanEntry] = field(default_factory=list)
+    destination: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    same_device: Optional[bool] = None
+
+    @property
+    def files_list(self) -> List[str]:
+        """Names of the files in the plan."""
+        return [entry.name for entry in self.entries]
+
+    @property
+    def relative_paths(self) -> List[str]:
+        """Paths of the files in the plan, relative to its root."""
+        return [os.path.relpath(entry.source, self.root) for entry in self.entries]
+
+    @property
+    def total_bytes(self) -> int:
+        """Combined size of the files in the plan."""
+        return sum(entry.size for entry in self.entries)
+
+    def by_target_dir(self) -> Dict[str, List[str]]:
+        """
+        Group file names by the directory they will end up in.
+
+        Returns:
+            Dictionary mapping target directory names to lists of file names
+        """
+        groups: Dict[str, List[str]] = {}
+        for entry in self.entries:
+            if entry.target is None:
+                continue
+            folder = os.path.basename(os.path.dirname(entry.target))
+            groups.setdefault(folder, []).append(entry.name)
+        return groups
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the plan to JSON-compatible data."""
+        return {
+            "version": PLAN_FORMAT_VERSION,
+            "action": self.action,
+            "root": self.root,
+            "destination": self.destination,
+            "created_at": self.created_at,
+            "errors": self.errors,
+            "same_device": self.same_device,
+            "entries": [
+                [e.source, e.target, e.size, e.mtime_ns, e.inode] for e in self.entries
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OperationPlan":
+        """
+        Rebuild a plan from to_dict() output.
+
+        Raises:
+            ValueError: If the data is not a supported plan
+        """
+        if data.get("version") != PLAN_FORMAT_VERSION or data.get("action") not in ACTIONS:
+            raise ValueError("Unsupported or corrupted plan file")
+        return cls(
+            action=data["action"],
+            root=data["root"],
+            destination=data.get("destination"),
+            created_at=data.get("created_at", 0.0),
+            errors=list(data.get("errors", [])),
+            same_device=data.get("same_device"),
+            entries=[PlanEntry(*row) for row in data.get("entries", [])],
+        )
+
+    def save(self, path: str) -> None:
+        """Write the plan to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "OperationPlan":
+        """
+        Read a plan written by save().
+
+        Raises:
+            ValueError: If the file is not a valid plan
+        """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid plan file: {e}")
+        return cls.from_dict(data)
+
+
+# Renames relative to open directory descriptors avoid resolving full paths
+_DIR_FD_RENAME = (
+    hasattr(os, "O_DIRECTORY")
+    and os.rename in os.supports_dir_fd
+    and os.stat in os.supports_dir_fd
+)
+
+_DIR_FD_UNLINK = DIR_FD_DELETE and os.stat in os.supports_dir_fd
+
+
+def detect_same_device(root: str, target_dirs: Iterable[str]) -> bool:
+    """
+    Check whether every target directory lives on the same filesystem as root.
+
+    Target directories that do not exist yet are checked through their
+    closest existing parent, since that is where they will be created.
+    """
+    try:
+        root_dev = os.stat(root).st_dev
+        for target_dir in target_dirs:
+            probe = target_dir
+            while not os.path.exists(probe) and os.path.dirname(probe) != probe:
+                probe = os.path.dirname(probe)
+            if os.stat(probe).st_dev != root_dev:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def check_unchanged(entry: PlanEntry, dir_fd: Optional[int] = None) -> Optional[str]:
+    """
+    Stat a planned source and make sure it is still the file that was planned.
+
+    Args:
+        entry: Planned file
+        dir_fd: Open descriptor of the source directory, to stat by name only
+
+    Returns:
+        None if the file is unchanged, otherwise an error message
+    """
+    try:
+        if dir_fd is None:
+            st = os.stat(entry.source)
+        else:
+            st = os.stat(entry.name, dir_fd=dir_fd)
+    except FileNotFoundError:
+        return f"{entry.name}: no longer exists"
+    except OSError as e:
+        return f"{entry.name}: {e}"
+    if st.st_ino != entry.inode or st.st_mtime_ns != entry.mtime_ns:
+        return f"{entry.name}: changed since the plan was created"
+    return None
+
+
+def run_plan(
+    plan: OperationPlan,
+    transfer: Optional[TransferEngine] = None,
+    tracker: Optional[ProgressTracker] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[List[PlanEntry], List[str], Optional[TransferReport]]:
+    """
+    Execute a plan.
+
+    Moves within one filesystem go straight to rename(2); every target
+    directory is created once up front and renames are issued relative to
+    open directory descriptors. Moves to another filesystem are handed to
+    the parallel TransferEngine.
+
+    The cancel event is checked between files; entries not reached when it
+    is set are neither processed nor reported as errors.
+
+    Args:
+        plan: Plan to execute
+        transfer: Engine for cross-device moves (a default one if omitted)
+        tracker: Counts every entry once it is processed or fails
+        cancel: Event that stops the run once set
+
+    Returns:
+        Tuple of (entries that were processed, error messages, transfer
+        report or None when nothing had to be copied)
+    """
+    done: List[PlanEntry] = []
+    errors: List[str] = list(plan.errors)
+    if tracker is None:
+        tracker = ProgressTracker(len(plan.entries), plan.total_bytes)
+
+    if plan.action == "delete":
+        _unlink_entries(plan.entries, done, errors, tracker, cancel)
+        return done, errors, None
+
+    target_dirs = list(dict.fromkeys(os.path.dirname(e.target) for e in plan.entries))
+    for target_dir in target_dirs:
+        try:
+            os.makedirs(target_dir, exist_ok=True)
+        except OSError as e:
+            errors.append(f"{os.path.basename(target_dir)}: {str(e)}")
+
+    same_device = plan.same_device
+    if same_device is None:
+        same_device = detect_same_device(plan.root, target_dirs)
+
+    if same_device:
+        _rename_entries(plan.entries, done, errors, tracker, cancel)
+        return done, errors, None
+
+    pending = []
+    for entry in plan.entries:
+        error = check_unchanged(entry)
+        if error:
+            errors.append(error)
+            tracker.advance(1, entry.size, entry.name)
+        else:
+            pending.append(entry)
+
+    sizes = {entry.source: entry.size for entry in pending}
+
+    def on_file(result: FileTransfer) -> None:
+        if result.error != CANCELLED:
+            tracker.advance(1, sizes[result.source], os.path.basename(result.source))
+
+    engine = transfer or TransferEngine()
+    report = engine.move(
+        ((entry.source, entry.target) for entry in pending), on_file, cancel
+    )
+    for entry, result in zip(pending, report.files):
+        if result.error is None:
+            done.append(entry)
+        elif result.error != CANCELLED:
+            errors.append(f"{entry.name}: {result.error}")
+    return done, errors, report
+
+
+def _rename_entries(
+    entries: List[PlanEntry],
+    done: List[PlanEntry],
+    errors: List[str],
+    tracker: ProgressTracker,
+    cancel: Optional[threading.Event],
+) -> None:
+    """
+    Rename entries in place, opening each source and target directory once.
+
+    Entries are grouped by source and target directory, and both descriptors
+    are closed as soon as their group is done, so the number of open
+    descriptors stays constant however many directories the plan spans.
+    """
+    by_dir: Dict[Tuple[str, str], List[PlanEntry]] = {}
+    for entry in entries:
+        key = (os.path.dirname(entry.source), os.path.dirname(entry.target))
+        by_dir.setdefault(key, []).append(entry)
+
+    for (src_dir, dst_dir), group in by_dir.items():
+        if cancel is not None and cancel.is_set():
+            return
+        src_fd = dst_fd = None
+        if _DIR_FD_RENAME:
+            try:
+                src_fd = os.open(src_dir, os.O_RDONLY | os.O_DIRECTORY)
+                dst_fd = os.open(dst_dir, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError as e:
+                if src_fd is not None:
+                    os.close(src_fd)
+                errors.extend(f"{entry.name}: {str(e)}" for entry in group)
+                tracker.advance(len(group), sum(entry.size for entry in group))
+                continue
+        try:
+            for entry in group:
+                if cancel is not None and cancel.is_set():
+                    return
+                if _rename_entry(entry, src_fd, dst_fd, errors):
+                    done.append(entry)
+                tracker.advance(1, entry.size, entry.name)
+        finally:
+            if src_fd is not None:
+                os.close(src_fd)
+                os.close(dst_fd)
+
+
+def _rename_entry(
+    entry: PlanEntry,
+    src_fd: Optional[int],
+    dst_fd: Optional[int],
+    errors: List[str],
+) -> bool:
+    """Rename one entry; returns whether it was moved, recording any error."""
+    error = check_unchanged(entry, src_fd)
+    if error:
+        errors.append(error)
+        return False
+    try:
+        if src_fd is None:
+            os.rename(entry.source, entry.target)
+        else:
+            os.rename(
+                entry.name, os.path.basename(entry.target),
+                src_dir_fd=src_fd, dst_dir_fd=dst_fd,
+            )
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            errors.append(f"{entry.name}: {str(e)}")
+            return False
+        # Target turned out to be a different mount after all
+        try:
+            shutil.move(entry.source, entry.target)
+        except Exception as e:
+            errors.append(f"{entry.name}: {str(e)}")
+            return False
+    return True
+
+
+def _unlink_entries(
+    entries: List[PlanEntry],
+    done: List[PlanEntry],
+    errors: List[str],
+    tracker: ProgressTracker,
+    cancel: Optional[threading.Event],
+) -> None:
+    """Delete entries, opening each directory once and unlinking by name."""
+    by_dir: Dict[str, List[PlanEntry]] = {}
+    for entry in entries:
+        by_dir.setdefault(os.path.dirname(entry.source), []).append(entry)
+
+    for directory, group in by_dir.items():
+        if cancel is not None and cancel.is_set():
+            return
+        fd = None
+        if _DIR_FD_UNLINK:
+            try:
+                fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError as e:
+                errors.extend(f"{entry.name}: {str(e)}" for entry in group)
+                tracker.advance(len(group), sum(entry.size for entry in group))
+                continue
+        try:
+            for entry in group:
+                if cancel is not None and cancel.is_set():
+                    return
+                tracker.advance(1, entry.size, entry.name)
+                error = check_unchanged(entry, fd)
+                if error:
+                    errors.append(error)
+                    continue
+                try:
+                    if fd is None:
+                        os.unlink(entry.source)
+                    else:
+                        os.unlink(entry.name, dir_fd=fd)
+                    done.append(entry)
+                except Exception as e:
+                    errors.append(f"{entry.name}: {str(e)}")
+        finally:
+            if fd is not None:
+                os.close(fd)
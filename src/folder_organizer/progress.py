@@ -0,0 +1,154 @@
+"""Progress reporting and cooperative cancellation for file operations."""
+
+import time
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Seconds between progress callbacks of one operation
+PROGRESS_INTERVAL = 0.1
+
+
+class CancelToken(threading.Event):
+    """
+    Set to ask a running operation to stop.
+
+    Operations check the token between files, so a cancelled operation
+    finishes the file it is working on and reports what it already did. It
+    is a threading.Event, so it can also be handed to ParallelWalker.walk.
+    """
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self.is_set()
+
+
+class PolledCancel(CancelToken):
+    """
+    CancelToken that is also set once a predicate returns True.
+
+    Lets code that is cancelled through a callable, such as a Textual
+    worker's ``is_cancelled``, stop a ParallelWalker or scan_files.
+    """
+
+    def __init__(self, cancelled: Callable[[], bool]):
+        super().__init__()
+        self._cancelled = cancelled
+
+    def is_set(self) -> bool:
+        return super().is_set() or self._cancelled()
+
+
+@dataclass(frozen=True)
+class Progress:
+    """Snapshot of how far an operation got."""
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    elapsed: float
+    current: str = ""
+
+    @property
+    def fraction(self) -> float:
+        """Share of the work done, by bytes when sizes are known, else by files."""
+        if self.bytes_total:
+            return min(1.0, self.bytes_done / self.bytes_total)
+        if self.files_total:
+            return min(1.0, self.files_done / self.files_total)
+        return 1.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds left, or None before there is a rate to go by."""
+        fraction = self.fraction
+        if fraction <= 0 or self.elapsed <= 0:
+            return None
+        return self.elapsed * (1 - fraction) / fraction
+
+
+ProgressFn = Callable[[Progress], None]
+
+
+class ProgressTracker:
+    """
+    Thread-safe counter that reports Progress snapshots at a capped rate.
+
+    Workers call ``advance`` after each file; the callback runs in the
+    calling thread at most every ``interval`` seconds, plus once more from
+    ``finish`` so the last snapshot is always complete.
+    """
+
+    def __init__(
+        self,
+        files_total: int,
+        bytes_total: int,
+        callback: Optional[ProgressFn] = None,
+        interval: float = PROGRESS_INTERVAL,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            files_total: Files the operation will process
+            bytes_total: Combined size of those files
+            callback: Receives Progress snapshots
+            interval: Minimum seconds between two callbacks
+        """
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.callback = callback
+        self.interval = interval
+        self.files_done = 0
+        self.bytes_done = 0
+        self._start = time.monotonic()
+        self._next = self._start
+        self._lock = threading.Lock()
+
+    def snapshot(self, current: str = "") -> Progress:
+        """Return the progress so far."""
+        return Progress(
+            self.files_done, self.files_total, self.bytes_done, self.bytes_total,
+            time.monotonic() - self._start, current,
+        )
+
+    def advance(self, files: int = 1, size: int = 0, current: str = "") -> None:
+        """
+        Count processed files and report if the interval has passed.
+
+        Args:
+            files: Files processed (successfully or not)
+            size: Their combined size
+            current: Name of the last file, for display
+        """
+        with self._lock:
+            self.files_done += files
+            self.bytes_done += size
+            if self.callback is None:
+                return
+            now = time.monotonic()
+            if now < self._next:
+                return
+            self._next = now + self.interval
+            progress = self.snapshot(current)
+        self.callback(progress)
+
+    def finish(self) -> None:
+        """Report the final counts."""
+        if self.callback is not None:
+            with self._lock:
+                progress = self.snapshot()
+            self.callback(progress)
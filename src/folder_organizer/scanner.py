@@ -0,0 +1,344 @@
+"""Directory scanning primitives built on os.scandir."""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable, Deque, Iterator, List, NamedTuple, Optional, Sequence, TypeVar, Union
+)
+
+
+class FileEntry(NamedTuple):
+    """Compact record describing a single file found during a scan."""
+    name: str
+    path: str
+    size: int = 0
+    mtime_ns: int = 0
+    inode: int = 0
+    dev: int = 0
+
+
+def scan_files(
+    directory: Union[str, os.PathLike],
+    with_stat: bool = False,
+    cancel: Optional[threading.Event] = None,
+    exclude: Optional["ExcludeFn"] = None,
+) -> Iterator[FileEntry]:
+    """
+    Yield the regular files directly inside a directory.
+
+    The directory is listed once with ``os.scandir``. File type checks use the
+    ``d_type`` returned by the listing, so plain files cost no extra syscall;
+    symlinks are followed like ``Path.is_file()`` does. When ``with_stat`` is
+    set, each file is stat'ed exactly once and the size, mtime, inode and
+    device fields are filled in, otherwise they are left at zero.
+
+    Args:
+        directory: Directory to list
+        with_stat: Whether to populate the stat-derived fields
+        cancel: Event checked before every entry; the listing stops once set
+        exclude: Walk-time exclude predicate (see ParallelWalker); files it
+            rejects are skipped
+
+    Yields:
+        FileEntry records in directory order
+
+    Raises:
+        OSError: If the directory itself cannot be listed
+    """
+    with os.scandir(directory) as it:
+        for entry in it:
+            if cancel is not None and cancel.is_set():
+                return
+            try:
+                if not entry.is_file():
+                    continue
+                if exclude is not None and exclude(entry, False):
+                    continue
+                if not with_stat:
+                    yield FileEntry(entry.name, entry.path)
+                    continue
+                st = entry.stat()
+            except OSError:
+                # Entry vanished or is unreadable between listing and stat
+                continue
+            yield FileEntry(
+                entry.name, entry.path, st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev
+            )
+
+
+def stat_entry(entry: FileEntry) -> FileEntry:
+    """
+    Fill in the stat-derived fields of an entry scanned without them.
+
+    Entries that already carry an inode are returned unchanged, as are files
+    that can no longer be stat'ed.
+    """
+    if entry.inode:
+        return entry
+    try:
+        st = os.stat(entry.path)
+    except OSError:
+        return entry
+    return entry._replace(
+        size=st.st_size, mtime_ns=st.st_mtime_ns, inode=st.st_ino, dev=st.st_dev
+    )
+
+
+V = TypeVar("V", bound="WalkVisitor")
+
+# Decides whether a listed entry (and, for directories, its subtree) is skipped
+ExcludeFn = Callable[[os.DirEntry, bool], bool]
+
+# Seconds between progress callbacks of a walk
+PROGRESS_INTERVAL = 0.25
+
+
+def default_workers() -> int:
+    """Return the default number of walker threads for this machine."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class WalkVisitor:
+    """
+    Per-thread accumulator driven by ParallelWalker.
+
+    Each walker thread gets its own visitor, so the hooks never need locking.
+    Subclasses override the hooks they care about and ``merge`` to fold the
+    results of another thread's visitor into this one.
+    """
+
+    def on_dir(self, entry: os.DirEntry) -> None:
+        """Called for every subdirectory entry, including symlinked ones."""
+
+    def on_file(self, entry: os.DirEntry) -> None:
+        """Called for every non-directory entry."""
+
+    def merge(self, other: "WalkVisitor") -> None:
+        """Fold the results of another visitor into this one."""
+
+
+class _WalkState:
+    """Shared bookkeeping for one ParallelWalker.walk call."""
+
+    def __init__(
+        self,
+        workers: int,
+        cancel: Optional[threading.Event] = None,
+        progress: Optional[Callable[[], None]] = None,
+        interval: float = PROGRESS_INTERVAL,
+    ):
+        self.deques: List[Deque[str]] = [deque() for _ in range(workers)]
+        self.cond = threading.Condition()
+        self.pending = 0
+        self.error: Optional[BaseException] = None
+        self.cancel = cancel
+        self.progress = progress
+        self.interval = interval
+        self.next_report = time.monotonic() + interval
+
+    def cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def stop(self) -> None:
+        """Drop the remaining work and wake every worker (cond held)."""
+        self.pending = 0
+        for dq in self.deques:
+            dq.clear()
+        self.cond.notify_all()
+
+    def report(self) -> None:
+        """Call the progress callback if the interval has passed since the last call."""
+        if self.progress is None:
+            return
+        now = time.monotonic()
+        if now < self.next_report:
+            return
+        with self.cond:
+            if now < self.next_report:
+                return
+            self.next_report = now + self.interval
+        self.progress()
+
+
+class ParallelWalker:
+    """
+    Work-stealing recursive directory walker backed by a thread pool.
+
+    Every worker keeps its own deque of directories still to list. It pushes
+    the subdirectories it discovers onto that deque and pops from the same end,
+    so each thread walks depth-first through its own part of the tree. A worker
+    that runs dry steals from the opposite end of another worker's deque, which
+    hands out the large subtrees closest to the root first.
+
+    Traversal follows ``os.walk`` semantics: symlinked directories are reported
+    as directories but not descended into, and unreadable directories are
+    skipped silently. Entries rejected by the ``exclude`` predicate are never
+    reported, and excluded directories are pruned before they are listed.
+
+    A walk can report progress while it runs and be cancelled between two
+    entries; a cancelled walk returns what it had visited so far.
+    """
+
+    def __init__(self, workers: Optional[int] = None, exclude: Optional[ExcludeFn] = None):
+        """
+        Initialize the walker.
+
+        Args:
+            workers: Number of threads (defaults to default_workers())
+            exclude: Called with each entry and whether it is a directory;
+                returning True skips the entry and everything below it
+        """
+        self.workers = max(1, workers or default_workers())
+        self.exclude = exclude
+
+    def walk(
+        self,
+        root: Union[str, os.PathLike],
+        visitor_factory: Callable[[], V],
+        cancel: Optional[threading.Event] = None,
+        progress: Optional[Callable[[Sequence[V]], None]] = None,
+        interval: float = PROGRESS_INTERVAL,
+    ) -> V:
+        """
+        Walk the tree under root and return the merged visitor.
+
+        Args:
+            root: Directory to walk
+            visitor_factory: Callable creating one fresh visitor per thread
+            cancel: Event that stops the walk once set
+            progress: Called from a walker thread at most every ``interval``
+                seconds with the per-thread visitors, which are still being
+                updated; read their counters, do not merge them
+            interval: Seconds between progress calls
+
+        Returns:
+            A visitor holding the merged results of all threads (partial if
+            the walk was cancelled)
+        """
+        root = os.fspath(root)
+        visitors = [visitor_factory() for _ in range(self.workers)]
+        report = (lambda: progress(visitors)) if progress is not None else None
+
+        if self.workers == 1:
+            state = _WalkState(1, cancel, report, interval)
+            stack = [root]
+            while stack and not state.cancelled():
+                stack.extend(self._list_dir(stack.pop(), visitors[0], cancel))
+                state.report()
+            return visitors[0]
+
+        state = _WalkState(self.workers, cancel, report, interval)
+        state.deques[0].append(root)
+        state.pending = 1
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(self._work, state, index, visitors[index])
+                for index in range(self.workers)
+            ]
+            for future in futures:
+                future.result()
+
+        if state.error is not None:
+            raise state.error
+
+        merged = visitors[0]
+        for visitor in visitors[1:]:
+            merged.merge(visitor)
+        return merged
+
+    def _work(self, state: _WalkState, index: int, visitor: WalkVisitor) -> None:
+        """Worker loop: drain the own deque, steal when empty, exit when done."""
+        own = state.deques[index]
+        while True:
+            if state.cancelled():
+                with state.cond:
+                    state.stop()
+                return
+
+            path = self._take(state, index)
+            if path is None:
+                with state.cond:
+                    while state.pending and not any(state.deques):
+                        state.cond.wait()
+                    if not state.pending:
+                        return
+                continue
+
+            try:
+                subdirs = self._list_dir(path, visitor, state.cancel)
+            except BaseException as e:
+                with state.cond:
+                    state.error = e
+                    state.stop()
+                return
+
+            with state.cond:
+                if state.error is not None:
+                    return
+                if state.cancelled():
+                    state.stop()
+                    return
+                own.extend(subdirs)
+                state.pending += len(subdirs) - 1
+                if subdirs or not state.pending:
+                    state.cond.notify_all()
+            state.report()
+
+    @staticmethod
+    def _take(state: _WalkState, index: int) -> Optional[str]:
+        """Pop from the own deque, or steal the oldest entry of another one."""
+        try:
+            return state.deques[index].pop()
+        except IndexError:
+            pass
+        count = len(state.deques)
+        for offset in range(1, count):
+            try:
+                return state.deques[(index + offset) % count].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _list_dir(
+        self, path: str, visitor: WalkVisitor, cancel: Optional[threading.Event] = None
+    ) -> List[str]:
+        """List one directory, feed the visitor and return subdirectories to descend."""
+        exclude = self.exclude
+        subdirs = []
+        try:
+            it = os.scandir(path)
+        except OSError:
+            return subdirs
+
+        with it:
+            while True:
+                if cancel is not None and cancel.is_set():
+                    break
+                try:
+                    entry = next(it)
+                except (StopIteration, OSError):
+                    break
+
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if exclude is not None and exclude(entry, is_dir):
+                    continue
+
+                if not is_dir:
+                    visitor.on_file(entry)
+                    continue
+
+                visitor.on_dir(entry)
+                try:
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                except OSError:
+                    pass
+        return subdirs
@@ -5,6 +5,8 @@ from textual.screen import Screen
 from textual.widgets import Header, Footer, Static, Button, Input, Label
 from textual.containers import Container, Vertical, Horizontal
 
+from folder_organizer.widgets.operation_progress import OperationProgress
+
 
 class DeleteScreen(Screen):
     """Screen for deleting files by extension (with warnings!)."""
@@ -18,6 +20,7 @@ class DeleteScreen(Screen):
         super().__init__()
         self.organizer = organizer
         self.extension = None
+        self.plan = None
 
     def compose(self) -> ComposeResult:
         """Create child widgets."""
@@ -39,6 +42,8 @@ class DeleteScreen(Screen):
             
             yield Static("", id="preview-text")
             
+            yield OperationProgress(id="delete-progress")
+            
             with Horizontal(id="button-row"):
                 yield Button("← Back", id="btn-back", variant="default")
                 yield Button("Preview", id="btn-preview", variant="primary")
@@ -51,6 +56,10 @@ class DeleteScreen(Screen):
         if event.input.id == "extension-input":
             self.extension = event.value
             
+            # Extension changed, so any previewed plan is out of date
+            self.plan = None
+            self.query_one("#btn-confirm", Button).disabled = True
+            
             # Enable preview if extension entered
             preview_btn = self.query_one("#btn-preview", Button)
             preview_btn.disabled = not self.extension
@@ -70,9 +79,10 @@ class DeleteScreen(Screen):
             return
         
         try:
-            result = self.organizer.delete_files(self.extension, dry_run=True)
+            self.plan = self.organizer.plan_delete(self.extension)
+            files = self.plan.files_list
             
-            if result.files_affected == 0:
+            if not files:
                 preview_widget = self.query_one("#preview-text", Static)
                 preview_widget.update(
                     f"\n[yellow]No files found with extension '{self.extension}'[/yellow]\n"
@@ -83,14 +93,14 @@ class DeleteScreen(Screen):
             
             # Show preview with big warning
             lines = [
-                f"\n[red b]⚠️  {result.files_affected} file(s) will be PERMANENTLY DELETED:[/red b]\n"
+                f"\n[red b]⚠️  {len(files)} file(s) will be PERMANENTLY DELETED:[/red b]\n"
             ]
             
-            for file in result.files_list[:30]:
+            for file in files[:30]:
                 lines.append(f"  [red]✗[/red] {file}")
             
-            if len(result.files_list) > 30:
-                lines.append(f"\n  [dim]... and {len(result.files_list) - 30} more files[/dim]")
+            if len(files) > 30:
+                lines.append(f"\n  [dim]... and {len(files) - 30} more files[/dim]")
             
             lines.append("\n[yellow]⚠️  This action cannot be undone![/yellow]\n")
             
@@ -108,29 +118,19 @@ class DeleteScreen(Screen):
 
     def confirm_delete(self) -> None:
         """Show final confirmation before deletion."""
-        if not self.extension:
+        plan = self.plan
+        progress = self.query_one("#delete-progress", OperationProgress)
+        if plan is None or progress.running:
             return
         
+        self.query_one("#btn-confirm", Button).disabled = True
+        self.query_one("#btn-preview", Button).disabled = True
+        # Part of the plan may run; preview again before deleting more
+        self.plan = None
+        
         # Use Textual's built-in notification for final confirmation
         def do_actual_delete():
-            self.app.notify("Deleting files...", severity="warning")
-            
-            try:
-                result = self.organizer.delete_files(self.extension, dry_run=False)
-                
-                if result.success:
-                    self.app.notify(
-                        f"✅ {result.message}",
-                        severity="information",
-                        timeout=5
-                    )
-                    self.app.pop_screen()
-                else:
-                    error_msg = "Deletion completed with errors:\n" + "\n".join(result.errors[:3])
-                    self.app.notify(error_msg, severity="error", timeout=10)
-                    
-            except Exception as e:
-                self.app.notify(f"Error: {e}", severity="error", timeout=5)
+            progress.start(self.organizer, plan, "Deleting")
         
         # For now, just warn and do it - ideally we'd have a modal dialog
         self.app.notify(
@@ -141,3 +141,21 @@ class DeleteScreen(Screen):
         
         # Small delay then delete
         self.set_timer(2.0, do_actual_delete)
+
+    def on_operation_progress_finished(self, event: OperationProgress.Finished) -> None:
+        """Report the outcome of the deletion."""
+        result = event.result
+        if result.cancelled:
+            self.app.notify(f"⏹️  {result.message}", severity="warning", timeout=5)
+            self.query_one("#btn-preview", Button).disabled = False
+        elif result.success:
+            self.app.notify(
+                f"✅ {result.message}",
+                severity="information",
+                timeout=5
+            )
+            if self.is_current:
+                self.app.pop_screen()
+        else:
+            error_msg = "Deletion completed with errors:\n" + "\n".join(result.errors[:3])
+            self.app.notify(error_msg, severity="error", timeout=10)
@@ -1,11 +1,18 @@
 """Home screen for the folder organizer TUI."""
 
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from textual import work
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Static, Button, Label
 from textual.containers import Container, Vertical, Horizontal
 from rich.text import Text
 
+# Seconds between stats panel updates while the folder is being scanned
+STATS_INTERVAL = 0.25
+
 
 class HomeScreen(Screen):
     """Main home screen showing folder info and actions."""
@@ -17,6 +24,7 @@ class HomeScreen(Screen):
         ("2", "search", "Search"),
         ("3", "move", "Move"),
         ("4", "delete", "Delete"),
+        ("5", "usage", "Disk Usage"),
         ("s", "settings", "Settings"),
     ]
 
@@ -24,6 +32,10 @@ class HomeScreen(Screen):
         super().__init__()
         self.folder_path = folder_path
         self.organizer = organizer
+        self._stats_cancel: Optional[threading.Event] = None
+        # (cancel event of the scan that produced them, stats)
+        self._stats: Optional[Tuple[threading.Event, Dict[str, Any]]] = None
+        self._stats_shown: Optional[Dict[str, Any]] = None
 
     def compose(self) -> ComposeResult:
         """Create child widgets."""
@@ -45,31 +57,83 @@ class HomeScreen(Screen):
                 yield Button("[2] 🔍 Search/Count Files", id="btn-search")
                 yield Button("[3] 📤 Move Files by Extension", id="btn-move")
                 yield Button("[4] 🗑️  Delete Files by Extension", id="btn-delete", variant="error")
+                yield Button("[5] 💽 Disk Usage", id="btn-usage")
                 yield Button("[s] ⚙️  Settings", id="btn-settings")
         
         yield Footer()
 
     def on_mount(self) -> None:
         """Handle screen mount."""
+        self.set_interval(STATS_INTERVAL, self.refresh_stats)
         self.load_stats()
 
+    def on_unmount(self) -> None:
+        """Stop the stats scan when the screen goes away."""
+        if self._stats_cancel is not None:
+            self._stats_cancel.set()
+
     def load_stats(self) -> None:
-        """Load and display folder statistics."""
+        """Start computing folder statistics, cancelling any scan still running."""
+        if self._stats_cancel is not None:
+            self._stats_cancel.set()
+        self._stats_cancel = cancel = threading.Event()
+        self._stats = self._stats_shown = None
+        self.query_one("#stats-content", Static).update("Loading...")
+        self.compute_stats(self.organizer, cancel)
+
+    @work(thread=True, exclusive=True, group="stats")
+    def compute_stats(self, organizer, cancel: threading.Event) -> None:
+        """
+        Walk the folder in a worker thread.
+
+        Partial and final results are only stored here; refresh_stats picks
+        them up on the UI thread, so the walk never waits for the UI.
+        """
+        def publish(stats: Dict[str, Any]) -> None:
+            if not cancel.is_set():
+                self._stats = (cancel, stats)
+
         try:
-            meta = self.organizer.get_meta()
-            
+            meta = organizer.get_meta(
+                streaming=True,
+                progress=lambda counts: publish(dict(counts, partial=True)),
+                cancel=cancel,
+            )
+        except Exception as e:
+            publish({'error': str(e)})
+            return
+        publish(meta)
+
+    def refresh_stats(self) -> None:
+        """Show the latest stats if they changed since the last update."""
+        if self._stats is None:
+            return
+        scan, stats = self._stats
+        if scan is not self._stats_cancel or stats is self._stats_shown:
+            return
+        self._stats_shown = stats
+
+        stats_widget = self.query_one("#stats-content", Static)
+        if 'error' in stats:
+            stats_widget.update(f"[red]Error loading stats: {stats['error']}[/red]")
+            return
+
+        if stats.get('partial'):
             stats_text = f"""
-[cyan]💾 Size:[/cyan] {meta['size']}
-[cyan]📄 Files:[/cyan] {meta['file_count']:,}
-[cyan]📂 Subfolders:[/cyan] {meta['folder_count']:,}
-[cyan]🕐 Created:[/cyan] {meta['creation_time']}
+[cyan]💾 Size:[/cyan] {self.organizer._format_size(stats['size_bytes'])}
+[cyan]📄 Files:[/cyan] {stats['file_count']:,}
+[cyan]📂 Subfolders:[/cyan] {stats['total_folders']:,} total
+[dim]Scanning...[/dim]
             """.strip()
-            
-            stats_widget = self.query_one("#stats-content", Static)
-            stats_widget.update(stats_text)
-        except Exception as e:
-            stats_widget = self.query_one("#stats-content", Static)
-            stats_widget.update(f"[red]Error loading stats: {e}[/red]")
+        else:
+            approx = "" if stats['folder_count_exact'] else "~"
+            stats_text = f"""
+[cyan]💾 Size:[/cyan] {stats['size']}
+[cyan]📄 Files:[/cyan] {stats['file_count']:,}
+[cyan]📂 Subfolders:[/cyan] {approx}{stats['folder_count']:,} ({stats['total_folders']:,} total)
+[cyan]🕐 Created:[/cyan] {stats['creation_time']}
+            """.strip()
+        stats_widget.update(stats_text)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
@@ -83,6 +147,8 @@ class HomeScreen(Screen):
             self.action_move()
         elif button_id == "btn-delete":
             self.action_delete()
+        elif button_id == "btn-usage":
+            self.action_usage()
         elif button_id == "btn-settings":
             self.action_settings()
 
@@ -98,7 +164,9 @@ class HomeScreen(Screen):
                 
                 try:
                     # Create new organizer for the new path
-                    self.organizer = FolderOrganizer(str(new_path))
+                    self.organizer = FolderOrganizer.from_config(
+                        str(new_path), self.app.config
+                    )
                     self.folder_path = str(new_path)
                     
                     # Update the folder path display
@@ -146,6 +214,11 @@ class HomeScreen(Screen):
         from folder_organizer.screens.delete import DeleteScreen
         self.app.push_screen(DeleteScreen(self.organizer))
 
+    def action_usage(self) -> None:
+        """Show disk usage browser."""
+        from folder_organizer.screens.usage import UsageScreen
+        self.app.push_screen(UsageScreen(self.organizer))
+
     def action_settings(self) -> None:
         """Show settings screen."""
         self.app.notify("Settings screen coming soon!", severity="information")
@@ -6,6 +6,8 @@ from textual.widgets import Header, Footer, Static, Button, Input, Label, Direct
 from textual.containers import Container, Vertical, Horizontal, ScrollableContainer
 from pathlib import Path
 
+from folder_organizer.widgets.operation_progress import OperationProgress
+
 
 class MoveScreen(Screen):
     """Screen for moving files by extension to another folder."""
@@ -20,6 +22,7 @@ class MoveScreen(Screen):
         self.organizer = organizer
         self.destination = None
         self.extension = None
+        self.plan = None
 
     def compose(self) -> ComposeResult:
         """Create child widgets."""
@@ -41,6 +44,8 @@ class MoveScreen(Screen):
             
             yield Static("", id="preview-text")
             
+            yield OperationProgress(id="move-progress")
+            
             with Horizontal(id="button-row"):
                 yield Button("← Back", id="btn-back", variant="default")
                 yield Button("Preview", id="btn-preview", variant="primary")
@@ -55,6 +60,10 @@ class MoveScreen(Screen):
         elif event.input.id == "destination-input":
             self.destination = event.value
         
+        # Inputs changed, so any previewed plan is out of date
+        self.plan = None
+        self.query_one("#btn-confirm", Button).disabled = True
+        
         # Enable preview if both fields have values
         preview_btn = self.query_one("#btn-preview", Button)
         if self.extension and self.destination:
@@ -93,13 +102,10 @@ class MoveScreen(Screen):
             return
         
         try:
-            result = self.organizer.move_files(
-                self.extension,
-                str(dest_path),
-                dry_run=True
-            )
+            self.plan = self.organizer.plan_move(self.extension, str(dest_path))
+            files = self.plan.files_list
             
-            if result.files_affected == 0:
+            if not files:
                 preview_widget = self.query_one("#preview-text", Static)
                 preview_widget.update(
                     f"\n[yellow]No files found with extension '{self.extension}'[/yellow]\n"
@@ -110,14 +116,14 @@ class MoveScreen(Screen):
             
             # Show preview
             lines = [
-                f"\n[cyan]Found {result.files_affected} file(s) to move:[/cyan]\n"
+                f"\n[cyan]Found {len(files)} file(s) to move:[/cyan]\n"
             ]
             
-            for file in result.files_list[:20]:
+            for file in files[:20]:
                 lines.append(f"  • {file}")
             
-            if len(result.files_list) > 20:
-                lines.append(f"\n  [dim]... and {len(result.files_list) - 20} more files[/dim]")
+            if len(files) > 20:
+                lines.append(f"\n  [dim]... and {len(files) - 20} more files[/dim]")
             
             lines.append(f"\n[green]→ Destination: {dest_path}[/green]\n")
             
@@ -134,31 +140,31 @@ class MoveScreen(Screen):
             preview_widget.update(f"\n[red]Error: {e}[/red]\n")
 
     def do_move(self) -> None:
-        """Execute the move operation."""
-        if not self.extension or not self.destination:
+        """Execute the move operation in the background."""
+        progress = self.query_one("#move-progress", OperationProgress)
+        if self.plan is None or progress.running:
             return
         
-        dest_path = Path(self.destination).expanduser().resolve()
-        
-        self.app.notify("Moving files...", severity="information")
-        
-        try:
-            result = self.organizer.move_files(
-                self.extension,
-                str(dest_path),
-                dry_run=False
+        self.query_one("#btn-confirm", Button).disabled = True
+        self.query_one("#btn-preview", Button).disabled = True
+        progress.start(self.organizer, self.plan, "Moving")
+        # Part of the plan may run; preview again before moving more
+        self.plan = None
+
+    def on_operation_progress_finished(self, event: OperationProgress.Finished) -> None:
+        """Report the outcome of the move."""
+        result = event.result
+        if result.cancelled:
+            self.app.notify(f"⏹️  {result.message}", severity="warning", timeout=5)
+            self.query_one("#btn-preview", Button).disabled = False
+        elif result.success:
+            self.app.notify(
+                f"✅ {result.message}",
+                severity="information",
+                timeout=5
             )
-            
-            if result.success:
-                self.app.notify(
-                    f"✅ {result.message}",
-                    severity="information",
-                    timeout=5
-                )
+            if self.is_current:
                 self.app.pop_screen()
-            else:
-                error_msg = "Move completed with errors:\n" + "\n".join(result.errors[:3])
-                self.app.notify(error_msg, severity="warning", timeout=10)
-                
-        except Exception as e:
-            self.app.notify(f"Error: {e}", severity="error", timeout=5)
+        else:
+            error_msg = "Move completed with errors:\n" + "\n".join(result.errors[:3])
+            self.app.notify(error_msg, severity="warning", timeout=10)
@@ -1,10 +1,18 @@
 """Organize files screen."""
 
+import os
+
+from textual import work
 from textual.app import ComposeResult
 from textual.screen import Screen
-from textual.widgets import Header, Footer, Static, Button, Label, DataTable
-from textual.containers import Container, Vertical, Horizontal, ScrollableContainer
-from rich.table import Table as RichTable
+from textual.worker import get_current_worker
+from textual.widgets import Header, Footer, Static, Button
+from textual.containers import Container, Horizontal
+
+from folder_organizer.plan import OperationPlan
+from folder_organizer.scanner import FileEntry
+from folder_organizer.widgets.operation_progress import OperationProgress
+from folder_organizer.widgets.results_table import ResultsTable
 
 
 class OrganizeScreen(Screen):
@@ -19,6 +27,7 @@ class OrganizeScreen(Screen):
         super().__init__()
         self.organizer = organizer
         self.preview_data = None
+        self.plan = None
 
     def compose(self) -> ComposeResult:
         """Create child widgets."""
@@ -31,8 +40,10 @@ class OrganizeScreen(Screen):
                 classes="description"
             )
             
-            with ScrollableContainer(id="preview-container"):
-                yield Static("Loading preview...", id="preview-content")
+            yield Static("Loading preview...", id="preview-content")
+            yield ResultsTable(self.organizer.path, extra_column="Category", id="preview-table")
+            
+            yield OperationProgress(id="organize-progress")
             
             with Horizontal(id="button-row"):
                 yield Button("← Back", id="btn-back", variant="default")
@@ -45,53 +56,58 @@ class OrganizeScreen(Screen):
         self.load_preview()
 
     def load_preview(self) -> None:
-        """Load organization preview."""
+        """Plan the organization in the background."""
+        self.query_one("#btn-confirm", Button).disabled = True
+        self.query_one("#preview-content", Static).update("Loading preview...")
+        self.plan_preview()
+
+    @work(thread=True, exclusive=True, group="preview")
+    def plan_preview(self) -> None:
+        """Scan the folder in a worker thread."""
+        worker = get_current_worker()
         try:
-            self.preview_data = self.organizer.preview_organization()
-            
-            if not self.preview_data:
-                preview_widget = self.query_one("#preview-content", Static)
-                preview_widget.update(
-                    "[yellow]No files to organize\n\n"
-                    "All files are either already categorized or are unknown file types.[/yellow]"
-                )
-                # Disable confirm button
-                confirm_btn = self.query_one("#btn-confirm", Button)
-                confirm_btn.disabled = True
-                return
-            
-            # Build preview text
-            lines = ["\n[b cyan]Organization Preview:[/b cyan]\n"]
-            
-            total_files = 0
-            for category in sorted(self.preview_data.keys()):
-                files = self.preview_data[category]
-                count = len(files)
-                total_files += count
-                
-                lines.append(f"[green]📁 {category}[/green] ({count} files)")
-                
-                # Show first few files
-                for file in files[:5]:
-                    lines.append(f"   • {file}")
-                
-                if len(files) > 5:
-                    lines.append(f"   [dim]... and {len(files) - 5} more files[/dim]")
-                
-                lines.append("")
-            
-            lines.append(f"[b]Total: {total_files} files across {len(self.preview_data)} categories[/b]\n")
-            
-            preview_text = "\n".join(lines)
-            preview_widget = self.query_one("#preview-content", Static)
-            preview_widget.update(preview_text)
-            
+            plan = self.organizer.plan_organize()
         except Exception as e:
-            preview_widget = self.query_one("#preview-content", Static)
-            preview_widget.update(f"[red]Error loading preview: {e}[/red]")
-            # Disable confirm button
-            confirm_btn = self.query_one("#btn-confirm", Button)
-            confirm_btn.disabled = True
+            if not worker.is_cancelled:
+                self.app.call_from_thread(self.show_preview_error, e)
+            return
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self.show_preview, plan)
+
+    def show_preview(self, plan: OperationPlan) -> None:
+        """Summarize the plan and list its files."""
+        self.plan = plan
+        self.preview_data = plan.by_target_dir()
+        table = self.query_one("#preview-table", ResultsTable)
+        preview_widget = self.query_one("#preview-content", Static)
+        
+        if not self.preview_data:
+            table.show([])
+            preview_widget.update(
+                "[yellow]No files to organize\n\n"
+                "All files are either already categorized or are unknown file types.[/yellow]"
+            )
+            return
+        
+        # One line per few categories; the files themselves go in the table
+        counts = [
+            f"[green]📁 {category}[/green] {len(files):,}"
+            for category, files in sorted(self.preview_data.items())
+        ]
+        preview_widget.update(
+            "   ".join(counts) + f"\n[b]Total: {len(plan.entries):,} files across "
+            f"{len(self.preview_data)} categories[/b]"
+        )
+        table.show(
+            [FileEntry(e.name, e.source, e.size, e.mtime_ns, e.inode) for e in plan.entries],
+            extra=[os.path.basename(os.path.dirname(e.target)) for e in plan.entries],
+        )
+        self.query_one("#btn-confirm", Button).disabled = False
+
+    def show_preview_error(self, error: Exception) -> None:
+        """Render a planning failure."""
+        preview_widget = self.query_one("#preview-content", Static)
+        preview_widget.update(f"[red]Error loading preview: {error}[/red]")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
@@ -101,26 +117,28 @@ class OrganizeScreen(Screen):
             self.do_organize()
 
     def do_organize(self) -> None:
-        """Execute the organization."""
-        if not self.preview_data:
+        """Execute the organization in the background."""
+        progress = self.query_one("#organize-progress", OperationProgress)
+        if not self.preview_data or progress.running:
             return
         
-        # Show progress notification
-        self.app.notify("Organizing files...", severity="information")
-        
-        try:
-            result = self.organizer.organize_files(dry_run=False)
-            
-            if result.success:
-                self.app.notify(
-                    f"✅ {result.message}",
-                    severity="information",
-                    timeout=5
-                )
+        self.query_one("#btn-confirm", Button).disabled = True
+        progress.start(self.organizer, self.plan, "Organizing")
+
+    def on_operation_progress_finished(self, event: OperationProgress.Finished) -> None:
+        """Report the outcome of the organization."""
+        result = event.result
+        if result.cancelled:
+            self.app.notify(f"⏹️  {result.message}", severity="warning", timeout=5)
+            self.load_preview()
+        elif result.success:
+            self.app.notify(
+                f"✅ {result.message}",
+                severity="information",
+                timeout=5
+            )
+            if self.is_current:
                 self.app.pop_screen()
-            else:
-                error_msg = f"Organized with errors:\n" + "\n".join(result.errors[:3])
-                self.app.notify(error_msg, severity="warning", timeout=10)
-                
-        except Exception as e:
-            self.app.notify(f"Error: {e}", severity="error", timeout=5)
+        else:
+            error_msg = "Organized with errors:\n" + "\n".join(result.errors[:3])
+            self.app.notify(error_msg, severity="warning", timeout=10)
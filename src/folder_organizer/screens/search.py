@@ -1,9 +1,26 @@
 """Search files screen."""
 
+from typing import List, Optional
+
+from rich.text import Text
+
+from textual import work
 from textual.app import ComposeResult
 from textual.screen import Screen
-from textual.widgets import Header, Footer, Static, Button, Input, DataTable
-from textual.containers import Container, Vertical, ScrollableContainer
+from textual.timer import Timer
+from textual.worker import get_current_worker
+from textual.widgets import Header, Footer, Static, Button, Input, Switch
+from textual.containers import Container, Horizontal
+
+from folder_organizer.fuzzy import SHORTLIST_SIZE, FileFinder, highlight
+from folder_organizer.search import SearchResult
+from folder_organizer.widgets.results_table import ResultsTable
+
+# Seconds of typing inactivity before a search starts
+DEBOUNCE_DELAY = 0.15
+
+# Best-ranked fuzzy matches listed
+FUZZY_LIMIT = 1000
 
 
 class SearchScreen(Screen):
@@ -12,11 +29,17 @@ class SearchScreen(Screen):
     BINDINGS = [
         ("escape", "app.pop_screen", "Back"),
         ("q", "app.pop_screen", "Back"),
+        ("ctrl+f", "toggle_fuzzy", "Fuzzy"),
     ]
 
     def __init__(self, organizer):
         super().__init__()
         self.organizer = organizer
+        self.session = organizer.search_session()
+        self.finder: Optional[FileFinder] = None
+        # Bumped whenever the finder is dropped, so stale workers cannot restore it
+        self._finder_generation = 0
+        self._debounce: Optional[Timer] = None
 
     def compose(self) -> ComposeResult:
         """Create child widgets."""
@@ -34,8 +57,12 @@ class SearchScreen(Screen):
                 id="search-input"
             )
             
-            with ScrollableContainer(id="results-container"):
-                yield Static("", id="results-content")
+            with Horizontal(id="search-options"):
+                yield Switch(value=False, id="fuzzy-switch")
+                yield Static("Fuzzy match (ranked, e.g. [b]rptpdf[/b] finds report.pdf)")
+            
+            yield Static("", id="results-summary")
+            yield ResultsTable(self.organizer.path, id="results-table")
             
             yield Button("← Back", id="btn-back", variant="default")
         
@@ -43,51 +70,138 @@ class SearchScreen(Screen):
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """Handle search when Enter is pressed."""
-        self.do_search(event.value)
+        self._cancel_pending()
+        if event.value:
+            self.run_search(event.value)
 
     def on_input_changed(self, event: Input.Changed) -> None:
         """Handle real-time search."""
+        self._cancel_pending()
         if len(event.value) >= 2:  # Only search if at least 2 characters
-            self.do_search(event.value)
+            term = event.value
+            # Wait for a pause in typing before starting a scan
+            self._debounce = self.set_timer(DEBOUNCE_DELAY, lambda: self.run_search(term))
+        else:
+            self.workers.cancel_group(self, "search")
+            self.query_one("#results-summary", Static).update("")
+            self.query_one("#results-table", ResultsTable).show([])
+
+    def on_switch_changed(self, event: Switch.Changed) -> None:
+        """Re-run the current search in the new mode."""
+        if event.switch.id == "fuzzy-switch":
+            self._cancel_pending()
+            # Pick up files added since the last fuzzy search
+            self.finder = None
+            self._finder_generation += 1
+            term = self.query_one("#search-input", Input).value
+            if len(term) >= 2:
+                self.run_search(term)
+
+    def action_toggle_fuzzy(self) -> None:
+        """Toggle fuzzy matching."""
+        switch = self.query_one("#fuzzy-switch", Switch)
+        switch.value = not switch.value
+
+    def _cancel_pending(self) -> None:
+        """Drop a debounced search that has not started yet."""
+        if self._debounce is not None:
+            self._debounce.stop()
+            self._debounce = None
+
+    def run_search(self, term: str) -> None:
+        """Start a search for a term in the current mode."""
+        if self.query_one("#fuzzy-switch", Switch).value:
+            self.run_fuzzy(term, self.finder, self._finder_generation)
         else:
-            results_widget = self.query_one("#results-content", Static)
-            results_widget.update("")
+            self.run_substring(term)
 
-    def do_search(self, term: str) -> None:
-        """Perform the search."""
-        if not term:
+    @work(thread=True, exclusive=True, group="search")
+    def run_substring(self, term: str) -> None:
+        """Scan for a term in a worker thread; a newer search cancels this one."""
+        worker = get_current_worker()
+        try:
+            result = self.session.search(
+                term, cancelled=lambda: worker.is_cancelled, with_stat=False
+            )
+        except Exception as e:
+            if not worker.is_cancelled:
+                self.app.call_from_thread(self.show_error, e)
             return
-        
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self.show_results, result)
+
+    @work(thread=True, exclusive=True, group="search")
+    def run_fuzzy(self, term: str, finder: Optional[FileFinder], generation: int) -> None:
+        """
+        Rank files against a fuzzy query in a worker thread.
+
+        A finder built here is handed back to the UI thread, which keeps it
+        only if it was not dropped in the meantime.
+        """
+        worker = get_current_worker()
+
+        def cancelled() -> bool:
+            return worker.is_cancelled
+
         try:
-            count = self.organizer.get_filecount(term)
-            files = self.organizer.search_files(term)
-            
-            if count == 0:
-                results_widget = self.query_one("#results-content", Static)
-                results_widget.update(
-                    f"\n[yellow]No files found matching '[b]{term}[/b]'[/yellow]"
-                )
-                return
-            
-            # Build results display
-            lines = [f"\n[green]Found {count} file(s) matching '[b]{term}[/b]'[/green]\n"]
-            
-            for file in files[:50]:  # Show first 50
-                lines.append(
-                    f"[cyan]•[/cyan] {file['name']}  "
-                    f"[dim]({file['size_formatted']})[/dim]"
+            if finder is None:
+                # Ranked approximately beyond SHORTLIST_SIZE matches to keep
+                # typing responsive; the find command ranks exactly
+                finder = self.organizer.fuzzy_finder(
+                    cancelled=cancelled, shortlist=SHORTLIST_SIZE
                 )
-            
-            if len(files) > 50:
-                lines.append(f"\n[dim]... and {len(files) - 50} more files[/dim]")
-            
-            results_text = "\n".join(lines)
-            results_widget = self.query_one("#results-content", Static)
-            results_widget.update(results_text)
-            
+                if worker.is_cancelled:
+                    return  # Partial snapshot
+                self.app.call_from_thread(self._keep_finder, finder, generation)
+            count, matches = finder.match(term, FUZZY_LIMIT, cancelled=cancelled)
+            hits = [finder.entries[match.index] for match in matches]
         except Exception as e:
-            results_widget = self.query_one("#results-content", Static)
-            results_widget.update(f"[red]Error searching: {e}[/red]")
+            if not worker.is_cancelled:
+                self.app.call_from_thread(self.show_error, e)
+            return
+        if not worker.is_cancelled:
+            labels = [highlight(match.text, match.positions) for match in matches]
+            self.app.call_from_thread(
+                self.show_results, SearchResult(term, count, hits), labels
+            )
+
+    def _keep_finder(self, finder: FileFinder, generation: int) -> None:
+        """Reuse a finder built by a worker for later fuzzy searches."""
+        if generation == self._finder_generation:
+            self.finder = finder
+
+    def show_results(self, result: SearchResult, labels: Optional[List[Text]] = None) -> None:
+        """
+        Render the outcome of a search.
+        
+        Args:
+            result: Search result to show
+            labels: Highlighted text to show instead of each hit's name
+        """
+        term = result.term
+        count = result.count
+        summary = self.query_one("#results-summary", Static)
+        self.query_one("#results-table", ResultsTable).show(result.hits, labels)
+        
+        # Built as Text so that file names and terms are never parsed as markup
+        if count == 0:
+            summary.update(Text.assemble(
+                ("No files found matching '", "yellow"), (term, "bold yellow"), ("'", "yellow")
+            ))
+            return
+        
+        summary.update(Text.assemble(
+            (f"Found {count:,} file(s) matching '", "green"),
+            (term, "bold green"),
+            ("'", "green"),
+            (f"   best {len(result.hits):,} shown" if result.truncated else "", "dim"),
+            ("   n/s/m or click a header to sort", "dim"),
+        ))
+
+    def show_error(self, error: Exception) -> None:
+        """Render a search failure."""
+        summary = self.query_one("#results-summary", Static)
+        summary.update(f"[red]Error searching: {error}[/red]")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
@@ -0,0 +1,209 @@
+"""Disk usage browser screen."""
+
+from typing import Optional
+
+from rich.text import Text
+
+from textual import work
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.worker import get_current_worker
+from textual.widgets import Header, Footer, Static, DataTable
+from textual.containers import Container
+
+from folder_organizer.usage import UsageNode, UsageTree
+
+# Seconds between redraws while the scan is running
+REFRESH_INTERVAL = 0.5
+
+# Rows shown per folder; the rest are summed into one line
+MAX_ROWS = 500
+
+BAR_WIDTH = 20
+
+
+class UsageScreen(Screen):
+    """ncdu-style browser of folders sorted by recursive size."""
+
+    BINDINGS = [
+        ("escape", "app.pop_screen", "Back"),
+        ("q", "app.pop_screen", "Back"),
+        ("backspace", "go_up", "Up"),
+        ("left", "go_up", "Up"),
+        ("right", "open", "Open"),
+        ("a", "toggle_apparent", "Apparent size"),
+        ("r", "rescan", "Rescan"),
+    ]
+
+    def __init__(self, organizer):
+        super().__init__()
+        self.organizer = organizer
+        self.usage_tree: Optional[UsageTree] = None
+        self.current: Optional[UsageNode] = None
+        self.apparent = False
+        self._shown = None
+
+    def compose(self) -> ComposeResult:
+        """Create child widgets."""
+        yield Header()
+
+        with Container(id="usage-container"):
+            yield Static("💽 Disk Usage", classes="screen-title")
+            yield Static("", id="usage-path")
+            yield DataTable(id="usage-table", cursor_type="row", zebra_stripes=True)
+            yield Static("", id="usage-status")
+
+        yield Footer()
+
+    def on_mount(self) -> None:
+        """Set up the table and start scanning."""
+        table = self.query_one("#usage-table", DataTable)
+        table.add_column("Size", key="size")
+        table.add_column("%", key="percent")
+        table.add_column("", key="bar")
+        table.add_column("Name", key="name")
+        table.add_column("Files", key="files")
+        self.start_scan()
+        self.set_interval(REFRESH_INTERVAL, self.refresh_view)
+
+    def on_unmount(self) -> None:
+        """Stop the scan when leaving the screen."""
+        if self.usage_tree is not None:
+            self.usage_tree.cancel()
+
+    def start_scan(self) -> None:
+        """Scan the folder from scratch."""
+        if self.usage_tree is not None:
+            self.usage_tree.cancel()
+        self.usage_tree = self.organizer.usage_tree()
+        self.current = self.usage_tree.root
+        self._shown = None
+        self.scan(self.usage_tree)
+        self.refresh_view()
+
+    @work(thread=True, exclusive=True, group="usage")
+    def scan(self, tree: UsageTree) -> None:
+        """Fill in the tree in a worker thread; the view polls it."""
+        tree.scan()
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self.refresh_view)
+
+    def refresh_view(self) -> None:
+        """Redraw the current folder if anything changed since the last redraw."""
+        tree, node = self.usage_tree, self.current
+        if tree is None or node is None:
+            return
+        state = (id(node), tree.generation, self.apparent)
+        if state == self._shown:
+            return
+        same_node = self._shown is not None and self._shown[0] == id(node)
+        self._shown = state
+
+        fmt = self.organizer._format_size
+        rows = tree.snapshot(node, self.apparent)
+        total = node.apparent if self.apparent else node.allocated
+
+        table = self.query_one("#usage-table", DataTable)
+        selected = None
+        if same_node and table.row_count:
+            try:
+                selected = table.coordinate_to_cell_key(table.cursor_coordinate).row_key.value
+            except Exception:
+                selected = None
+        table.clear()
+
+        shown, rest = rows[:MAX_ROWS], rows[MAX_ROWS:]
+        for row in shown:
+            size = row.apparent if self.apparent else row.allocated
+            fraction = size / total if total else 0.0
+            filled = round(fraction * BAR_WIDTH)
+            bar = Text("█" * filled, style="cyan")
+            bar.append("░" * (BAR_WIDTH - filled), style="dim")
+            if row.is_dir:
+                name = Text(f"{row.name}/", style="bold")
+                if not row.complete:
+                    name.append("  …", style="yellow")
+            elif row.name:
+                name = Text(row.name)
+            else:
+                name = Text(f"({row.files} smaller files)", style="dim")
+            table.add_row(
+                Text(fmt(size), justify="right"),
+                Text(f"{fraction:.1%}", justify="right"),
+                bar,
+                name,
+                Text(f"{row.files:,}", justify="right"),
+                key=f"{'d' if row.is_dir else 'f'}:{row.name}",
+            )
+        if rest:
+            size = sum(row.apparent if self.apparent else row.allocated for row in rest)
+            table.add_row(
+                Text(fmt(size), justify="right"), "", "",
+                Text(f"({len(rest)} more entries)", style="dim"), "",
+                key="rest",
+            )
+
+        if selected is not None:
+            try:
+                table.move_cursor(row=table.get_row_index(selected))
+            except Exception:
+                pass
+
+        kind = "apparent" if self.apparent else "on disk"
+        self.query_one("#usage-path", Static).update(Text.assemble(
+            ("📁 ", ""), (node.path, "bold cyan"),
+            (f"   {fmt(total)} {kind}, {node.files:,} files", "dim"),
+        ))
+        if tree.done:
+            status = Text("✓ Scan complete", style="green")
+        elif node.complete:
+            status = Text("✓ This folder is complete; still scanning elsewhere…", style="green")
+        else:
+            status = Text("Scanning… sizes are growing", style="yellow")
+        if tree.hardlinks:
+            status.append(f"   {tree.hardlinks:,} extra hard links counted once", style="dim")
+        if tree.errors:
+            status.append(f"   {len(tree.errors):,} folders unreadable", style="red")
+        self.query_one("#usage-status", Static).update(status)
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        """Open the selected folder."""
+        self._open(event.row_key.value)
+
+    def action_open(self) -> None:
+        """Open the folder under the cursor."""
+        table = self.query_one("#usage-table", DataTable)
+        if table.row_count:
+            row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+            self._open(row_key.value)
+
+    def _open(self, key: Optional[str]) -> None:
+        """Drill into a child folder, reusing what was already scanned."""
+        if self.current is None or not key or not key.startswith("d:"):
+            return
+        child = self.current.children.get(key[2:])
+        if child is not None:
+            self.current = child
+            self.refresh_view()
+
+    def action_go_up(self) -> None:
+        """Go back to the parent folder."""
+        if self.current is None or self.current.parent is None:
+            return
+        previous = self.current.name
+        self.current = self.current.parent
+        self.refresh_view()
+        table = self.query_one("#usage-table", DataTable)
+        try:
+            table.move_cursor(row=table.get_row_index(f"d:{previous}"))
+        except Exception:
+            pass
+
+    def action_toggle_apparent(self) -> None:
+        """Switch between allocated and apparent sizes."""
+        self.apparent = not self.apparent
+        self.refresh_view()
+
+    def action_rescan(self) -> None:
+        """Scan again from scratch."""
+        self.start_scan()
@@ -0,0 +1,221 @@
+"""Streaming file search results."""
+
+import os
+import time
+import heapq
+import threading
+from dataclasses import dataclass, field
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from folder_organizer.scanner import FileEntry, stat_entry
+
+# Sort keys accepted by collect(); names compare case-insensitively
+SORT_KEYS: Dict[str, Callable[[FileEntry], Any]] = {
+    "name": lambda entry: entry.name.lower(),
+    "size": attrgetter("size"),
+    "mtime": attrgetter("mtime_ns"),
+}
+
+
+@dataclass
+class SearchResult:
+    """The exact number of matches plus the (possibly limited) hits to show."""
+    term: str
+    count: int
+    hits: List[FileEntry] = field(default_factory=list)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether more files matched than are held in hits."""
+        return self.count > len(self.hits)
+
+
+class _Counting:
+    """Iterator wrapper that counts the items passing through it."""
+
+    def __init__(self, items: Iterable[FileEntry]):
+        self._items = iter(items)
+        self.count = 0
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return self
+
+    def __next__(self) -> FileEntry:
+        item = next(self._items)
+        self.count += 1
+        return item
+
+
+def collect(
+    matches: Iterable[FileEntry],
+    term: str,
+    limit: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    reverse: bool = False,
+) -> SearchResult:
+    """
+    Consume a stream of matches, keeping only what will be displayed.
+
+    Without a sort key the first ``limit`` matches are kept in scan order.
+    With one, a bounded heap keeps the top ``limit`` matches, so memory is
+    proportional to the limit rather than to the number of matches. The
+    total count is always exact.
+
+    Args:
+        matches: Matching entries, typically a generator
+        term: The search term (recorded on the result)
+        limit: Maximum number of hits to keep (None keeps all)
+        sort_by: One of SORT_KEYS, or None for scan order
+        reverse: Sort descending (largest, newest or Z first)
+
+    Returns:
+        SearchResult with the exact count and the kept hits
+
+    Raises:
+        ValueError: If sort_by is not a known sort key
+    """
+    if sort_by is None:
+        it = iter(matches)
+        hits = list(islice(it, limit)) if limit is not None else list(it)
+        return SearchResult(term, len(hits) + sum(1 for _ in it), hits)
+
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort_by}")
+    key = SORT_KEYS[sort_by]
+    counted = _Counting(matches)
+    if limit is None:
+        hits = sorted(counted, key=key, reverse=reverse)
+    elif reverse:
+        hits = heapq.nlargest(limit, counted, key=key)
+    else:
+        hits = heapq.nsmallest(limit, counted, key=key)
+    return SearchResult(term, counted.count, hits)
+
+
+class SearchSession:
+    """
+    Search-as-you-type state that narrows results in memory.
+
+    A name containing a term also contains every substring of that term, so
+    when a new query contains the previous one ("rep" -> "repo" -> "report")
+    the files matching it are a subset of the previous matches. The session
+    keeps those matches and filters them instead of listing the folder
+    again. It rescans when the query no longer contains the previous one
+    (characters were deleted or changed), when the folder's mtime changed
+    (files were added, removed or renamed) or when the candidates are older
+    than ``max_age`` seconds.
+
+    Searches are serialized, so a session can be shared by worker threads.
+    """
+
+    def __init__(
+        self,
+        scan: Callable[[str, Optional[Callable[[], bool]]], Iterable[FileEntry]],
+        root: Union[str, os.PathLike],
+        max_age: float = 30.0,
+    ):
+        """
+        Initialize the session.
+
+        Args:
+            scan: Yields the files matching a lower-cased term, without stat;
+                also gets the cancelled predicate to check while scanning
+            root: Folder being searched, watched for changes
+            max_age: Seconds after which the candidates are rescanned anyway
+        """
+        self.scan = scan
+        self.root = root
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._term: Optional[str] = None
+        self._candidates: List[FileEntry] = []
+        self._names: List[str] = []
+        self._scanned_at = 0.0
+        self._root_mtime: Optional[int] = None
+
+    def invalidate(self) -> None:
+        """Forget the candidates so the next search rescans."""
+        with self._lock:
+            self._term = None
+            self._candidates, self._names = [], []
+
+    def search(
+        self,
+        term: str,
+        limit: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        reverse: bool = False,
+        cancelled: Optional[Callable[[], bool]] = None,
+        with_stat: bool = True,
+    ) -> SearchResult:
+        """
+        Search for files, refining the previous results when possible.
+
+        Args:
+            term: Search term (substring or extension, case-insensitive)
+            limit: Maximum number of hits to keep (None keeps all)
+            sort_by: One of SORT_KEYS, or None for scan order
+            reverse: Sort descending
+            cancelled: Checked for every entry while rescanning; a cancelled
+                rescan stops early, returns a partial result and is not kept
+                for later refinement
+            with_stat: Whether the kept hits need size and mtime filled in;
+                without it, hits that were not stat'ed for sorting are
+                returned as scanned
+
+        Returns:
+            SearchResult with the exact count and the kept hits
+        """
+        lterm = term.lower()
+        with self._lock:
+            if self._can_narrow(lterm):
+                keep = [i for i, name in enumerate(self._names) if lterm in name]
+                self._candidates = [self._candidates[i] for i in keep]
+                self._names = [self._names[i] for i in keep]
+                self._term = lterm
+                candidates = self._candidates
+            else:
+                candidates = self._rescan(lterm, cancelled)
+
+            if sort_by in ("size", "mtime"):
+                candidates = [stat_entry(entry) for entry in candidates]
+                if self._term == lterm:
+                    # Keep the stat results for later refinements
+                    self._candidates = candidates
+            result = collect(candidates, term, limit, sort_by, reverse)
+        if with_stat:
+            result.hits = [stat_entry(hit) for hit in result.hits]
+        return result
+
+    def _can_narrow(self, lterm: str) -> bool:
+        """Whether the kept candidates are a valid superset for a term."""
+        if self._term is None or self._term not in lterm:
+            return False
+        if time.monotonic() - self._scanned_at > self.max_age:
+            return False
+        return self._root_mtime == self._stat_root()
+
+    def _rescan(self, lterm: str, cancelled: Optional[Callable[[], bool]]) -> List[FileEntry]:
+        """List the folder again and keep the matches unless cancelled."""
+        self._term = None
+        root_mtime = self._stat_root()
+        scanned_at = time.monotonic()
+        candidates = list(self.scan(lterm, cancelled))
+        if cancelled is not None and cancelled():
+            self._candidates, self._names = [], []
+            return candidates
+
+        self._term = lterm
+        self._candidates = candidates
+        self._names = [entry.name.lower() for entry in candidates]
+        self._scanned_at = scanned_at
+        self._root_mtime = root_mtime
+        return candidates
+
+    def _stat_root(self) -> Optional[int]:
+        try:
+            return os.stat(self.root).st_mtime_ns
+        except OSError:
+            return None
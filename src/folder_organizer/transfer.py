@@ -0,0 +1,270 @@
+"""Parallel cross-device file transfer engine."""
+
+import os
+import time
+import errno
+import shutil
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+FSYNC_POLICIES = ("none", "file", "end")
+
+# FileTransfer.error of jobs skipped because the move was cancelled
+CANCELLED = "cancelled"
+
+# Bytes requested per copy_file_range/sendfile call
+_CHUNK = 64 * 1024 * 1024
+
+# Errors meaning "this zero-copy call is not usable here", not "the copy failed"
+_FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF,
+}
+
+
+@dataclass
+class FileTransfer:
+    """Outcome of copying one file."""
+    source: str
+    target: str
+    bytes: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def rate(self) -> float:
+        """Throughput in bytes per second."""
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class TransferReport:
+    """Per-file and aggregate results of a transfer run."""
+    files: List[FileTransfer] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def bytes(self) -> int:
+        """Bytes copied successfully."""
+        return sum(f.bytes for f in self.files if f.error is None)
+
+    @property
+    def rate(self) -> float:
+        """Aggregate throughput in bytes per second (wall clock)."""
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def failed(self) -> List[FileTransfer]:
+        """Transfers that did not complete."""
+        return [f for f in self.files if f.error is not None]
+
+
+def _zero_copy(call: Callable[[int], int]) -> int:
+    """
+    Run an in-kernel copy call until it reports EOF.
+
+    Returns:
+        Bytes copied, 0 if the call is not usable here and nothing was copied
+    """
+    copied = 0
+    try:
+        while True:
+            n = call(copied)
+            if n == 0:
+                return copied
+            copied += n
+    except OSError as e:
+        if e.errno not in _FALLBACK_ERRNOS or copied:
+            raise
+        return 0
+
+
+def _copy_fd(src_fd: int, dst_fd: int, size: int) -> int:
+    """
+    Copy a file's data between descriptors, preferring in-kernel copies.
+
+    An in-kernel copy that hits EOF before copying anything is treated like
+    an unsupported one: procfs, some FUSE mounts and older kernels report
+    that instead of an error, so the next method is tried.
+
+    Returns:
+        Bytes copied
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None and size:
+        copied = _zero_copy(lambda _: copy_file_range(src_fd, dst_fd, _CHUNK))
+        if copied:
+            return copied
+
+    if hasattr(os, "sendfile") and size:
+        copied = _zero_copy(lambda offset: os.sendfile(dst_fd, src_fd, offset, _CHUNK))
+        if copied:
+            return copied
+
+    copied = 0
+    buf = bytearray(min(max(size, 1), 1024 * 1024))
+    view = memoryview(buf)
+    with open(src_fd, "rb", buffering=0, closefd=False) as fsrc:
+        while True:
+            n = fsrc.readinto(buf)
+            if not n:
+                return copied
+            pending = view[:n]
+            while pending:
+                pending = pending[os.write(dst_fd, pending):]
+            copied += n
+
+
+class TransferEngine:
+    """
+    Moves files to another filesystem with several copy workers.
+
+    Each file is copied into a hidden temporary name next to its target with
+    ``copy_file_range`` (or ``sendfile``, or a plain read/write loop when the
+    kernel offers neither), gets the source's metadata, and is renamed into
+    place. The source is only unlinked once its copy is complete and as
+    large as the source was when the copy started.
+
+    Fsync policies:
+        none: never fsync; fastest, a crash may lose recently moved files
+        file: fsync every copy, then each target folder once so the renames
+            are durable, before sources are unlinked
+        end: copy everything, sync the filesystems once, then unlink sources
+    """
+
+    def __init__(self, workers: int = 4, fsync: str = "file"):
+        """
+        Initialize the engine.
+
+        Args:
+            workers: Number of concurrent copy workers
+            fsync: One of FSYNC_POLICIES
+
+        Raises:
+            ValueError: If the fsync policy is unknown
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.workers = max(1, workers)
+        self.fsync = fsync
+
+    def move(
+        self,
+        jobs: Iterable[Tuple[str, str]],
+        on_file: Optional[Callable[[FileTransfer], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> TransferReport:
+        """
+        Move files, copying them across filesystems.
+
+        Args:
+            jobs: (source, target) path pairs
+            on_file: Called from a worker thread after each file finishes
+            cancel: Event that stops the move once set; files already being
+                copied are finished, the rest get the CANCELLED error
+
+        Returns:
+            TransferReport with one FileTransfer per job, in job order
+        """
+        jobs = list(jobs)
+        unlink_now = self.fsync == "none"
+        start = time.perf_counter()
+
+        def run(job: Tuple[str, str]) -> FileTransfer:
+            if cancel is not None and cancel.is_set():
+                return FileTransfer(job[0], job[1], error=CANCELLED)
+            result = self._copy(job[0], job[1], unlink_now)
+            if on_file is not None:
+                on_file(result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            files = list(pool.map(run, jobs))
+
+        if not unlink_now:
+            if self.fsync == "file":
+                self._sync_dirs(files)
+            elif hasattr(os, "sync"):
+                os.sync()
+            for result in files:
+                if result.error is None:
+                    try:
+                        os.unlink(result.source)
+                    except OSError as e:
+                        result.error = f"copied, but could not remove source: {e}"
+
+        return TransferReport(files=files, seconds=time.perf_counter() - start)
+
+    @staticmethod
+    def _sync_dirs(files: List[FileTransfer]) -> None:
+        """
+        Fsync every folder files were renamed into, once per folder.
+
+        A file whose folder cannot be synced keeps its source, since the
+        rename might not survive a crash.
+        """
+        by_dir: Dict[str, List[FileTransfer]] = {}
+        for result in files:
+            if result.error is None:
+                by_dir.setdefault(os.path.dirname(result.target), []).append(result)
+        for target_dir, group in by_dir.items():
+            try:
+                fd = os.open(target_dir, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                if e.errno in (errno.EINVAL, errno.EBADF, errno.EACCES):
+                    continue  # Folders cannot be synced on this platform/filesystem
+                for result in group:
+                    result.error = f"copied, but could not sync folder: {e}"
+
+    def _copy(self, source: str, target: str, unlink_source: bool) -> FileTransfer:
+        """Copy one file into place and optionally unlink its source."""
+        result = FileTransfer(source, target)
+        target_dir, name = os.path.split(target)
+        partial = os.path.join(target_dir, f".{name}.partial")
+        start = time.perf_counter()
+        try:
+            if os.path.islink(source):
+                # Move the link itself, like shutil.move does
+                os.symlink(os.readlink(source), partial)
+            else:
+                self._copy_file(source, partial, result)
+            os.replace(partial, target)
+        except OSError as e:
+            result.error = str(e)
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            return result
+        finally:
+            result.seconds = time.perf_counter() - start
+
+        if unlink_source:
+            try:
+                os.unlink(source)
+            except OSError as e:
+                result.error = f"copied, but could not remove source: {e}"
+        return result
+
+    def _copy_file(self, source: str, partial: str, result: FileTransfer) -> None:
+        """Copy data and metadata of a regular file to its temporary name."""
+        with open(source, "rb") as fsrc:
+            size = os.fstat(fsrc.fileno()).st_size
+            dst_fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                result.bytes = _copy_fd(fsrc.fileno(), dst_fd, size)
+                if result.bytes != size:
+                    # Never let a move unlink a source whose copy is incomplete
+                    raise OSError(
+                        errno.EIO, f"copied {result.bytes:,} of {size:,} bytes", source
+                    )
+                if self.fsync == "file":
+                    os.fsync(dst_fd)
+            finally:
+                os.close(dst_fd)
+        shutil.copystat(source, partial)
@@ -0,0 +1,260 @@
+"""Trigram index for substring search over file names."""
+
+import os
+import sys
+import json
+import struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from folder_organizer.scanner import FileEntry
+
+TRIGRAM_FORMAT_VERSION = 2
+
+# Start of every saved index, followed by the JSON header length
+_MAGIC = b"folder-organizer trigrams\n"
+_HEADER_LENGTH = struct.Struct("<Q")
+
+# Numeric arrays in the order save() writes them after the header
+_ARRAYS = ("file_dir", "sizes", "mtimes", "inodes")
+
+# Rows fed to build(): (directory path, name, size, mtime_ns, inode)
+_FileRow = Tuple[str, str, Optional[int], Optional[int], Optional[int]]
+
+
+def _itemsizes() -> List[int]:
+    """Sizes of the array types a saved index is written with on this machine."""
+    return [array(typecode).itemsize for typecode in "IqQ"]
+
+
+def trigrams(text: str) -> List[str]:
+    """Return the distinct three-character substrings of a string."""
+    return list({text[i:i + 3] for i in range(len(text) - 2)})
+
+
+def _intersect(candidates: array, postings: array) -> array:
+    """Intersect two sorted posting lists, galloping through the larger one."""
+    result = array("I")
+    lo = 0
+    end = len(postings)
+    for doc in candidates:
+        lo = bisect_left(postings, doc, lo, end)
+        if lo == end:
+            break
+        if postings[lo] == doc:
+            result.append(doc)
+    return result
+
+
+class TrigramIndex:
+    """
+    In-memory trigram index over the lower-cased names of a file tree.
+
+    Every file gets a number; each trigram of its lower-cased name maps to a
+    sorted posting list of those numbers. A query for a term of three or more
+    characters intersects the posting lists of the term's trigrams, smallest
+    first, and only the surviving candidates are checked with a real
+    substring test. Shorter terms fall back to checking every name, which is
+    still far cheaper than walking the tree.
+
+    The index is a snapshot of the MetadataIndex it was built from and is
+    identified by that index's version token, so a stale snapshot on disk is
+    detected and rebuilt.
+    """
+
+    def __init__(self, version: str = ""):
+        """
+        Create an empty index.
+
+        Args:
+            version: Version token of the metadata index this snapshot mirrors
+        """
+        self.version = version
+        self.dirs: List[str] = []
+        self.names: List[str] = []
+        self.lnames: List[str] = []
+        self.file_dir = array("I")
+        self.sizes = array("q")
+        self.mtimes = array("q")
+        self.inodes = array("Q")
+        self.postings: Dict[str, array] = {}
+
+    @classmethod
+    def build(cls, rows: Iterable[_FileRow], version: str = "") -> "TrigramIndex":
+        """
+        Build an index from file rows.
+
+        Args:
+            rows: (directory path, name, size, mtime_ns, inode) per file
+            version: Version token of the source metadata index
+
+        Returns:
+            The populated TrigramIndex
+        """
+        index = cls(version)
+        dir_ids: Dict[str, int] = {}
+        postings = index.postings
+        for doc, (dirpath, name, size, mtime_ns, inode) in enumerate(rows):
+            dir_id = dir_ids.get(dirpath)
+            if dir_id is None:
+                dir_id = dir_ids[dirpath] = len(index.dirs)
+                index.dirs.append(dirpath)
+            lname = name.lower()
+            index.names.append(name)
+            index.lnames.append(lname)
+            index.file_dir.append(dir_id)
+            index.sizes.append(size or 0)
+            index.mtimes.append(mtime_ns or 0)
+            index.inodes.append(inode or 0)
+            # Numbers are handed out in order, so every posting list stays sorted
+            for gram in trigrams(lname):
+                plist = postings.get(gram)
+                if plist is None:
+                    plist = postings[gram] = array("I")
+                plist.append(doc)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def candidates(self, term: str) -> Iterator[int]:
+        """
+        Yield the numbers of files whose name contains a term.
+
+        Args:
+            term: Lower-cased search term
+
+        Yields:
+            File numbers in index order
+        """
+        lnames = self.lnames
+        grams = trigrams(term)
+        if not grams:
+            return (doc for doc, lname in enumerate(lnames) if term in lname)
+
+        lists = []
+        for gram in grams:
+            plist = self.postings.get(gram)
+            if plist is None:
+                return iter(())
+            lists.append(plist)
+        lists.sort(key=len)
+        docs = lists[0]
+        for plist in lists[1:]:
+            if not docs:
+                break
+            docs = _intersect(docs, plist)
+        # Trigrams can all be present without forming the substring
+        return (doc for doc in docs if term in lnames[doc])
+
+    def search(self, term: str) -> Iterator[FileEntry]:
+        """
+        Yield the files whose name contains a term, case-insensitively.
+
+        Args:
+            term: Search term
+
+        Yields:
+            FileEntry records with the indexed size, mtime and inode
+        """
+        for doc in self.candidates(term.lower()):
+            name = self.names[doc]
+            yield FileEntry(
+                name,
+                os.path.join(self.dirs[self.file_dir[doc]], name),
+                self.sizes[doc],
+                self.mtimes[doc],
+                self.inodes[doc],
+            )
+
+    def save(self, path: Path) -> None:
+        """
+        Write the index to a file, replacing it atomically.
+
+        The file holds a JSON header with the strings and array lengths,
+        followed by the raw numeric arrays, so loading it never runs code.
+        """
+        grams = list(self.postings)
+        header = {
+            "format": TRIGRAM_FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "version": self.version,
+            "dirs": self.dirs,
+            "names": self.names,
+            "grams": grams,
+            "lengths": [len(self.postings[gram]) for gram in grams],
+            "itemsizes": _itemsizes(),
+        }
+        data = json.dumps(header).encode("ascii")
+        tmp = Path(f"{path}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(data)))
+            f.write(data)
+            for name in _ARRAYS:
+                getattr(self, name).tofile(f)
+            for gram in grams:
+                self.postings[gram].tofile(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["TrigramIndex"]:
+        """
+        Read an index written by save().
+
+        Returns:
+            The index, or None if the file is missing, corrupted, outdated or
+            written on a machine with other array sizes
+        """
+        try:
+            return cls._read(path)
+        except Exception:
+            # Whatever is wrong with the file, rebuilding fixes it
+            return None
+
+    @classmethod
+    def _read(cls, path: Path) -> Optional["TrigramIndex"]:
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return None
+            (size,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+            header = json.loads(f.read(size).decode("ascii"))
+            if (header["format"], header["byteorder"], header["itemsizes"]) != (
+                TRIGRAM_FORMAT_VERSION, sys.byteorder, _itemsizes()
+            ):
+                return None
+            data = memoryview(f.read())
+
+        index = cls(header["version"])
+        index.dirs = header["dirs"]
+        index.names = header["names"]
+        index.lnames = [name.lower() for name in index.names]
+        count = len(index.names)
+        offset = 0
+
+        def take(typecode: str, length: int) -> array:
+            nonlocal offset
+            values = array(typecode)
+            end = offset + length * values.itemsize
+            if end > len(data):
+                raise ValueError("truncated trigram index")
+            values.frombytes(data[offset:end])
+            offset = end
+            return values
+
+        for name in _ARRAYS:
+            setattr(index, name, take(getattr(index, name).typecode, count))
+        index.postings = {
+            gram: take("I", length) for gram, length in zip(header["grams"], header["lengths"])
+        }
+        # Out-of-range numbers would make searches fail instead of rebuilding;
+        # posting lists are sorted, so their last number is the largest
+        if (
+            offset != len(data)
+            or max(index.file_dir, default=-1) >= len(index.dirs)
+            or any(plist and plist[-1] >= count for plist in index.postings.values())
+        ):
+            raise ValueError("corrupted trigram index")
+        return index
@@ -0,0 +1,507 @@
+"""Disk usage analysis: recursive directory totals and the largest entries."""
+
+import os
+import time
+import queue
+import heapq
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+from folder_organizer.scanner import ExcludeFn, default_workers
+
+
+class UsageEntry(NamedTuple):
+    """Size of a file, or recursive size of a directory."""
+    path: str
+    apparent: int
+    allocated: int
+    files: int = 1
+
+
+@dataclass
+class UsageReport:
+    """Totals of a tree plus its largest files and directories."""
+    root: str
+    apparent: int = 0
+    allocated: int = 0
+    files: int = 0
+    dirs: int = 0
+    hardlinks: int = 0
+    top_files: List[UsageEntry] = field(default_factory=list)
+    top_dirs: List[UsageEntry] = field(default_factory=list)
+    children: List[UsageEntry] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+class _Frame:
+    """A directory on the walk stack: its totals so far and the subdirectories left."""
+
+    __slots__ = ("path", "subdirs", "apparent", "allocated", "files")
+
+    def __init__(self, path: str, apparent: int = 0, allocated: int = 0):
+        self.path = path
+        self.subdirs: List[Tuple[str, int, int]] = []
+        self.apparent = apparent
+        self.allocated = allocated
+        self.files = 0
+
+    def add(self, other: "_Frame") -> None:
+        self.apparent += other.apparent
+        self.allocated += other.allocated
+        self.files += other.files
+
+    def entry(self) -> UsageEntry:
+        return UsageEntry(self.path, self.apparent, self.allocated, self.files)
+
+
+class _Top:
+    """Bounded min-heap keeping the n largest entries."""
+
+    def __init__(self, n: int, apparent: bool):
+        self.n = n
+        self.index = 1 if apparent else 2
+        self.heap: List[Tuple[int, str, UsageEntry]] = []
+
+    def offer(self, entry: UsageEntry) -> None:
+        if self.n <= 0:
+            return
+        item = (entry[self.index], entry.path, entry)
+        if len(self.heap) < self.n:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+
+    def merge(self, other: "_Top") -> None:
+        for _, _, entry in other.heap:
+            self.offer(entry)
+
+    def ranked(self) -> List[UsageEntry]:
+        return [entry for _, _, entry in sorted(self.heap, reverse=True)]
+
+
+class _Subtree:
+    """Results of walking one subtree on a worker thread."""
+
+    def __init__(self, top: int, apparent: bool):
+        self.top_files = _Top(top, apparent)
+        self.top_dirs = _Top(top, apparent)
+        self.dirs = 0
+        self.hardlinks = 0
+        self.errors: List[str] = []
+
+
+def _allocated(st: os.stat_result) -> int:
+    """Bytes actually allocated on disk (apparent size where st_blocks is unknown)."""
+    blocks = getattr(st, "st_blocks", None)
+    return st.st_size if blocks is None else blocks * 512
+
+
+def tree_size(path: str) -> UsageEntry:
+    """
+    Total the size of everything below a directory, single-threaded.
+
+    Meant for many small subtrees measured side by side (e.g. on a thread
+    pool); use DiskUsage for one large tree. Symlinks are not followed and
+    unreadable directories are skipped.
+
+    Args:
+        path: Directory to measure
+
+    Returns:
+        UsageEntry with the apparent and allocated bytes and the file count,
+        the directory's own entries included
+    """
+    apparent = allocated = files = 0
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        files += 1
+                except OSError:
+                    continue
+                apparent += st.st_size
+                allocated += _allocated(st)
+    return UsageEntry(path, apparent, allocated, files)
+
+
+class DiskUsage:
+    """
+    du-style analyzer computing recursive directory sizes in one pass.
+
+    Each directory is listed once and closed before its subdirectories are
+    visited; the walk keeps only the path from the root to the current
+    directory (with the subdirectories each level still has to visit), and
+    a directory's total is folded into its parent as soon as its subtree is
+    done. The largest files and directories are kept in bounded heaps, so
+    memory grows with ``top`` and the tree depth rather than with the number
+    of files. The subtrees below the root are walked on a thread pool.
+
+    Both the apparent size (st_size) and the allocated size (st_blocks) are
+    reported, directories' own entries included, like du. A file with several
+    hard links is counted once, at the first path it is found under; only
+    such files are remembered. Symlinks are not followed.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        top: int = 20,
+        apparent: bool = False,
+        exclude: Optional[ExcludeFn] = None,
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            workers: Threads walking subtrees (auto by default)
+            top: Number of largest files and directories to keep
+            apparent: Rank by apparent size instead of allocated size
+            exclude: Entries to leave out, see ParallelWalker
+        """
+        self.workers = max(1, workers or default_workers())
+        self.top = top
+        self.apparent = apparent
+        self.exclude = exclude
+        self._links: Set[Tuple[int, int]] = set()
+        self._links_lock = threading.Lock()
+
+    def analyze(self, root: Union[str, os.PathLike]) -> UsageReport:
+        """
+        Measure the tree under root.
+
+        Args:
+            root: Directory to analyze
+
+        Returns:
+            UsageReport with the totals, the largest entries and the totals
+            of root's immediate subdirectories (largest first)
+        """
+        start = time.perf_counter()
+        root = os.fspath(root)
+        self._links = set()
+        report = UsageReport(root)
+        top_files = _Top(self.top, self.apparent)
+        top_dirs = _Top(self.top, self.apparent)
+
+        main = _Subtree(self.top, self.apparent)
+        try:
+            st = os.lstat(root)
+            frame = self._enter(_Frame(root, st.st_size, _allocated(st)), main)
+        except OSError as e:
+            report.errors.append(f"{root}: {e.strerror or e}")
+            frame = _Frame(root)
+
+        children = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self._walk, subdir) for subdir in frame.subdirs]
+            frame.subdirs = []
+            for future in as_completed(futures):
+                child, subtree = future.result()
+                frame.add(child)
+                children.append(child.entry())
+                self._fold(report, subtree, top_files, top_dirs)
+        self._fold(report, main, top_files, top_dirs)
+
+        report.apparent, report.allocated, report.files = (
+            frame.apparent, frame.allocated, frame.files
+        )
+        report.top_files = top_files.ranked()
+        report.top_dirs = top_dirs.ranked()
+        key = 1 if self.apparent else 2
+        report.children = sorted(children, key=lambda entry: entry[key], reverse=True)
+        report.seconds = time.perf_counter() - start
+        self._links = set()
+        return report
+
+    @staticmethod
+    def _fold(report: UsageReport, subtree: _Subtree, top_files: _Top, top_dirs: _Top) -> None:
+        """Add the results of one subtree to the report."""
+        top_files.merge(subtree.top_files)
+        top_dirs.merge(subtree.top_dirs)
+        report.dirs += subtree.dirs
+        report.hardlinks += subtree.hardlinks
+        report.errors.extend(subtree.errors)
+
+    def _walk(self, subdir: Tuple[str, int, int]) -> Tuple[_Frame, _Subtree]:
+        """Walk one subtree depth-first, folding totals bottom-up."""
+        result = _Subtree(self.top, self.apparent)
+        path, apparent, allocated = subdir
+        stack = [self._enter(_Frame(path, apparent, allocated), result)]
+        while True:
+            frame = stack[-1]
+            if frame.subdirs:
+                path, apparent, allocated = frame.subdirs.pop()
+                stack.append(self._enter(_Frame(path, apparent, allocated), result))
+                continue
+            stack.pop()
+            result.top_dirs.offer(frame.entry())
+            if not stack:
+                return frame, result
+            stack[-1].add(frame)
+
+    def _enter(self, frame: _Frame, result: _Subtree) -> _Frame:
+        """List a directory: add its files to the frame and queue its subdirectories."""
+        exclude = self.exclude
+        result.dirs += 1
+        try:
+            it = os.scandir(frame.path)
+        except OSError as e:
+            result.errors.append(f"{frame.path}: {e.strerror or e}")
+            return frame
+
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if exclude is not None and exclude(entry, is_dir):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    frame.subdirs.append((entry.path, st.st_size, _allocated(st)))
+                    continue
+                if st.st_nlink > 1:
+                    key = (st.st_dev, st.st_ino)
+                    with self._links_lock:
+                        seen = key in self._links
+                        self._links.add(key)
+                    if seen:
+                        result.hardlinks += 1
+                        continue
+                size = st.st_size
+                allocated = _allocated(st)
+                frame.apparent += size
+                frame.allocated += allocated
+                frame.files += 1
+                result.top_files.offer(UsageEntry(entry.path, size, allocated))
+        return frame
+
+
+# Largest direct files remembered per directory by UsageTree; the others
+# only count towards the totals
+FILES_PER_DIR = 50
+
+
+class UsageRow(NamedTuple):
+    """One line of a directory listing in a UsageTree snapshot."""
+    name: str
+    apparent: int
+    allocated: int
+    files: int
+    is_dir: bool
+    complete: bool = True
+
+
+class UsageNode:
+    """A directory of a UsageTree with the totals scanned below it so far."""
+
+    __slots__ = (
+        "name", "path", "parent", "children", "largest", "direct",
+        "apparent", "allocated", "files", "pending",
+    )
+
+    def __init__(self, name: str, path: str, parent: Optional["UsageNode"] = None):
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.children: Dict[str, UsageNode] = {}
+        self.largest: List[UsageEntry] = []
+        self.direct = (0, 0, 0)
+        self.apparent = 0
+        self.allocated = 0
+        self.files = 0
+        self.pending = 1
+
+    @property
+    def complete(self) -> bool:
+        """Whether every directory below this one has been listed."""
+        return self.pending == 0
+
+
+class UsageTree:
+    """
+    Directory tree whose recursive sizes fill in while it is being scanned.
+
+    Unlike DiskUsage, which only reports a directory once its whole subtree
+    is done, every listed directory immediately adds its files to its own
+    totals and to those of all its ancestors, so the sizes near the root are
+    meaningful long before a large scan finishes. The tree keeps one node per
+    directory (but only the FILES_PER_DIR largest files of each), so browsing
+    into a subdirectory reuses what was already scanned. Directories are
+    listed by a pool of threads; every update takes the tree's lock, which
+    readers such as snapshot() take too.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, os.PathLike],
+        workers: Optional[int] = None,
+        exclude: Optional[ExcludeFn] = None,
+    ):
+        """
+        Create an unscanned tree.
+
+        Args:
+            root: Directory to scan
+            workers: Threads listing directories (auto by default)
+            exclude: Entries to leave out, see ParallelWalker
+        """
+        path = os.fspath(root)
+        self.root = UsageNode(os.path.basename(path) or path, path)
+        self.workers = max(1, workers or default_workers())
+        self.exclude = exclude
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.hardlinks = 0
+        self.errors: List[str] = []
+        self._links: Set[Tuple[int, int]] = set()
+        self._cancelled = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """Whether the whole tree has been scanned."""
+        return self.root.complete
+
+    def cancel(self) -> None:
+        """Stop a running scan; directories not listed yet stay incomplete."""
+        self._cancelled.set()
+
+    def scan(self) -> None:
+        """Scan the tree, blocking until it is complete or cancelled."""
+        try:
+            st = os.lstat(self.root.path)
+            with self.lock:
+                self.root.apparent, self.root.allocated = st.st_size, _allocated(st)
+        except OSError:
+            pass
+
+        todo: "queue.Queue[Optional[UsageNode]]" = queue.Queue()
+        todo.put(self.root)
+
+        def work() -> None:
+            while True:
+                node = todo.get()
+                try:
+                    if node is None:
+                        return
+                    if not self._cancelled.is_set():
+                        for child in self._list(node):
+                            todo.put(child)
+                finally:
+                    todo.task_done()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(work) for _ in range(self.workers)]
+            todo.join()
+            for _ in futures:
+                todo.put(None)
+            for future in futures:
+                future.result()
+
+    def _list(self, node: UsageNode) -> List[UsageNode]:
+        """List one directory and fold its entries into the tree."""
+        exclude = self.exclude
+        subdirs = []
+        largest = _Top(FILES_PER_DIR, apparent=False)
+        apparent = allocated = files = 0
+        try:
+            with os.scandir(node.path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if exclude is not None and exclude(entry, is_dir):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        subdirs.append((entry.name, entry.path, st.st_size, _allocated(st)))
+                        continue
+                    if st.st_nlink > 1:
+                        key = (st.st_dev, st.st_ino)
+                        with self.lock:
+                            seen = key in self._links
+                            self._links.add(key)
+                            if seen:
+                                self.hardlinks += 1
+                        if seen:
+                            continue
+                    size = _allocated(st)
+                    apparent += st.st_size
+                    allocated += size
+                    files += 1
+                    # Kept by name, relative to the node
+                    largest.offer(UsageEntry(entry.name, st.st_size, size))
+        except OSError as e:
+            with self.lock:
+                self.errors.append(f"{node.path}: {e.strerror or e}")
+
+        with self.lock:
+            node.largest = largest.ranked()
+            node.direct = (apparent, allocated, files)
+            children = []
+            for name, path, dir_apparent, dir_allocated in subdirs:
+                child = UsageNode(name, path, node)
+                child.apparent, child.allocated = dir_apparent, dir_allocated
+                node.children[name] = child
+                children.append(child)
+                apparent += dir_apparent
+                allocated += dir_allocated
+            pending = len(children) - 1
+            ancestor: Optional[UsageNode] = node
+            while ancestor is not None:
+                ancestor.apparent += apparent
+                ancestor.allocated += allocated
+                ancestor.files += files
+                ancestor.pending += pending
+                ancestor = ancestor.parent
+            self.generation += 1
+        return children
+
+    def snapshot(self, node: UsageNode, apparent: bool = False) -> List[UsageRow]:
+        """
+        List a directory's current contents, largest first.
+
+        Subdirectories carry their recursive totals so far. Direct files
+        beyond the FILES_PER_DIR largest are folded into one row named "".
+
+        Args:
+            node: Directory to list
+            apparent: Rank by apparent size instead of allocated size
+
+        Returns:
+            Rows for the subdirectories and files of node
+        """
+        with self.lock:
+            rows = [
+                UsageRow(child.name, child.apparent, child.allocated, child.files, True,
+                         child.complete)
+                for child in node.children.values()
+            ]
+            rows.extend(
+                UsageRow(entry.path, entry.apparent, entry.allocated, 1, False)
+                for entry in node.largest
+            )
+            rest = (
+                node.direct[0] - sum(entry.apparent for entry in node.largest),
+                node.direct[1] - sum(entry.allocated for entry in node.largest),
+                node.direct[2] - len(node.largest),
+            )
+        if rest[2] > 0:
+            rows.append(UsageRow("", rest[0], rest[1], rest[2], False))
+        key = 1 if apparent else 2
+        rows.sort(key=lambda row: (row[key], row.name), reverse=True)
+        return rows
@@ -0,0 +1,140 @@
+"""Progress panel for long-running file operations."""
+
+from typing import Optional
+
+from textual import work
+from textual.app import ComposeResult
+from textual.containers import Horizontal, Vertical
+from textual.message import Message
+from textual.widgets import Button, ProgressBar, Static
+
+from folder_organizer.organizer import FolderOrganizer, OperationResult
+from folder_organizer.plan import OperationPlan
+from folder_organizer.progress import CancelToken, Progress
+
+# Seconds between redraws; the worker only records the latest snapshot
+UPDATE_INTERVAL = 0.2
+
+
+class OperationProgress(Vertical):
+    """
+    Runs a plan in a thread worker and shows how far it got.
+
+    The worker stores the latest Progress snapshot and a timer draws it, so
+    the UI is refreshed at a fixed rate however many files per second the
+    operation gets through. The Cancel button stops the plan between two
+    files. A Finished message is posted when the plan is done, and the panel
+    hides itself again.
+    """
+
+    class Finished(Message):
+        """Posted when the operation ends, completed or cancelled."""
+
+        def __init__(self, result: OperationResult):
+            super().__init__()
+            self.result = result
+
+    def __init__(self, id: Optional[str] = None):
+        super().__init__(id=id)
+        self.cancel_token: Optional[CancelToken] = None
+        self._latest: Optional[Progress] = None
+        self._shown: Optional[Progress] = None
+        self._label = ""
+        self._by_bytes = False
+
+    @property
+    def running(self) -> bool:
+        """Whether an operation is in progress."""
+        return self.cancel_token is not None
+
+    def compose(self) -> ComposeResult:
+        """Create child widgets."""
+        with Horizontal(classes="progress-row"):
+            yield ProgressBar(show_eta=True, classes="progress-bar")
+            yield Button("■ Cancel", classes="progress-cancel", variant="warning")
+        yield Static("", classes="progress-stats")
+
+    def on_mount(self) -> None:
+        """Start the redraw timer."""
+        self.display = False
+        self.set_interval(UPDATE_INTERVAL, self.refresh_progress)
+
+    def on_unmount(self) -> None:
+        """Stop the operation if the screen goes away."""
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+
+    def start(self, organizer: FolderOrganizer, plan: OperationPlan, label: str) -> None:
+        """
+        Execute a plan in the background.
+
+        Args:
+            organizer: Organizer to execute the plan with
+            plan: Plan to execute
+            label: What is being done, e.g. "Moving"
+        """
+        if self.running:
+            return
+        self.cancel_token = CancelToken()
+        self._latest = self._shown = None
+        self._label = label
+        bar = self.query_one(ProgressBar)
+        bar.update(total=plan.total_bytes or len(plan.entries) or None, progress=0)
+        self._by_bytes = plan.total_bytes > 0
+        button = self.query_one(".progress-cancel", Button)
+        button.disabled = False
+        button.label = "■ Cancel"
+        self.query_one(".progress-stats", Static).update(
+            f"{label} {len(plan.entries):,} file(s)..."
+        )
+        self.display = True
+        self.execute(organizer, plan, self.cancel_token)
+
+    @work(thread=True, exclusive=True, group="operation")
+    def execute(self, organizer: FolderOrganizer, plan: OperationPlan, cancel: CancelToken) -> None:
+        """Run the plan in a worker thread."""
+        def record(progress: Progress) -> None:
+            self._latest = progress
+
+        try:
+            result = organizer.execute_plan(plan, record, cancel)
+        except Exception as e:
+            result = OperationResult(
+                success=False,
+                files_affected=0,
+                files_list=[],
+                errors=[str(e)],
+                message=f"Error: {e}"
+            )
+        self.post_message(self.Finished(result))
+
+    def refresh_progress(self) -> None:
+        """Draw the latest snapshot if there is a new one."""
+        progress = self._latest
+        if progress is None or progress is self._shown:
+            return
+        self._shown = progress
+
+        fmt = FolderOrganizer._format_size
+        self.query_one(ProgressBar).update(
+            progress=progress.bytes_done if self._by_bytes else progress.files_done
+        )
+        self.query_one(".progress-stats", Static).update(
+            f"{self._label} [b]{progress.files_done:,}[/b] of {progress.files_total:,} files"
+            f" ({fmt(progress.bytes_done)} of {fmt(progress.bytes_total)})   "
+            f"[green]{progress.files_per_second:,.0f} files/s, "
+            f"{fmt(progress.bytes_per_second)}/s[/green]"
+        )
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Cancel the operation."""
+        event.stop()
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+            event.button.disabled = True
+            event.button.label = "Cancelling..."
+
+    def on_operation_progress_finished(self, event: "OperationProgress.Finished") -> None:
+        """Hide the panel, then let the message bubble to the screen."""
+        self.cancel_token = None
+        self.display = False
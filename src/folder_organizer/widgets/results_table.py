@@ -0,0 +1,197 @@
+"""Paged, sortable table of files for large result sets."""
+
+import os
+import time
+from typing import List, Optional, Sequence, Tuple, Union
+
+from rich.text import Text
+
+from textual import work
+from textual.widgets import DataTable
+from textual.worker import get_current_worker
+
+from folder_organizer.organizer import FolderOrganizer
+from folder_organizer.scanner import FileEntry, stat_entry
+from folder_organizer.search import SORT_KEYS
+
+# Rows added to the table at a time
+PAGE_SIZE = 200
+
+# Load the next page once the viewport is this many rows from the end
+LOAD_AHEAD = 50
+
+# (file, highlighted name or None, text of the extra column)
+Row = Tuple[FileEntry, Optional[Text], str]
+
+
+class ResultsTable(DataTable):
+    """
+    Table of files that only builds the rows being looked at.
+
+    The full result set is kept as compact FileEntry tuples; rows are
+    formatted and added a page at a time as the user scrolls towards the
+    end, and files scanned without stat are stat'ed a page at a time too.
+    Sorting by size or date needs every file stat'ed, so it runs in a
+    worker thread and the table is refilled when it is done. Click a column
+    header, or press n, s or m, to sort; sorting the same column again
+    reverses the order.
+    """
+
+    BINDINGS = [
+        ("n", "sort('name')", "Sort name"),
+        ("s", "sort('size')", "Sort size"),
+        ("m", "sort('mtime')", "Sort date"),
+    ]
+
+    def __init__(
+        self,
+        root: Union[str, os.PathLike],
+        extra_column: Optional[str] = None,
+        id: Optional[str] = None,
+    ):
+        """
+        Initialize the table.
+
+        Args:
+            root: Folder the files are shown relative to
+            extra_column: Title of an optional column shown after the name
+            id: Widget id
+        """
+        super().__init__(id=id, cursor_type="row", zebra_stripes=True)
+        self.root = os.fspath(root)
+        self.extra_column = extra_column
+        self.rows_total = 0
+        self.sort_by: Optional[str] = None
+        self.reverse = False
+        self._rows: List[Row] = []
+        self._loaded = 0
+        self._generation = 0
+        self._refilling = False
+
+    def on_mount(self) -> None:
+        """Add the columns."""
+        self.add_column("Name", key="name")
+        if self.extra_column:
+            self.add_column(self.extra_column, key="extra")
+        self.add_column("Size", key="size")
+        self.add_column("Modified", key="mtime")
+        self.add_column("Folder", key="folder")
+
+    def show(
+        self,
+        entries: Sequence[FileEntry],
+        labels: Optional[Sequence[Text]] = None,
+        extra: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Replace the contents of the table.
+
+        Args:
+            entries: Files to list, in display order
+            labels: Highlighted names to show instead of the file names
+            extra: Text of the extra column for each file
+        """
+        self._rows = [
+            (entry, labels[i] if labels else None, extra[i] if extra else "")
+            for i, entry in enumerate(entries)
+        ]
+        self.sort_by, self.reverse = None, False
+        self._refill()
+
+    def _refill(self) -> None:
+        """Drop the built rows and build the first page again."""
+        self._generation += 1
+        self.rows_total = len(self._rows)
+        self._loaded = 0
+        # Clearing moves the cursor and scroll position; do not load for those
+        self._refilling = True
+        try:
+            self.clear()
+            self.scroll_to(y=0, animate=False)
+        finally:
+            self._refilling = False
+        self.load_more()
+
+    def load_more(self) -> None:
+        """Build the next page of rows."""
+        if self._loaded >= len(self._rows):
+            return
+        start, end = self._loaded, min(self._loaded + PAGE_SIZE, len(self._rows))
+        # Set first: adding rows moves the cursor, which calls back in here
+        self._loaded = end
+        fmt = FolderOrganizer._format_size
+        for i in range(start, end):
+            entry, label, extra = self._rows[i]
+            if not entry.inode:
+                entry = stat_entry(entry)
+                self._rows[i] = (entry, label, extra)
+            folder = os.path.relpath(os.path.dirname(entry.path), self.root)
+            cells = [label if label is not None else Text(entry.name)]
+            if self.extra_column:
+                cells.append(Text(extra, style="cyan"))
+            cells += [
+                Text(fmt(entry.size), justify="right"),
+                Text(time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.mtime_ns / 1e9)),
+                     style="dim"),
+                Text("" if folder == "." else folder, style="dim"),
+            ]
+            self.add_row(*cells, key=str(i))
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        """Load more rows as the viewport nears the last built row."""
+        super().watch_scroll_y(old_value, new_value)
+        self._load_if_near_end()
+
+    def watch_cursor_coordinate(self, old_coordinate, new_coordinate) -> None:
+        super().watch_cursor_coordinate(old_coordinate, new_coordinate)
+        self._load_if_near_end()
+
+    def _load_if_near_end(self) -> None:
+        if self._refilling or self._loaded >= len(self._rows):
+            return
+        bottom = max(self.scroll_y + self.scrollable_content_region.height, self.cursor_row)
+        if bottom >= self._loaded - LOAD_AHEAD:
+            self.load_more()
+
+    def entry_at(self, row_key: str) -> FileEntry:
+        """Return the file of a row, by its row key."""
+        return self._rows[int(row_key)][0]
+
+    def on_data_table_header_selected(self, event: DataTable.HeaderSelected) -> None:
+        """Sort by the clicked column."""
+        event.stop()
+        if event.column_key.value in SORT_KEYS:
+            self.action_sort(event.column_key.value)
+
+    def action_sort(self, key: str) -> None:
+        """Sort by a column; sorting by the same column again reverses."""
+        if key == self.sort_by:
+            self.reverse = not self.reverse
+        else:
+            # Largest and newest first, names A to Z
+            self.sort_by, self.reverse = key, key != "name"
+        self.loading = True
+        self.sort_rows(self._rows, self._generation, key, self.reverse)
+
+    @work(thread=True, exclusive=True, group="results-sort")
+    def sort_rows(self, rows: List[Row], generation: int, key: str, reverse: bool) -> None:
+        """Stat what is needed and sort in a worker thread."""
+        worker = get_current_worker()
+        if key in ("size", "mtime"):
+            stated = []
+            for entry, label, extra in rows:
+                if worker.is_cancelled:
+                    return
+                stated.append((stat_entry(entry), label, extra))
+            rows = stated
+        by = SORT_KEYS[key]
+        rows = sorted(rows, key=lambda row: by(row[0]), reverse=reverse)
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self._sorted, rows, generation)
+
+    def _sorted(self, rows: List[Row], generation: int) -> None:
+        self.loading = False
+        if generation != self._generation:
+            return  # The contents were replaced while sorting
+        self._rows = rows
+        self._refill()
@@ -0,0 +1,115 @@
+"""Tests for finding and pruning build artifact directories."""
+
+import os
+
+import pytest
+
+from folder_organizer.artifacts import Artifact, delete_artifacts
+from folder_organizer.organizer import FolderOrganizer
+
+
+@pytest.fixture
+def projects(tmp_path):
+    root = tmp_path / "projects"
+    files = [
+        "web/package.json",
+        "web/node_modules/lib/index.js",
+        "web/node_modules/lib/node_modules/dep/index.js",
+        "tool/main.py",
+        "tool/__pycache__/main.cpython-311.pyc",
+        "tool/.venv/pyvenv.cfg",
+        "tool/.venv/lib/site.py",
+        "crate/Cargo.toml",
+        "crate/target/debug/app",
+        "notes/target/todo.txt",
+        "notes/venv/readme.txt",
+        "loose/node_modules/x.js",
+    ]
+    for name in files:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * 100)
+    return root
+
+
+def relative(root, artifacts):
+    return sorted(os.path.relpath(a.path, root) for a in artifacts)
+
+
+def test_find_artifacts_checks_markers(projects):
+    organizer = FolderOrganizer(str(projects))
+
+    artifacts = organizer.find_artifacts()
+
+    assert relative(projects, artifacts) == [
+        "crate/target", "tool/.venv", "tool/__pycache__", "web/node_modules",
+    ]
+    node = next(a for a in artifacts if a.kind == "node")
+    assert node.files == 2
+    assert node.apparent >= 200
+
+
+def test_find_artifacts_by_kind(projects):
+    organizer = FolderOrganizer(str(projects))
+
+    artifacts = organizer.find_artifacts(["python"])
+
+    assert relative(projects, artifacts) == ["tool/__pycache__"]
+
+
+def test_find_artifacts_skips_symlinks(projects):
+    (projects / "tool" / "node_modules").symlink_to(projects / "web" / "node_modules")
+    (projects / "tool" / "package.json").write_text("{}")
+    organizer = FolderOrganizer(str(projects))
+
+    artifacts = organizer.find_artifacts(["node"])
+
+    assert relative(projects, artifacts) == ["web/node_modules"]
+
+
+def test_prune_artifacts(projects):
+    organizer = FolderOrganizer(str(projects))
+    artifacts = organizer.find_artifacts()
+    removed = []
+
+    preview = organizer.prune_artifacts(artifacts, dry_run=True)
+    result = organizer.prune_artifacts(artifacts, progress=lambda path, n: removed.append(n))
+
+    assert preview.files_affected == 4
+    assert not any(os.path.exists(a.path) for a in artifacts)
+    assert result.success
+    assert sorted(result.files_list) == relative(projects, artifacts)
+    assert sum(removed) == sum(a.files for a in artifacts)
+    assert (projects / "web" / "package.json").exists()
+    assert (projects / "notes" / "target" / "todo.txt").exists()
+
+
+def test_prune_refuses_paths_outside_the_folder(tmp_path, projects):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    organizer = FolderOrganizer(str(projects / "web"))
+    artifacts = [
+        Artifact(str(outside), "node"),
+        Artifact(str(projects / "web"), "node"),
+        Artifact(str(projects / "web" / ".." / "tool" / "__pycache__"), "python"),
+    ]
+
+    result = organizer.prune_artifacts(artifacts)
+
+    assert not result.success
+    assert result.files_affected == 0
+    assert len(result.errors) == 3
+    assert outside.exists()
+    assert (projects / "tool" / "__pycache__").exists()
+
+
+def test_delete_artifacts_reports_vanished_directories(tmp_path):
+    (tmp_path / "real").mkdir()
+    (tmp_path / "link").symlink_to(tmp_path / "real")
+
+    done, errors = delete_artifacts([Artifact(str(tmp_path / "link"), "node"),
+                                     Artifact(str(tmp_path / "missing"), "node")])
+
+    assert done == []
+    assert len(errors) == 2
+    assert (tmp_path / "real").exists()
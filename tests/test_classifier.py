@@ -0,0 +1,91 @@
+"""Tests for file name classification."""
+
+import pytest
+
+from folder_organizer.classifier import GLOB, REGEX, SUFFIX, Classifier, Rule, parse_rule
+
+BUILTIN = {
+    "IMAGES": [".jpg", ".png"],
+    "ARCHIVES": [".gz", ".tar", ".tar.gz"],
+    "PDFs": [".pdf"],
+}
+
+
+@pytest.mark.parametrize("spec, expected", [
+    (".PDF", Rule("X", SUFFIX, ".pdf", 1)),
+    ("pdf", Rule("X", SUFFIX, ".pdf", 1)),
+    ("IMG_*.jpg", Rule("X", GLOB, "img_*.jpg", 1)),
+    ("glob:Notes", Rule("X", GLOB, "notes", 1)),
+    ("re:^inv-\\d+", Rule("X", REGEX, "^inv-\\d+", 1)),
+])
+def test_parse_rule(spec, expected):
+    assert parse_rule(spec, "X", 1) == expected
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("photo.JPG", "IMAGES"),
+    ("backup.tar.gz", "ARCHIVES"),
+    ("data.gz", "ARCHIVES"),
+    ("report.pdf", "PDFs"),
+    ("README", None),
+    (".png", None),
+    ("trailing.", None),
+])
+def test_builtin_suffixes(name, expected):
+    assert Classifier.from_mappings(BUILTIN).classify(name) == expected
+
+
+def test_longest_suffix_wins():
+    classifier = Classifier.from_mappings({"GZ": [".gz"], "TARBALLS": [".tar.gz"]})
+
+    assert classifier.classify("a.tar.gz") == "TARBALLS"
+    assert classifier.classify("a.gz") == "GZ"
+
+
+def test_custom_categories_take_precedence():
+    custom = {"SCANS": ["scan_*.pdf"], "INVOICES": ["re:^inv-\\d+"]}
+    classifier = Classifier.from_mappings(BUILTIN, custom)
+
+    assert classifier.classify("scan_001.pdf") == "SCANS"
+    assert classifier.classify("INV-42.pdf") == "INVOICES"
+    assert classifier.classify("other.pdf") == "PDFs"
+
+
+def test_custom_priority_can_lose_to_builtin():
+    custom = {"FALLBACK": {"patterns": ["*.p*"], "priority": -1}}
+    classifier = Classifier.from_mappings(BUILTIN, custom)
+
+    assert classifier.classify("a.pdf") == "PDFs"
+    assert classifier.classify("a.png") == "IMAGES"
+    assert classifier.classify("a.pptx") == "FALLBACK"
+
+
+def test_regex_beats_glob_at_equal_priority():
+    classifier = Classifier([
+        Rule("GLOB", GLOB, "a*"),
+        Rule("REGEX", REGEX, "^a"),
+    ])
+
+    assert classifier.classify("abc") == "REGEX"
+
+
+def test_backreferences_fall_back_to_separate_patterns():
+    classifier = Classifier([
+        Rule("TWICE", REGEX, r"(\w)\1"),
+        Rule("FLAGS", REGEX, r"(?i)^x"),
+    ])
+
+    assert classifier._combined is None
+    assert classifier.classify("aab") == "TWICE"
+    assert classifier.classify("xyz") == "FLAGS"
+    assert classifier.classify("abc") is None
+
+
+def test_categories_and_key():
+    first = Classifier.from_mappings(BUILTIN)
+    same = Classifier.from_mappings(BUILTIN)
+    other = Classifier.from_mappings(BUILTIN, {"X": [".x"]})
+
+    assert first.categories() == ["IMAGES", "ARCHIVES", "PDFs"]
+    assert first.key == same.key
+    assert first.key != other.key
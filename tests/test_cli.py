@@ -0,0 +1,69 @@
+"""Tests for the command-line interface."""
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from folder_organizer import cli
+from folder_organizer.organizer import FolderOrganizer
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Record the organizers the commands create."""
+    organizers = []
+    from_config = FolderOrganizer.from_config.__func__
+
+    def record(cls, path, config, **overrides):
+        organizer = from_config(cls, path, config, **overrides)
+        organizers.append(organizer)
+        return organizer
+
+    monkeypatch.setattr(FolderOrganizer, "from_config", classmethod(record))
+    return organizers
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for name in ("report.pdf", "notes.txt"):
+        (tmp_path / name).write_text(name)
+    return tmp_path
+
+
+@pytest.mark.parametrize("command", [
+    ["find", "report", "{folder}"],
+    ["duplicates", "{folder}"],
+    ["usage", "{folder}"],
+    ["prune", "{folder}", "--dry-run"],
+    ["delete", "{folder}", "pdf", "--dry-run"],
+])
+def test_group_options_reach_subcommands(folder, created, command):
+    args = [arg.format(folder=folder) for arg in command]
+
+    result = CliRunner().invoke(cli.cli, ["--workers", "3", "--index", *args])
+
+    assert result.exit_code == 0, result.output
+    assert [(o.workers, o.use_index) for o in created] == [(3, True)]
+
+
+def test_subcommands_default_to_config(folder, created):
+    result = CliRunner().invoke(cli.cli, ["find", "report", str(folder)])
+
+    assert result.exit_code == 0, result.output
+    assert [(o.workers, o.use_index) for o in created] == [(None, False)]
+
+
+def test_find_lists_matches(folder):
+    result = CliRunner().invoke(cli.cli, ["find", "rpt", str(folder)])
+
+    assert result.exit_code == 0, result.output
+    assert "report.pdf" in result.output
+    assert "notes.txt" not in result.output
+
+
+def test_parse_rows():
+    assert cli.parse_rows("1,3-4", 5) == [0, 2, 3]
+    assert cli.parse_rows(" 2 , 2 ", 5) == [1]
+    for spec in ("0", "6", "3-2", "x", ","):
+        with pytest.raises(click.BadParameter):
+            cli.parse_rows(spec, 5)
@@ -0,0 +1,114 @@
+"""Tests for the parallel tree deleter."""
+
+import os
+
+import pytest
+
+from folder_organizer.deleter import DIR_FD_DELETE, TreeDeleter
+
+
+def make_tree(root, width=3, depth=3, files=2):
+    """Create a tree with width subdirectories per level and files in each."""
+    for i in range(files):
+        (root / f"file{i}.txt").write_text("x")
+    if depth:
+        for i in range(width):
+            sub = root / f"dir{i}"
+            sub.mkdir()
+            make_tree(sub, width, depth - 1, files)
+
+
+def make_chain(root, levels, name="d"):
+    """Create levels nested directories below root without resolving long paths."""
+    fd = os.open(root, os.O_RDONLY)
+    try:
+        for level in range(levels):
+            os.mkdir(name, dir_fd=fd)
+            child = os.open(name, os.O_RDONLY, dir_fd=fd)
+            os.close(fd)
+            fd = child
+            if level % 500 == 0:
+                os.close(os.open("f", os.O_CREAT | os.O_WRONLY, dir_fd=fd))
+    finally:
+        os.close(fd)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_deletes_tree(tmp_path, workers):
+    root = tmp_path / "tree"
+    root.mkdir()
+    make_tree(root)
+
+    report = TreeDeleter(workers).delete([str(root)])
+
+    assert report.errors == []
+    assert not root.exists()
+    assert report.files == 2 * (1 + 3 + 9 + 27)
+    assert report.dirs == 1 + 3 + 9 + 27
+
+
+def test_deletes_files_and_reports_missing(tmp_path):
+    single = tmp_path / "single.txt"
+    single.write_text("x")
+
+    report = TreeDeleter(2).delete([str(single), str(tmp_path / "missing")])
+
+    assert not single.exists()
+    assert report.files == 1
+    assert len(report.errors) == 1 and "missing" in report.errors[0]
+
+
+@pytest.mark.skipif(not DIR_FD_DELETE, reason="needs descriptor-relative calls")
+@pytest.mark.parametrize("workers", [1, 4])
+def test_deletes_tree_deeper_than_path_max(tmp_path, workers):
+    root = tmp_path / "deep"
+    root.mkdir()
+    levels = 3000
+    make_chain(str(root), levels, name="dd")
+    assert levels * 3 > os.pathconf(str(tmp_path), "PC_PATH_MAX")
+
+    report = TreeDeleter(workers).delete([str(root)])
+
+    assert report.errors == []
+    assert not root.exists()
+    assert report.dirs == levels + 1
+    assert report.files == 6
+
+
+def test_symlinks_are_removed_not_followed(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("x")
+    root = tmp_path / "tree"
+    (root / "sub").mkdir(parents=True)
+    (root / "sub" / "link").symlink_to(outside, target_is_directory=True)
+
+    report = TreeDeleter(2).delete([str(root)])
+
+    assert report.errors == []
+    assert not root.exists()
+    assert (outside / "keep.txt").exists()
+
+
+def test_progress_counts_every_file(tmp_path):
+    root = tmp_path / "tree"
+    root.mkdir()
+    make_tree(root, width=2, depth=2, files=3)
+    seen = []
+
+    TreeDeleter(2, lambda path, files: seen.append(files)).delete([str(root)])
+
+    assert len(seen) == 1 + 2 + 4
+    assert sum(seen) == 3 * 7
+
+
+def test_failing_progress_is_reported(tmp_path):
+    root = tmp_path / "tree"
+    root.mkdir()
+
+    def progress(path, files):
+        raise RuntimeError("boom")
+
+    report = TreeDeleter(2, progress).delete([str(root)])
+
+    assert any("boom" in error for error in report.errors)
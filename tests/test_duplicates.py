@@ -0,0 +1,188 @@
+"""Tests for duplicate file detection and the hash cache."""
+
+import os
+
+import pytest
+
+from folder_organizer.duplicates import PARTIAL_BYTES, DuplicateFinder
+from folder_organizer.hashcache import HashCache
+from folder_organizer.organizer import FolderOrganizer
+from folder_organizer.scanner import scan_files
+
+LARGE = 3 * PARTIAL_BYTES
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / "folder"
+    root.mkdir()
+    small = b"small duplicate"
+    large = os.urandom(LARGE)
+    # Same head and tail as the large files, different middle
+    lookalike = large[:PARTIAL_BYTES] + os.urandom(PARTIAL_BYTES) + large[-PARTIAL_BYTES:]
+    contents = {
+        "s1.txt": small, "s2.txt": small, "s3.txt": b"small different",
+        "big1.bin": large, "big2.bin": large, "lookalike.bin": lookalike,
+        "unique.bin": os.urandom(1000), "empty1": b"", "empty2": b"",
+    }
+    for name, content in contents.items():
+        (root / name).write_bytes(content)
+    return root
+
+
+def find(folder, **kwargs):
+    return DuplicateFinder(2, **kwargs).find(scan_files(folder, with_stat=True))
+
+
+def names(report):
+    return [[os.path.basename(path) for path in group.paths] for group in report.groups]
+
+
+def test_finds_groups_ordered_by_reclaimable_bytes(folder):
+    report = find(folder)
+
+    assert names(report) == [["big1.bin", "big2.bin"], ["s1.txt", "s2.txt"]]
+    assert report.reclaimable == LARGE + len(b"small duplicate")
+    assert report.duplicate_files == 2
+    assert report.files_scanned == 9
+    assert report.errors == []
+
+
+def test_reads_large_files_fully_only_after_partial_collision(folder):
+    report = find(folder)
+
+    # Partial pass: both ends of three large files plus three small files;
+    # full pass: the three large files whose ends match
+    small = 3 * len(b"small duplicate")
+    assert report.bytes_read == small + 3 * 2 * PARTIAL_BYTES + 3 * LARGE
+
+
+def test_min_size_zero_includes_empty_files(folder):
+    report = find(folder, min_size=0)
+
+    assert ["empty1", "empty2"] in names(report)
+
+
+def test_hard_links_count_once(folder):
+    os.link(folder / "unique.bin", folder / "unique-link.bin")
+
+    report = find(folder)
+
+    assert not any("unique.bin" in group for group in names(report))
+
+
+def test_file_changed_after_scan_is_reported(folder):
+    entries = list(scan_files(folder, with_stat=True))
+    (folder / "s2.txt").write_bytes(b"grown since the scan")
+
+    report = DuplicateFinder(2).find(entries)
+
+    assert ["s1.txt", "s2.txt"] not in names(report)
+    assert any("s2.txt" in error for error in report.errors)
+
+
+def test_cache_skips_reading_unchanged_files(tmp_path, folder):
+    cache = HashCache(tmp_path / "hashes.sqlite3")
+    first = find(folder, cache=cache)
+
+    second = find(folder, cache=cache)
+
+    assert names(second) == names(first)
+    assert first.cache_hits == 0
+    assert second.bytes_read == 0
+    assert second.cache_hits == 9
+
+
+def test_find_duplicates_uses_the_hash_cache(folder):
+    organizer = FolderOrganizer(str(folder))
+
+    first = organizer.find_duplicates()
+    second = organizer.find_duplicates()
+
+    assert names(first) == names(second)
+    assert second.cache_hits > 0 and second.bytes_read == 0
+
+
+def test_find_duplicates_without_cache(folder):
+    organizer = FolderOrganizer(str(folder), hash_cache_entries=0)
+
+    assert organizer.hash_cache() is None
+    assert organizer.find_duplicates().duplicate_files == 2
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HashCache(tmp_path / "hashes.sqlite3", max_entries=10)
+    yield cache
+    cache.close()
+
+
+def entries_of(tmp_path, count):
+    files = tmp_path / "files"
+    files.mkdir()
+    for i in range(count):
+        (files / f"f{i}").write_text(str(i))
+    return sorted(scan_files(files, with_stat=True))
+
+
+def test_cache_round_trip(tmp_path, cache):
+    entries = entries_of(tmp_path, 3)
+
+    cache.put_many([(entry, b"p" + entry.name.encode()) for entry in entries], "partial")
+
+    assert cache.get_many(entries, "partial") == [b"pf0", b"pf1", b"pf2"]
+    assert cache.get_many(entries, "full") == [None, None, None]
+    assert len(cache) == 3
+
+
+def test_cache_misses_changed_files(tmp_path, cache):
+    [entry] = entries_of(tmp_path, 1)
+    cache.put_many([(entry, b"partial")], "partial")
+    cache.put_many([(entry, b"full")], "full")
+
+    changed = entry._replace(mtime_ns=entry.mtime_ns + 1)
+    assert cache.get_many([changed], "partial") == [None]
+
+    cache.put_many([(changed, b"new")], "partial")
+    assert cache.get_many([changed], "partial") == [b"new"]
+    # The full digest belonged to the old content
+    assert cache.get_many([changed], "full") == [None]
+
+
+def test_cache_skips_entries_without_inode(tmp_path, cache):
+    [entry] = entries_of(tmp_path, 1)
+    bare = entry._replace(inode=0)
+
+    cache.put_many([(bare, b"x")], "partial")
+
+    assert len(cache) == 0
+    assert cache.get_many([bare], "partial") == [None]
+
+
+def test_cache_evicts_beyond_max_entries(tmp_path, cache):
+    entries = entries_of(tmp_path, 15)
+
+    cache.put_many([(entry, b"x") for entry in entries], "full")
+
+    assert len(cache) < 10
+
+
+def test_cache_rejects_unknown_kind(tmp_path, cache):
+    with pytest.raises(ValueError):
+        cache.get_many([], "md5")
+    with pytest.raises(ValueError):
+        cache.put_many([], "md5")
+
+
+def test_cache_is_dropped_when_the_algorithm_changes(tmp_path, monkeypatch):
+    path = tmp_path / "hashes.sqlite3"
+    entries = entries_of(tmp_path, 2)
+    cache = HashCache(path)
+    cache.put_many([(entry, b"x") for entry in entries], "full")
+    cache.close()
+    monkeypatch.setattr("folder_organizer.hashcache.HASH_ALGORITHM", "other")
+
+    reopened = HashCache(path)
+
+    assert len(reopened) == 0
+    reopened.close()
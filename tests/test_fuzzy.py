@@ -0,0 +1,129 @@
+"""Tests for the fuzzy file finder."""
+
+import os
+import random
+import time
+
+import pytest
+
+from folder_organizer.fuzzy import SHORTLIST_SIZE, FuzzyFinder, score
+
+
+def brute_force(texts, query, limit):
+    """Rank by scoring every subsequence match, the slow obvious way."""
+    finder = FuzzyFinder(texts)
+    ranked = []
+    for index, text in enumerate(texts):
+        [match] = FuzzyFinder([text]).match(query, 1)[1] or [None]
+        if match is not None:
+            ranked.append((match.score, -len(text), -index))
+    ranked.sort(reverse=True)
+    assert finder.match(query, None)[0] == len(ranked)
+    return [-neg_index for _, _, neg_index in ranked[:limit]]
+
+
+def names(count, seed=0):
+    rng = random.Random(seed)
+    words = ["report", "final", "draft", "photo", "img", "backup", "notes", "2023"]
+    exts = [".pdf", ".txt", ".jpg", ".py", ".md"]
+    return [
+        f"{rng.choice(words)}/{rng.choice(words)}_{rng.choice(words)}{rng.randint(0, 99)}"
+        f"{rng.choice(exts)}"
+        for _ in range(count)
+    ]
+
+
+def test_subsequence_matching():
+    finder = FuzzyFinder(["report.pdf", "photo.jpg", "Report-Final.PDF", "rp"])
+
+    count, matches = finder.match("rptpdf")
+
+    assert count == 2
+    assert {match.text for match in matches} == {"report.pdf", "Report-Final.PDF"}
+    assert finder.match("zz") == (0, [])
+
+
+def test_boundaries_and_extension_rank_first():
+    finder = FuzzyFinder(["xxreportxpdf", "report.pdf", "my_report.pdf", "reportpdf.txt"])
+
+    ranked = [match.text for match in finder.match("rpdf")[1]]
+
+    assert ranked[0] == "report.pdf"
+    assert ranked.index("my_report.pdf") < ranked.index("xxreportxpdf")
+
+
+@pytest.mark.parametrize("query", ["r", "rp", "rpt", "fin2", "bk.md", "o/p"])
+def test_ranking_is_exact(query):
+    texts = names(3000)
+    finder = FuzzyFinder(texts)
+
+    count, matches = finder.match(query, 20)
+
+    assert [match.index for match in matches] == brute_force(texts, query, 20)
+    assert all(match.score == score(texts[match.index], match.positions, query)
+               for match in matches)
+
+
+def test_narrowing_matches_a_fresh_search():
+    texts = names(2000)
+    finder = FuzzyFinder(texts)
+
+    for query in ("r", "re", "rep", "rept", "re", "repo"):
+        assert finder.match(query, 30) == FuzzyFinder(texts).match(query, 30)
+
+
+def test_shortlist_keeps_count_and_valid_matches():
+    texts = names(5000)
+    exact = FuzzyFinder(texts)
+    approx = FuzzyFinder(texts, shortlist=100)
+
+    count, matches = approx.match("rp", 50)
+
+    assert count == exact.match("rp", 50)[0]
+    assert len(matches) == 50
+    assert matches == sorted(matches, key=lambda m: (m.score, -len(m.text), -m.index),
+                             reverse=True)
+
+
+def test_positions_map_to_original_text():
+    # "İ" lower-cases to two characters
+    finder = FuzzyFinder(["İstanbul.pdf"])
+
+    [match] = finder.match("stpdf")[1]
+
+    assert "".join(match.text[pos] for pos in match.positions).lower() == "stpdf"
+
+
+def test_cancelled_search_returns_nothing():
+    finder = FuzzyFinder(names(100))
+
+    assert finder.match("r", cancelled=lambda: True)[1] == []
+    # A cancelled search is not reused for narrowing
+    assert finder.match("re") == FuzzyFinder(names(100)).match("re")
+
+
+def test_empty_query_lists_candidates():
+    count, matches = FuzzyFinder(["a", "b", "c"]).match("", 2)
+
+    assert count == 3
+    assert [match.text for match in matches] == ["a", "b"]
+
+
+@pytest.mark.skipif(
+    "FOLDER_ORGANIZER_BENCH" not in os.environ,
+    reason="latency benchmark; set FOLDER_ORGANIZER_BENCH=<candidates> to run",
+)
+def test_typing_latency():
+    """Every keystroke of a query is ranked within 100ms, as in the search screen."""
+    count = int(os.environ["FOLDER_ORGANIZER_BENCH"] or 50_000)
+    finder = FuzzyFinder(names(count), SHORTLIST_SIZE)
+    finder.match("\x7f")  # Build the joined records up front, like the first search
+
+    slowest = {}
+    for word in ("rptpdf", "final", "bkp2023"):
+        for end in range(2, len(word) + 1):
+            start = time.perf_counter()
+            finder.match(word[:end], 1000)
+            slowest[word[:end]] = time.perf_counter() - start
+    print({query: f"{seconds * 1000:.0f}ms" for query, seconds in slowest.items()})
+    assert max(slowest.values()) < 0.1
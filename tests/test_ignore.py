@@ -0,0 +1,125 @@
+"""Tests for gitignore-style exclusion rules."""
+
+import os
+
+import pytest
+
+from folder_organizer.ignore import Excluder, IgnoreRules, translate
+from folder_organizer.scanner import ParallelWalker, WalkVisitor
+
+
+class Files(WalkVisitor):
+    def __init__(self):
+        self.paths = []
+
+    def on_file(self, entry):
+        self.paths.append(entry.path)
+
+    def merge(self, other):
+        self.paths.extend(other.paths)
+
+
+def relative(root, paths):
+    return sorted(os.path.relpath(path, root).replace(os.sep, "/") for path in paths)
+
+
+@pytest.mark.parametrize("line", ["", "   ", "# comment", "/", "!"])
+def test_translate_skips_blank_lines_and_comments(line):
+    assert translate(line) is None
+
+
+def test_translate_flags():
+    assert translate("!keep.txt")[1:] == (True, False)
+    assert translate("build/")[1:] == (False, True)
+    assert translate("\\!literal")[1:] == (False, False)
+
+
+@pytest.mark.parametrize("pattern, path, is_dir, expected", [
+    ("*.log", "a.log", False, True),
+    ("*.log", "deep/dir/a.log", False, True),
+    ("*.log", "a.txt", False, None),
+    ("/top.txt", "top.txt", False, True),
+    ("/top.txt", "sub/top.txt", False, None),
+    ("docs/*.md", "docs/a.md", False, True),
+    ("docs/*.md", "docs/sub/a.md", False, None),
+    ("a/**/z", "a/z", False, True),
+    ("a/**/z", "a/b/c/z", False, True),
+    ("**/cache", "x/y/cache", True, True),
+    ("logs/**", "logs/a/b.txt", False, True),
+    ("build/", "build", True, True),
+    ("build/", "build", False, None),
+    ("file?.txt", "file1.txt", False, True),
+    ("file?.txt", "file10.txt", False, None),
+    ("[abc].txt", "b.txt", False, True),
+    ("[!abc].txt", "b.txt", False, None),
+    ("\\#hash", "#hash", False, True),
+    ("trailing\\ ", "trailing ", False, True),
+])
+def test_rules_match(pattern, path, is_dir, expected):
+    assert IgnoreRules([pattern]).match(path, is_dir) is expected
+
+
+def test_last_matching_rule_wins():
+    rules = IgnoreRules(["*.log", "!keep.log", "keep.log"])
+    negated = IgnoreRules(["*.log", "!keep.log"])
+
+    assert rules.match("keep.log", False) is True
+    assert negated.match("keep.log", False) is False
+    assert negated.match("other.log", False) is True
+
+
+def test_ignores_checks_parent_directories():
+    rules = IgnoreRules(["build/"])
+
+    assert rules.ignores("build/out/app.bin", False)
+    assert not rules.ignores("src/build.py", False)
+
+
+def test_empty_rules_are_falsy(tmp_path):
+    (tmp_path / "empty").write_text("# only a comment\n\n")
+
+    assert not IgnoreRules([])
+    assert IgnoreRules.from_file(str(tmp_path / "empty")) is None
+    assert IgnoreRules.from_file(str(tmp_path / "missing")) is None
+
+
+@pytest.fixture
+def repo(tmp_path):
+    files = [
+        "a.txt", "a.log", "build/out.bin", "src/main.py", "src/main.pyc",
+        "src/gen/x.py", "src/keep.log", "docs/readme.md",
+    ]
+    for name in files:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+    (tmp_path / ".gitignore").write_text("*.log\nbuild/\n")
+    (tmp_path / "src" / ".gitignore").write_text("*.pyc\ngen/\n!keep.log\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_excluder_honors_nested_gitignore(repo, workers):
+    exclude = Excluder(str(repo), IgnoreRules(["docs/"]))
+
+    result = ParallelWalker(workers, exclude).walk(repo, Files)
+
+    assert relative(repo, result.paths) == [
+        ".gitignore", "a.txt", "src/.gitignore", "src/keep.log", "src/main.py",
+    ]
+
+
+def test_excluder_without_gitignore(repo):
+    exclude = Excluder(str(repo), IgnoreRules(["*.pyc"]), gitignore=False)
+
+    result = ParallelWalker(2, exclude).walk(repo, Files)
+
+    assert "src/main.pyc" not in relative(repo, result.paths)
+    assert "build/out.bin" in relative(repo, result.paths)
+    assert "src/gen/x.py" in relative(repo, result.paths)
+
+
+def test_excluder_without_any_rules(repo):
+    result = ParallelWalker(2, Excluder(str(repo), gitignore=False)).walk(repo, Files)
+
+    assert len(result.paths) == 10
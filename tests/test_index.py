@@ -0,0 +1,147 @@
+"""Tests for the SQLite metadata index."""
+
+import os
+
+import pytest
+
+from folder_organizer.ignore import Excluder
+from folder_organizer.index import MetadataIndex
+from folder_organizer.organizer import FolderOrganizer
+
+
+def categorize(name):
+    return "Documents" if name.endswith(".txt") else None
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    for sub in ("a", "a/b", "c"):
+        (root / sub).mkdir(parents=True)
+    for path in ("top.txt", "a/one.txt", "a/b/two.txt", "c/three.bin"):
+        (root / path).write_text(path)
+    return root
+
+
+@pytest.fixture
+def index(tree, tmp_path):
+    index = MetadataIndex(tree, categorize, db_path=tmp_path / "index.sqlite3")
+    index.exclude = Excluder(str(tree))
+    index.refresh()
+    yield index
+    index.close()
+
+
+def names(index):
+    return sorted(os.path.join(path, name) for path, name, *_ in index.all_files())
+
+
+def bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_initial_build(tree, index):
+    assert names(index) == sorted(
+        str(tree / path) for path in ("top.txt", "a/one.txt", "a/b/two.txt", "c/three.bin")
+    )
+    assert [row[0] for row in index.top_level_files()] == ["top.txt"]
+    assert index.summary()["file_count"] == 4
+    assert index.summary()["total_folders"] == 3
+
+
+def test_refresh_relists_only_changed_directories(tree, index, monkeypatch):
+    relisted = []
+    relist = index._relist
+
+    def spy(dir_id, path, mtime_ns):
+        relisted.append(path)
+        relist(dir_id, path, mtime_ns)
+
+    monkeypatch.setattr(index, "_relist", spy)
+
+    assert index.refresh() is False
+    assert relisted == []
+
+    (tree / "a" / "new.txt").write_text("x")
+    bump_mtime(tree / "a")
+    assert index.refresh() is True
+    assert relisted == [str(tree / "a")]
+    assert str(tree / "a" / "new.txt") in names(index)
+
+
+def test_refresh_does_not_stat_unchanged_files(tree, index, monkeypatch):
+    stats = []
+    real_stat = os.stat
+
+    def spy(path, *args, **kwargs):
+        stats.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", spy)
+
+    index.refresh()
+
+    # One stat per directory, none per file
+    assert len(stats) == 4
+
+
+def test_in_place_rewrites_are_picked_up_when_asked(tree, index):
+    (tree / "a" / "one.txt").write_text("much longer content")
+
+    def size():
+        return {name: size for _, name, size, *_ in index.all_files()}["one.txt"]
+
+    index.refresh()
+    assert size() == len("a/one.txt")
+    assert index.refresh(restat=True) is True
+    assert size() == len("much longer content")
+
+
+def test_removed_directories_are_dropped(tree, index):
+    for name in os.listdir(tree / "a" / "b"):
+        os.unlink(tree / "a" / "b" / name)
+    os.rmdir(tree / "a" / "b")
+    bump_mtime(tree / "a")
+
+    index.refresh()
+
+    assert str(tree / "a" / "b" / "two.txt") not in names(index)
+    assert index.summary()["total_folders"] == 2
+
+
+def test_gitignore_edit_relists_below(tree, index):
+    (tree / "a" / ".gitignore").write_text("")
+    bump_mtime(tree / "a")
+    index.exclude = Excluder(str(tree))
+    index.refresh()
+    assert str(tree / "a" / "b" / "two.txt") in names(index)
+
+    # Rewritten in place: the directory mtime does not change
+    (tree / "a" / ".gitignore").write_text("two.txt\n")
+    index.exclude = Excluder(str(tree))
+    index.refresh()
+
+    assert str(tree / "a" / "b" / "two.txt") not in names(index)
+    assert str(tree / "a" / "one.txt") in names(index)
+
+
+def test_rules_change_resets(tree, tmp_path, index):
+    other = MetadataIndex(tree, categorize, "other rules", db_path=tmp_path / "index.sqlite3")
+    try:
+        assert other.refreshed_at is None
+        assert list(other.all_files()) == []
+    finally:
+        other.close()
+
+
+def test_search_returns_fresh_stat(tree):
+    organizer = FolderOrganizer(str(tree), use_index=True)
+    organizer.get_filecount("top")
+    (tree / "top.txt").write_text("rewritten in place")
+
+    for recursive in (False, True):
+        [hit] = organizer.search("top", sort_by="size", recursive=recursive).hits
+        assert hit.size == len("rewritten in place")
+        [hit] = organizer.search("top", recursive=recursive).hits
+        assert hit.size == len("rewritten in place")
@@ -0,0 +1,55 @@
+"""Tests for FolderOrganizer queries and plans."""
+
+import pytest
+
+from folder_organizer.organizer import FolderOrganizer
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / "folder"
+    root.mkdir()
+    (root / ".gitignore").write_text("secret*\n")
+    for name in ("secret.pdf", "report.pdf", "notes.txt", "photo.jpg"):
+        (root / name).write_text(name)
+    (root / "sub").mkdir()
+    (root / "sub" / "secret.txt").write_text("x")
+    (root / "sub" / "deep.pdf").write_text("x")
+    return root
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_excluded_files_are_skipped_by_every_backend(folder, use_index):
+    organizer = FolderOrganizer(str(folder), use_index=use_index)
+
+    assert organizer.get_filecount("secret") == 0
+    assert organizer.get_filecount("secret", recursive=True) == 0
+    assert organizer.get_filecount(".pdf") == 1
+    assert organizer.get_filecount(".pdf", recursive=True) == 2
+
+    preview = organizer.preview_organization()
+    assert "secret.pdf" not in sum(preview.values(), [])
+    assert "report.pdf" in sum(preview.values(), [])
+
+    for plan in (organizer.plan_organize(), organizer.plan_delete("pdf")):
+        sources = {entry.source.rsplit("/", 1)[-1] for entry in plan.entries}
+        assert "secret.pdf" not in sources
+        assert "report.pdf" in sources
+
+
+def test_backends_agree(folder):
+    plain = FolderOrganizer(str(folder))
+    indexed = FolderOrganizer(str(folder), use_index=True)
+
+    for term in ("pdf", "o", "secret", ".txt"):
+        for recursive in (False, True):
+            assert sorted(e.name for e in plain.iter_search(term, recursive=recursive)) == \
+                sorted(e.name for e in indexed.iter_search(term, recursive=recursive))
+    assert plain.preview_organization() == indexed.preview_organization()
+
+
+def test_gitignore_can_be_disabled(folder):
+    organizer = FolderOrganizer(str(folder), use_gitignore=False)
+
+    assert organizer.get_filecount("secret") == 1
+    assert organizer.get_filecount("secret", recursive=True) == 2
@@ -0,0 +1,208 @@
+"""Tests for operation plans and their execution."""
+
+import os
+import threading
+
+import pytest
+
+from folder_organizer.organizer import FolderOrganizer
+from folder_organizer.plan import OperationPlan, PlanEntry, check_unchanged, run_plan
+from folder_organizer.progress import CancelToken
+
+
+def planned(path, target=None):
+    st = os.stat(path)
+    return PlanEntry(str(path), target and str(target), st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / "folder"
+    (root / "sub").mkdir(parents=True)
+    for name in ("a.pdf", "b.PDF", "c.txt", "photo.jpg", "sub/d.pdf", "sub/e.jpg"):
+        (root / name).write_text(name)
+    return root
+
+
+def test_plan_round_trip(tmp_path, folder):
+    plan = OperationPlan("move", str(folder), destination=str(tmp_path), errors=["x: oops"])
+    plan.entries.append(planned(folder / "a.pdf", tmp_path / "a.pdf"))
+    path = str(tmp_path / "plan.json")
+
+    plan.save(path)
+    loaded = OperationPlan.load(path)
+
+    assert loaded == plan
+    assert loaded.files_list == ["a.pdf"]
+    assert loaded.relative_paths == ["a.pdf"]
+    assert loaded.total_bytes == 5
+
+
+@pytest.mark.parametrize("content", ["not json", '{"version": 99, "action": "move"}',
+                                     '{"version": 1, "action": "shred"}'])
+def test_load_rejects_invalid_plans(tmp_path, content):
+    path = tmp_path / "plan.json"
+    path.write_text(content)
+
+    with pytest.raises(ValueError):
+        OperationPlan.load(str(path))
+
+
+def test_check_unchanged(folder):
+    entry = planned(folder / "a.pdf")
+    assert check_unchanged(entry) is None
+
+    os.utime(folder / "a.pdf", ns=(0, 0))
+    assert "changed" in check_unchanged(entry)
+
+    os.unlink(folder / "a.pdf")
+    assert "no longer exists" in check_unchanged(entry)
+
+
+def test_check_unchanged_relative_to_directory(folder):
+    entry = planned(folder / "a.pdf")
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        assert check_unchanged(entry, fd) is None
+    finally:
+        os.close(fd)
+
+
+@pytest.mark.parametrize("same_device", [True, False])
+def test_run_plan_moves_files(tmp_path, folder, same_device):
+    dest = tmp_path / "dest"
+    plan = OperationPlan("move", str(folder), same_device=same_device)
+    for name in ("a.pdf", "sub/d.pdf"):
+        plan.entries.append(planned(folder / name, dest / name))
+
+    done, errors, report = run_plan(plan)
+
+    assert errors == []
+    assert [entry.name for entry in done] == ["a.pdf", "d.pdf"]
+    assert (dest / "sub" / "d.pdf").read_text() == "sub/d.pdf"
+    assert not (folder / "a.pdf").exists()
+    assert (report is None) == same_device
+
+
+@pytest.mark.parametrize("same_device", [True, False])
+def test_run_plan_skips_changed_files(tmp_path, folder, same_device):
+    plan = OperationPlan("move", str(folder), same_device=same_device)
+    for name in ("a.pdf", "c.txt"):
+        plan.entries.append(planned(folder / name, tmp_path / name))
+    (folder / "c.txt").write_text("rewritten since planning")
+    os.utime(folder / "c.txt", ns=(1, 1))
+
+    done, errors, _ = run_plan(plan)
+
+    assert [entry.name for entry in done] == ["a.pdf"]
+    assert errors == ["c.txt: changed since the plan was created"]
+    assert (folder / "c.txt").exists()
+
+
+def test_run_plan_deletes(folder):
+    plan = OperationPlan("delete", str(folder))
+    plan.entries = [planned(folder / "a.pdf"), planned(folder / "sub" / "d.pdf")]
+    plan.entries.append(PlanEntry(str(folder / "gone.pdf"), None, 0, 0, 1))
+
+    done, errors, _ = run_plan(plan)
+
+    assert len(done) == 2
+    assert errors == ["gone.pdf: no longer exists"]
+    assert not (folder / "a.pdf").exists()
+    assert not (folder / "sub" / "d.pdf").exists()
+
+
+def test_run_plan_stops_when_cancelled(folder):
+    plan = OperationPlan("delete", str(folder))
+    plan.entries = [planned(folder / name) for name in ("a.pdf", "c.txt", "photo.jpg")]
+    cancel = threading.Event()
+    cancel.set()
+
+    done, errors, _ = run_plan(plan, cancel=cancel)
+
+    assert done == [] and errors == []
+    assert (folder / "a.pdf").exists()
+
+
+def test_plan_move_recursive_keeps_relative_folders(tmp_path, folder):
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    organizer = FolderOrganizer(str(folder))
+
+    plan = organizer.plan_move("pdf", str(dest), recursive=True)
+    result = organizer.execute_plan(plan)
+
+    assert result.success
+    assert sorted(plan.relative_paths) == ["a.pdf", "b.PDF", "sub/d.pdf"]
+    assert (dest / "sub" / "d.pdf").exists()
+    assert (folder / "c.txt").exists()
+
+
+def test_plan_move_rejects_bad_destinations(tmp_path, folder):
+    organizer = FolderOrganizer(str(folder))
+
+    with pytest.raises(ValueError):
+        organizer.plan_move("pdf", str(tmp_path / "missing"))
+    with pytest.raises(ValueError):
+        organizer.plan_move("pdf", str(folder))
+
+
+def test_plan_move_never_descends_into_destination(folder):
+    organizer = FolderOrganizer(str(folder))
+
+    plan = organizer.plan_move("pdf", str(folder / "sub"), recursive=True)
+
+    assert sorted(plan.relative_paths) == ["a.pdf", "b.PDF"]
+
+
+def test_execute_plan_reports_progress_and_fails_on_stale_entries(folder):
+    organizer = FolderOrganizer(str(folder))
+    plan = organizer.plan_delete(".pdf")
+    os.unlink(folder / "a.pdf")
+    reports = []
+
+    result = organizer.execute_plan(plan, progress=reports.append)
+
+    assert not result.success
+    assert result.files_list == ["b.PDF"]
+    assert result.errors == ["a.pdf: no longer exists"]
+    assert reports[-1].files_done == reports[-1].files_total == 2
+
+
+def test_execute_plan_cancelled(folder):
+    organizer = FolderOrganizer(str(folder))
+    plan = organizer.plan_delete("pdf", recursive=True)
+    cancel = CancelToken()
+    cancel.cancel()
+
+    result = organizer.execute_plan(plan, cancel=cancel)
+
+    assert result.cancelled and not result.success
+    assert result.message.startswith("Cancelled:")
+    assert (folder / "a.pdf").exists()
+
+
+def test_plan_organize(folder):
+    organizer = FolderOrganizer(str(folder))
+
+    plan = organizer.plan_organize()
+
+    assert plan.same_device
+    assert {k: sorted(v) for k, v in plan.by_target_dir().items()} == {
+        "PDFs": ["a.pdf", "b.PDF"], "PLAINTEXT": ["c.txt"], "IMAGES": ["photo.jpg"],
+    }
+    assert organizer.preview_plan(plan).message == "4 files would be organized into 3 categories"
+
+
+def test_plan_organize_recursive_reports_name_clashes(folder):
+    (folder / "sub" / "a.pdf").write_text("clash")
+    organizer = FolderOrganizer(str(folder))
+
+    plan = organizer.plan_organize(recursive=True)
+    result = organizer.execute_plan(plan)
+
+    assert plan.errors == ["sub/a.pdf: PDFs/a.pdf already exists"]
+    assert (folder / "PDFs" / "a.pdf").read_text() == "a.pdf"
+    assert (folder / "sub" / "a.pdf").exists()
+    assert (folder / "IMAGES" / "e.jpg").exists()
+    assert result.files_affected == 6
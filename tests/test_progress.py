@@ -0,0 +1,91 @@
+"""Tests for progress reporting and cancellation tokens."""
+
+import threading
+
+import pytest
+
+from folder_organizer.progress import CancelToken, PolledCancel, Progress, ProgressTracker
+
+
+def test_fraction_prefers_bytes():
+    assert Progress(1, 10, 50, 100, 1.0).fraction == 0.5
+    assert Progress(3, 4, 0, 0, 1.0).fraction == 0.75
+    assert Progress(0, 0, 0, 0, 0.0).fraction == 1.0
+    assert Progress(5, 4, 0, 0, 1.0).fraction == 1.0
+
+
+def test_rates_and_eta():
+    progress = Progress(10, 40, 250, 1000, 2.0)
+
+    assert progress.files_per_second == 5.0
+    assert progress.bytes_per_second == 125.0
+    assert progress.eta == pytest.approx(6.0)
+
+
+def test_eta_is_unknown_without_a_rate():
+    assert Progress(0, 10, 0, 100, 1.0).eta is None
+    assert Progress(0, 10, 0, 100, 0.0).eta is None
+    assert Progress(0, 0, 0, 0, 0.0).files_per_second == 0.0
+
+
+def test_tracker_rate_limits_callbacks():
+    reports = []
+    tracker = ProgressTracker(100, 0, reports.append, interval=3600)
+
+    for _ in range(100):
+        tracker.advance(current="f")
+    tracker.finish()
+
+    # The first advance and finish; everything in between is throttled
+    assert len(reports) == 2
+    assert reports[0].files_done == 1
+    assert reports[-1].files_done == 100
+    assert reports[-1].fraction == 1.0
+
+
+def test_tracker_counts_from_many_threads():
+    tracker = ProgressTracker(8000, 8000, lambda progress: None, interval=0)
+
+    def work():
+        for _ in range(1000):
+            tracker.advance(size=1)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tracker.files_done == 8000
+    assert tracker.bytes_done == 8000
+
+
+def test_tracker_without_callback():
+    tracker = ProgressTracker(2, 10)
+
+    tracker.advance(size=4)
+    tracker.finish()
+
+    snapshot = tracker.snapshot()
+    assert (snapshot.files_done, snapshot.bytes_done) == (1, 4)
+
+
+def test_cancel_token():
+    token = CancelToken()
+    assert not token.cancelled
+
+    token.cancel()
+
+    assert token.cancelled
+    assert token.is_set()
+
+
+def test_polled_cancel_follows_the_predicate():
+    flag = []
+    token = PolledCancel(lambda: bool(flag))
+    assert not token.is_set()
+
+    flag.append(True)
+
+    assert token.is_set()
+    assert token.cancelled
@@ -0,0 +1,185 @@
+"""Tests for the scandir-based scanning primitives."""
+
+import os
+import threading
+
+import pytest
+
+from folder_organizer.scanner import FileEntry, ParallelWalker, WalkVisitor, scan_files, stat_entry
+
+
+class Collector(WalkVisitor):
+    def __init__(self):
+        self.files = []
+        self.dirs = []
+
+    def on_dir(self, entry):
+        self.dirs.append(entry.path)
+
+    def on_file(self, entry):
+        self.files.append(entry.path)
+
+    def merge(self, other):
+        self.files.extend(other.files)
+        self.dirs.extend(other.dirs)
+
+
+def make_tree(root, width=4, depth=3):
+    """Create ``width`` files and subdirectories per level; return all file paths."""
+    files = []
+    for i in range(width):
+        path = root / f"f{i}.txt"
+        path.write_text(str(path))
+        files.append(str(path))
+    if depth:
+        for i in range(width):
+            sub = root / f"d{i}"
+            sub.mkdir()
+            files += make_tree(sub, width, depth - 1)
+    return files
+
+
+def test_scan_files_lists_only_regular_files(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.log").write_text("bb")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "nested.txt").write_text("n")
+    (tmp_path / "link").symlink_to("a.txt")
+    (tmp_path / "dangling").symlink_to("missing")
+
+    names = sorted(entry.name for entry in scan_files(tmp_path))
+
+    assert names == ["a.txt", "b.log", "link"]
+
+
+def test_scan_files_with_stat(tmp_path):
+    (tmp_path / "a.txt").write_text("abc")
+    st = os.stat(tmp_path / "a.txt")
+
+    [entry] = scan_files(tmp_path, with_stat=True)
+
+    assert entry == FileEntry(
+        "a.txt", str(tmp_path / "a.txt"), 3, st.st_mtime_ns, st.st_ino, st.st_dev
+    )
+
+
+def test_scan_files_without_stat_leaves_fields_empty(tmp_path):
+    (tmp_path / "a.txt").write_text("abc")
+
+    [entry] = scan_files(tmp_path)
+
+    assert (entry.size, entry.mtime_ns, entry.inode, entry.dev) == (0, 0, 0, 0)
+    assert stat_entry(entry).size == 3
+
+
+def test_scan_files_exclude(tmp_path):
+    for name in ["keep.txt", "drop.log"]:
+        (tmp_path / name).write_text(name)
+
+    entries = scan_files(tmp_path, exclude=lambda entry, is_dir: entry.name.endswith(".log"))
+
+    assert [entry.name for entry in entries] == ["keep.txt"]
+
+
+def test_scan_files_cancel(tmp_path):
+    for i in range(10):
+        (tmp_path / f"{i}.txt").write_text("x")
+    cancel = threading.Event()
+    seen = []
+
+    for entry in scan_files(tmp_path, cancel=cancel):
+        seen.append(entry)
+        cancel.set()
+
+    assert len(seen) == 1
+
+
+def test_scan_files_missing_directory(tmp_path):
+    with pytest.raises(OSError):
+        list(scan_files(tmp_path / "missing"))
+
+
+def test_stat_entry_keeps_entries_that_vanished(tmp_path):
+    entry = FileEntry("gone", str(tmp_path / "gone"))
+
+    assert stat_entry(entry) is entry
+
+
+@pytest.mark.parametrize("workers", [1, 2, 8])
+def test_walker_visits_every_entry(tmp_path, workers):
+    files = make_tree(tmp_path)
+
+    result = ParallelWalker(workers).walk(tmp_path, Collector)
+
+    assert sorted(result.files) == sorted(files)
+    assert len(result.dirs) == 4 + 16 + 64
+
+
+def test_walker_does_not_follow_directory_symlinks(tmp_path):
+    make_tree(tmp_path, width=2, depth=1)
+    (tmp_path / "loop").symlink_to(tmp_path)
+
+    result = ParallelWalker(4).walk(tmp_path, Collector)
+
+    assert str(tmp_path / "loop") in result.dirs
+    assert not any(path.startswith(str(tmp_path / "loop") + os.sep) for path in result.files)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_walker_prunes_excluded_directories(tmp_path, workers):
+    make_tree(tmp_path, width=3, depth=2)
+
+    def exclude(entry, is_dir):
+        return is_dir and entry.name == "d0"
+
+    result = ParallelWalker(workers, exclude).walk(tmp_path, Collector)
+
+    assert not any(f"{os.sep}d0" in path for path in result.files + result.dirs)
+    assert len(result.files) == 3 + 2 * (3 + 2 * 3)
+
+
+def test_walker_skips_unreadable_root(tmp_path):
+    result = ParallelWalker(2).walk(tmp_path / "missing", Collector)
+
+    assert result.files == [] and result.dirs == []
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_walker_cancel_returns_partial_results(tmp_path, workers):
+    files = make_tree(tmp_path, width=4, depth=3)
+    cancel = threading.Event()
+
+    class Cancelling(Collector):
+        def on_file(self, entry):
+            super().on_file(entry)
+            cancel.set()
+
+    result = ParallelWalker(workers).walk(tmp_path, Cancelling, cancel=cancel)
+
+    assert 0 < len(result.files) < len(files)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_walker_reports_progress(tmp_path, workers):
+    files = make_tree(tmp_path, width=3, depth=2)
+    calls = []
+
+    def progress(visitors):
+        assert len(visitors) == workers
+        calls.append(sum(len(visitor.files) for visitor in visitors))
+
+    ParallelWalker(workers).walk(tmp_path, Collector, progress=progress, interval=0)
+
+    assert calls
+    assert max(calls) <= len(files)
+
+
+def test_walker_propagates_visitor_errors(tmp_path):
+    make_tree(tmp_path, width=2, depth=2)
+
+    class Failing(Collector):
+        def on_file(self, entry):
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        ParallelWalker(4).walk(tmp_path, Failing)
@@ -0,0 +1,145 @@
+"""Tests for streaming search results and search-as-you-type sessions."""
+
+import os
+
+import pytest
+
+from folder_organizer.organizer import FolderOrganizer
+from folder_organizer.scanner import FileEntry
+from folder_organizer.search import SearchSession, collect
+
+
+def entries(*sizes):
+    return [FileEntry(f"F{i}-{size}", f"/x/F{i}-{size}", size, i) for i, size in enumerate(sizes)]
+
+
+def test_collect_keeps_scan_order_up_to_the_limit():
+    result = collect(iter(entries(5, 1, 3)), "f", limit=2)
+
+    assert result.count == 3
+    assert [hit.size for hit in result.hits] == [5, 1]
+    assert result.truncated
+
+
+@pytest.mark.parametrize("reverse, expected", [(False, [1, 2]), (True, [9, 5])])
+def test_collect_keeps_the_top_hits(reverse, expected):
+    result = collect(iter(entries(5, 1, 9, 2)), "f", 2, "size", reverse)
+
+    assert result.count == 4
+    assert [hit.size for hit in result.hits] == expected
+
+
+def test_collect_sorts_names_case_insensitively():
+    hits = [FileEntry("b", "b"), FileEntry("A", "A"), FileEntry("c", "c")]
+
+    result = collect(hits, "", sort_by="name")
+
+    assert [hit.name for hit in result.hits] == ["A", "b", "c"]
+    assert not result.truncated
+
+
+def test_collect_rejects_unknown_sort_key():
+    with pytest.raises(ValueError):
+        collect([], "x", sort_by="owner")
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for name in ("report.pdf", "Report-2.txt", "repo.zip", "notes.txt"):
+        (tmp_path / name).write_text(name)
+    return tmp_path
+
+
+def counting_session(folder, max_age=30.0):
+    organizer = FolderOrganizer(str(folder))
+    scans = []
+
+    def scan(term, cancelled):
+        scans.append(term)
+        return organizer.iter_search(term, False, cancelled=cancelled)
+
+    return SearchSession(scan, folder, max_age), scans
+
+
+def test_session_narrows_without_rescanning(folder):
+    session, scans = counting_session(folder)
+
+    counts = [session.search(term).count for term in ("r", "rep", "repor", "report")]
+
+    assert counts == [3, 3, 2, 2]
+    assert scans == ["r"]
+
+
+def test_session_rescans_when_the_query_changes(folder):
+    session, scans = counting_session(folder)
+
+    session.search("rep")
+    result = session.search("not")
+
+    assert [hit.name for hit in result.hits] == ["notes.txt"]
+    assert scans == ["rep", "not"]
+
+
+def test_session_rescans_when_the_folder_changes(folder):
+    session, scans = counting_session(folder)
+    session.search("rep")
+    (folder / "reports.csv").write_text("new")
+    os.utime(folder, ns=(1, 1))
+
+    result = session.search("repo")
+
+    assert result.count == 4
+    assert scans == ["rep", "repo"]
+
+
+def test_session_rescans_stale_candidates(folder):
+    session, scans = counting_session(folder, max_age=-1)
+
+    session.search("rep")
+    session.search("repo")
+
+    assert scans == ["rep", "repo"]
+
+
+def test_session_invalidate(folder):
+    session, scans = counting_session(folder)
+    session.search("rep")
+
+    session.invalidate()
+    session.search("repo")
+
+    assert scans == ["rep", "repo"]
+
+
+def test_session_sorts_by_size_and_stats_hits(folder):
+    session, _ = counting_session(folder)
+
+    result = session.search("rep", sort_by="size", reverse=True)
+
+    assert [hit.name for hit in result.hits] == ["Report-2.txt", "report.pdf", "repo.zip"]
+    assert all(hit.inode for hit in result.hits)
+
+
+def test_cancelled_scan_is_not_reused(folder):
+    session, scans = counting_session(folder)
+
+    partial = session.search("r", cancelled=lambda: True)
+    session.search("rep")
+
+    assert partial.count == 0
+    assert scans == ["r", "rep"]
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_organizer_search(folder, use_index):
+    (folder / "sub").mkdir()
+    (folder / "sub" / "deep-report.md").write_text("x" * 100)
+    organizer = FolderOrganizer(str(folder), use_index=use_index)
+
+    top = organizer.search("REPORT", sort_by="name")
+    deep = organizer.search("report", limit=1, sort_by="size", reverse=True, recursive=True)
+
+    assert [hit.name for hit in top.hits] == ["Report-2.txt", "report.pdf"]
+    assert deep.count == 3
+    assert [hit.name for hit in deep.hits] == ["deep-report.md"]
+    assert deep.hits[0].size == 100
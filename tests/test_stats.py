@@ -0,0 +1,97 @@
+"""Tests for the bounded-memory distinct counter."""
+
+import pytest
+
+from folder_organizer.stats import DistinctCounter
+
+
+def test_unbounded_counter_is_exact():
+    counter = DistinctCounter()
+
+    for i in range(5000):
+        counter.add(f"folder{i % 1000}")
+
+    assert counter.exact
+    assert len(counter) == 1000
+
+
+def test_counter_stays_exact_up_to_the_limit():
+    counter = DistinctCounter(exact_limit=100)
+
+    for i in range(100):
+        counter.add(i)
+
+    assert counter.exact
+    assert len(counter) == 100
+
+
+@pytest.mark.parametrize("count", [1000, 20000, 200000])
+def test_sketch_estimate_is_close(count):
+    counter = DistinctCounter(exact_limit=100)
+
+    for i in range(count):
+        counter.add(f"folder-{i}")
+
+    assert not counter.exact
+    assert abs(len(counter) - count) <= count * 0.03
+
+
+def test_sketch_ignores_repeats():
+    counter = DistinctCounter(exact_limit=10)
+
+    for _ in range(5):
+        for i in range(5000):
+            counter.add(f"name{i}")
+
+    assert abs(len(counter) - 5000) <= 5000 * 0.03
+
+
+def test_sketch_memory_is_bounded():
+    counter = DistinctCounter(exact_limit=10, precision=10)
+
+    for i in range(50000):
+        counter.add(i)
+
+    assert len(counter._values) == 0
+    assert len(counter._registers) == 1 << 10
+
+
+def test_merge_exact_counters():
+    left, right = DistinctCounter(), DistinctCounter()
+    for i in range(60):
+        left.add(i)
+    for i in range(40, 100):
+        right.add(i)
+
+    left.merge(right)
+
+    assert left.exact
+    assert len(left) == 100
+
+
+def test_merge_sketches():
+    left = DistinctCounter(exact_limit=10)
+    right = DistinctCounter(exact_limit=10)
+    for i in range(30000):
+        left.add(f"x{i}")
+    for i in range(20000, 50000):
+        right.add(f"x{i}")
+
+    left.merge(right)
+
+    assert not left.exact
+    assert abs(len(left) - 50000) <= 50000 * 0.03
+
+
+def test_merge_sketch_into_exact_counter():
+    exact = DistinctCounter(exact_limit=10)
+    sketch = DistinctCounter(exact_limit=10)
+    for i in range(5):
+        exact.add(f"y{i}")
+    for i in range(10000):
+        sketch.add(f"y{i}")
+
+    exact.merge(sketch)
+
+    assert not exact.exact
+    assert abs(len(exact) - 10000) <= 10000 * 0.03
@@ -0,0 +1,93 @@
+"""Tests for the cross-device transfer engine."""
+
+import os
+import threading
+
+import pytest
+
+from folder_organizer import transfer
+from folder_organizer.transfer import CANCELLED, TransferEngine
+
+
+@pytest.fixture
+def files(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    data = {f"file{i}.bin": os.urandom(1000 * i + 1) for i in range(5)}
+    for name, content in data.items():
+        (src / name).write_bytes(content)
+    jobs = [(str(src / name), str(dst / name)) for name in data]
+    return jobs, data
+
+
+@pytest.mark.parametrize("fsync", ["none", "file", "end"])
+def test_move_copies_and_removes_sources(files, fsync):
+    jobs, data = files
+
+    report = TransferEngine(2, fsync).move(jobs)
+
+    assert report.failed == []
+    assert report.bytes == sum(len(content) for content in data.values())
+    for source, target in jobs:
+        assert not os.path.exists(source)
+        with open(target, "rb") as f:
+            assert f.read() == data[os.path.basename(target)]
+
+
+def test_symlinks_are_moved_as_links(tmp_path):
+    (tmp_path / "real.txt").write_text("x")
+    link = tmp_path / "link"
+    link.symlink_to("real.txt")
+    target = tmp_path / "moved"
+
+    report = TransferEngine(1).move([(str(link), str(target))])
+
+    assert report.failed == []
+    assert os.readlink(target) == "real.txt"
+    assert not os.path.lexists(link)
+
+
+def test_zero_copy_reporting_eof_falls_back(files, monkeypatch):
+    jobs, data = files
+    # Like procfs or some FUSE mounts: EOF at offset 0 for a file with data
+    monkeypatch.setattr(os, "copy_file_range", lambda *args: 0, raising=False)
+    monkeypatch.setattr(os, "sendfile", lambda *args: 0, raising=False)
+
+    report = TransferEngine(2).move(jobs)
+
+    assert report.failed == []
+    for _, target in jobs:
+        with open(target, "rb") as f:
+            assert f.read() == data[os.path.basename(target)]
+
+
+def test_short_copy_keeps_source(files, monkeypatch):
+    jobs, data = files
+    monkeypatch.setattr(transfer, "_copy_fd", lambda src_fd, dst_fd, size: 0)
+
+    report = TransferEngine(2).move(jobs)
+
+    assert len(report.failed) == len(jobs)
+    assert all("copied 0 of" in result.error for result in report.failed)
+    for source, target in jobs:
+        assert os.path.exists(source)
+        assert not os.path.exists(target)
+    assert os.listdir(os.path.dirname(jobs[0][1])) == []
+
+
+def test_cancelled_move_leaves_files(files):
+    jobs, _ = files
+    cancel = threading.Event()
+    cancel.set()
+
+    report = TransferEngine(2).move(jobs, cancel=cancel)
+
+    assert [result.error for result in report.files] == [CANCELLED] * len(jobs)
+    assert all(os.path.exists(source) for source, _ in jobs)
+
+
+def test_unknown_fsync_policy():
+    with pytest.raises(ValueError):
+        TransferEngine(fsync="sometimes")
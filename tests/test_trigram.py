@@ -0,0 +1,84 @@
+"""Tests for the trigram file name index."""
+
+import os
+import pickle
+
+import pytest
+
+from folder_organizer.trigram import TrigramIndex
+
+ROWS = [
+    ("/data", "Report.pdf", 10, 1, 100),
+    ("/data", "notes.txt", 20, 2, 101),
+    ("/data/sub", "old_report.PDF", 30, 3, 102),
+    ("/data/sub", "photo.jpg", 40, 4, 103),
+    ("/data/\udcff", "caf\udce9.txt", 50, 5, 104),
+]
+
+
+@pytest.fixture
+def index():
+    return TrigramIndex.build(ROWS, "v1")
+
+
+def found(index, term):
+    return sorted(entry.path for entry in index.search(term))
+
+
+def test_search(index):
+    assert found(index, "report") == ["/data/Report.pdf", "/data/sub/old_report.PDF"]
+    assert found(index, ".pdf") == ["/data/Report.pdf", "/data/sub/old_report.PDF"]
+    assert found(index, "rt.p") == ["/data/Report.pdf", "/data/sub/old_report.PDF"]
+    assert found(index, "o") == sorted(
+        os.path.join(dirpath, name) for dirpath, name, *_ in ROWS if "o" in name.lower()
+    )
+    assert found(index, "missing") == []
+    # Every trigram present, but not as one substring
+    assert found(index, "repdf") == []
+
+
+def test_search_returns_indexed_stat(index):
+    [entry] = index.search("notes")
+    assert (entry.size, entry.mtime_ns, entry.inode) == (20, 2, 101)
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = tmp_path / "index.trigrams"
+    index.save(path)
+
+    loaded = TrigramIndex.load(path)
+
+    assert loaded.version == "v1"
+    assert len(loaded) == len(ROWS)
+    for term in ("report", ".txt", "caf", "o", "xyz"):
+        assert list(loaded.search(term)) == list(index.search(term))
+
+
+def test_load_missing_file(tmp_path):
+    assert TrigramIndex.load(tmp_path / "missing") is None
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: b"",
+    lambda data: data[:len(data) // 2],
+    lambda data: data[:-1],
+    lambda data: data + b"\0\0\0\0",
+    lambda data: data.replace(b'"format": 2', b'"format": 1'),
+    lambda data: data.replace(b'"names": [', b'"names": 1, "x": ['),
+    lambda data: pickle.dumps((1, {"version": "v1"})),
+    lambda data: b"\xff" * len(data),
+])
+def test_damaged_files_are_ignored(index, tmp_path, damage):
+    path = tmp_path / "index.trigrams"
+    index.save(path)
+    path.write_bytes(damage(path.read_bytes()))
+
+    assert TrigramIndex.load(path) is None
+
+
+def test_out_of_range_postings_are_rejected(index, tmp_path):
+    path = tmp_path / "index.trigrams"
+    index.postings["rep"].append(999)
+    index.save(path)
+
+    assert TrigramIndex.load(path) is None
@@ -0,0 +1,113 @@
+"""Tests for disk usage analysis."""
+
+import os
+
+import pytest
+
+from folder_organizer.usage import FILES_PER_DIR, DiskUsage, UsageTree, tree_size
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    sizes = {"big.bin": 50000, "a/one.bin": 100, "a/b/two.bin": 2000, "c/three.bin": 300}
+    for name, size in sizes.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+    return root
+
+
+def directory_bytes(root):
+    """Apparent size of the directory entries themselves, root included."""
+    total = os.lstat(root).st_size
+    for dirpath, dirnames, _ in os.walk(root):
+        total += sum(os.lstat(os.path.join(dirpath, name)).st_size for name in dirnames)
+    return total
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_disk_usage_totals(tree, workers):
+    report = DiskUsage(workers, top=2, apparent=True).analyze(tree)
+
+    assert report.files == 4
+    assert report.dirs == 4
+    assert report.apparent == 52400 + directory_bytes(tree)
+    assert [os.path.basename(e.path) for e in report.top_files] == ["big.bin", "two.bin"]
+    assert [os.path.basename(e.path) for e in report.children] == ["a", "c"]
+    assert report.children[0].files == 2
+    assert report.errors == []
+
+
+def test_disk_usage_counts_hard_links_once(tree):
+    os.link(tree / "big.bin", tree / "c" / "alias.bin")
+
+    report = DiskUsage(2, apparent=True).analyze(tree)
+
+    assert report.files == 4
+    assert report.hardlinks == 1
+
+
+def test_disk_usage_exclude_and_symlinks(tree):
+    (tree / "link").symlink_to(tree / "a")
+
+    report = DiskUsage(2, apparent=True, exclude=lambda e, is_dir: e.name == "b").analyze(tree)
+
+    # two.bin is excluded; the symlink counts as a file, not as a directory
+    assert report.files == 4
+    assert report.dirs == 3
+    assert not any(entry.path.endswith("two.bin") for entry in report.top_files)
+
+
+def test_disk_usage_missing_root(tmp_path):
+    report = DiskUsage(1).analyze(tmp_path / "missing")
+
+    assert report.files == 0
+    assert len(report.errors) == 1
+
+
+def test_tree_size(tree):
+    size = tree_size(str(tree / "a"))
+
+    assert size.files == 2
+    assert size.apparent == 2100 + os.lstat(tree / "a" / "b").st_size
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_usage_tree_matches_disk_usage(tree, workers):
+    usage = UsageTree(tree, workers)
+
+    usage.scan()
+
+    report = DiskUsage(workers, apparent=True).analyze(tree)
+    assert usage.done
+    assert (usage.root.apparent, usage.root.files) == (report.apparent, report.files)
+    rows = usage.snapshot(usage.root, apparent=True)
+    assert [(row.name, row.is_dir) for row in rows] == [
+        ("big.bin", False), ("a", True), ("c", True),
+    ]
+    assert usage.snapshot(usage.root.children["a"].children["b"])[0].name == "two.bin"
+
+
+def test_usage_tree_folds_small_files(tmp_path):
+    for i in range(FILES_PER_DIR + 5):
+        (tmp_path / f"{i:03}.bin").write_bytes(b"x" * (i + 1) * 8192)
+    usage = UsageTree(tmp_path, 2)
+
+    usage.scan()
+
+    rows = usage.snapshot(usage.root, apparent=True)
+    assert len(rows) == FILES_PER_DIR + 1
+    [rest] = [row for row in rows if row.name == ""]
+    assert rest.files == 5
+    assert rest.apparent == sum(range(1, 6)) * 8192
+
+
+def test_cancelled_usage_tree_stays_incomplete(tree):
+    usage = UsageTree(tree, 2)
+    usage.cancel()
+
+    usage.scan()
+
+    assert not usage.done
+    assert usage.root.files == 0